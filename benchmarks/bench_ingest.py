@@ -0,0 +1,104 @@
+# Benchmark ingest streaming CSV mentah -> Parquet, termasuk chunk yang seluruhnya kosong
+#
+# Setiap tabel di ingest.INGEST_TABLES di-ingest dari tiga versi file mentah dengan ukuran
+# chunk yang sama (paling banyak separuh tabel, sehingga selalu ada minimal dua chunk):
+# - normal: file mentah apa adanya
+# - chunk pertama kosong: semua kolom bernilai kosong di chunk pertama, terisi di chunk berikutnya
+# - chunk kedua kosong: kolom integer mendapat NaN dan kolom teks/tanggal null semua di chunk kedua
+# Skema yang ditebak dari chunk pertama gagal ketika chunk pertama kosong (kolom teks terbaca
+# sebagai float); skema eksplisit dari schema.py harus menulis semua baris dengan tipe yang sama.
+#
+# Dicetak ukuran chunk, jumlah baris, waktu, throughput, dan apakah skema serta jumlah baris
+# Parquet hasilnya sesuai dengan ingest.table_schema().
+#
+# Contoh:
+#   python benchmarks/bench_ingest.py
+#   OLIST_DATA_DIR=data/synthetic_x10 python benchmarks/bench_ingest.py --memory-mb 64
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import data_store
+import ingest
+
+# Nama kasus -> indeks chunk yang dikosongkan (None = file asli)
+CASES = {
+    'normal': None,
+    'chunk pertama kosong': 0,
+    'chunk kedua kosong': 1,
+}
+
+
+# Fungsi untuk menentukan ukuran chunk benchmark: dari batas memori, paling banyak separuh tabel
+def bench_chunk_rows(source, memory_mb):
+    rows = sum(len(chunk) for chunk in pd.read_csv(source, usecols=[0], chunksize=500000))
+    return max(1, min(ingest.chunk_rows_for(source, memory_mb), (rows + 1) // 2))
+
+
+# Fungsi untuk menyalin file mentah dengan satu chunk dikosongkan seluruhnya
+def write_blank_chunk_copy(source, target, chunk_rows, blank_chunk):
+    df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    df.iloc[blank_chunk * chunk_rows:(blank_chunk + 1) * chunk_rows] = np.nan
+    df.to_csv(target, index=False)
+
+
+# Fungsi untuk menyiapkan direktori data satu kasus dan mengembalikan path-nya
+# sources: nama file mentah -> path asli (ditentukan sebelum OLIST_DATA_DIR diarahkan ke salinan)
+def prepare_case_dir(case_dir, sources, chunk_rows, blank_chunk):
+    os.makedirs(case_dir)
+    for name, rows in chunk_rows.items():
+        raw_file = ingest.INGEST_TABLES[name][0]
+        write_blank_chunk_copy(sources[raw_file], os.path.join(case_dir, raw_file), rows, blank_chunk)
+    # products membutuhkan tabel terjemahan kategori dari direktori yang sama
+    category_file = data_store.TABLES['product_category'][1]
+    shutil.copy(sources[category_file], os.path.join(case_dir, category_file))
+    return case_dir
+
+
+# Fungsi untuk meng-ingest satu tabel dan memeriksa skema serta jumlah baris Parquet hasilnya
+def run_table(name, out_dir, chunk_rows):
+    try:
+        result = ingest.ingest_table(name, out_dir, chunk_rows=chunk_rows)
+    except Exception as e:
+        return None, f"gagal: {type(e).__name__}"
+    written = pq.read_schema(result['path']).remove_metadata()
+    schema_ok = written.equals(ingest.table_schema(name, written.names))
+    rows_ok = pq.ParquetFile(result['path']).metadata.num_rows == result['rows_out']
+    return result, 'ok' if schema_ok and rows_ok else 'beda'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark ingest CSV -> Parquet, termasuk chunk yang seluruhnya kosong')
+    parser.add_argument('--memory-mb', type=float, default=ingest.MEMORY_MB, help='Batas memori per chunk (MB)')
+    parser.add_argument('--tables', nargs='+', default=list(ingest.INGEST_TABLES), choices=list(ingest.INGEST_TABLES))
+    args = parser.parse_args()
+
+    raw_files = [raw_file for raw_file, _ in ingest.INGEST_TABLES.values()] + [data_store.TABLES['product_category'][1]]
+    sources = {raw_file: data_store.get_file_path(raw_file) for raw_file in raw_files}
+    tables = [name for name in args.tables if os.path.exists(sources[ingest.INGEST_TABLES[name][0]])]
+    chunk_rows = {name: bench_chunk_rows(sources[ingest.INGEST_TABLES[name][0]], args.memory_mb) for name in tables}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for case, blank_chunk in CASES.items():
+            if blank_chunk is not None:
+                os.environ['OLIST_DATA_DIR'] = prepare_case_dir(os.path.join(tmp, f'data{blank_chunk}'), sources,
+                                                                chunk_rows, blank_chunk)
+            out_dir = os.path.join(tmp, f'out_{len(os.listdir(tmp))}')
+            os.makedirs(out_dir)
+
+            print(f"\n{case}")
+            print(f"{'tabel':<16} {'chunk':>9} {'baris':>10} {'detik':>7} {'baris/detik':>12}  hasil")
+            for name in tables:
+                result, status = run_table(name, out_dir, chunk_rows[name])
+                if result is None:
+                    print(f"{name:<16} {chunk_rows[name]:>9,} {'-':>10} {'-':>7} {'-':>12}  {status}")
+                    continue
+                print(f"{name:<16} {result['chunk_rows']:>9,} {result['rows_out']:>10,} {result['seconds']:>7.2f} "
+                      f"{result['rows_in'] / max(result['seconds'], 1e-9):>12,.0f}  {status}")
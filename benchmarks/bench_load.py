@@ -0,0 +1,48 @@
+# Benchmark pemuatan tabel sumber (jalur tanpa snapshot): serial vs thread pool
+#
+# Untuk setiap jumlah thread, data_store.load_csv_tables() dijalankan dan dicatat waktu total
+# (wall), lama baca dan konversi tanggal per tabel, jumlah seluruh waktu per tabel dan waktu
+# tabel paling lambat. Dengan thread pool, waktu total seharusnya mendekati tabel paling
+# lambat, bukan jumlah semua tabel.
+#
+# Contoh:
+#   python benchmarks/bench_load.py --workers 1 8
+#   OLIST_DATA_DIR=data/synthetic_x10 python benchmarks/bench_load.py --workers 1 2 4 8
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import data_store
+
+
+# Fungsi untuk mengukur satu kali pemuatan: (waktu total, timings per tabel)
+def measure(workers):
+    timings = {}
+    start = time.perf_counter()
+    data_store.load_csv_tables(workers=workers, timings=timings)
+    return time.perf_counter() - start, timings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark pemuatan tabel sumber serial vs paralel')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, data_store.LOAD_WORKERS])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"CPU: {os.cpu_count()}")
+    for workers in args.workers:
+        # Putaran pertama hanya memanaskan page cache OS
+        measure(workers)
+        runs = [measure(workers) for _ in range(args.repeat)]
+        wall, timings = min(runs, key=lambda run: run[0])
+
+        print(f"\n{workers} thread")
+        print(f"{'tabel':<18} {'baca s':>8} {'tanggal s':>10}")
+        for name, timing in timings.items():
+            print(f"{name:<18} {timing['read']:>8.2f} {timing['parse']:>10.2f}")
+        total = sum(timing['read'] + timing['parse'] for timing in timings.values())
+        slowest = max(timing['read'] + timing['parse'] for timing in timings.values())
+        print(f"wall {wall:.2f} s | jumlah per tabel {total:.2f} s | tabel paling lambat {slowest:.2f} s")
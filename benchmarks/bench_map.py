@@ -0,0 +1,92 @@
+# Benchmark peta choropleth tab 5: waktu render dan ukuran payload per tingkat GeoJSON
+#
+# Membandingkan peta folium lama (Map + Choropleth + LayerControl, dokumen HTML lengkap
+# per rerun) dengan figure Plotly dashboard/state_map.py yang diserialisasi seperti
+# st.plotly_chart, baik dengan GeoJSON lewat URL static maupun disisipkan ke figure.
+# Diukur untuk setiap tingkat penyederhanaan di dashboard/static/geo/ (lihat
+# dashboard/geo.py) dan, dengan --remote, untuk URL GeoJSON asli yang diunduh setiap render.
+#
+# Contoh:
+#   python benchmarks/bench_map.py
+#   python benchmarks/bench_map.py --remote     # butuh internet
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import folium
+import requests
+import plotly.io as pio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import geo
+import state_map
+
+
+# Fungsi untuk membangun dan merender peta choropleth seperti di tab 5
+def render_map(customer_states, geo_data):
+    brazil_map = folium.Map(location=[-14.235, -51.9253], zoom_start=4, tiles="CartoDB positron")
+    folium.Choropleth(
+        geo_data=geo_data,
+        name='choropleth',
+        data=customer_states,
+        columns=['state', 'customer_count'],
+        key_on='feature.properties.sigla',
+        fill_color='YlOrRd',
+        fill_opacity=0.7,
+        line_opacity=0.2,
+        legend_name='Customer Count'
+    ).add_to(brazil_map)
+    folium.LayerControl().add_to(brazil_map)
+    return brazil_map.get_root().render()
+
+
+# Fungsi untuk membangun figure Plotly tab 5 dan menserialisasinya seperti st.plotly_chart
+def render_plotly(customer_states, level, static_serving):
+    fig = state_map.state_choropleth(customer_states, level, static_serving)
+    return pio.to_json(fig, validate=False)
+
+
+# Fungsi untuk mengukur waktu median (ms) dan ukuran hasil (KB) sebuah fungsi render
+def measure(render, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = render()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000, len(output.encode('utf-8')) / 1024
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ukur waktu render dan ukuran payload peta choropleth per tingkat GeoJSON')
+    parser.add_argument('--levels', nargs='+', default=list(geo.LEVELS), choices=list(geo.LEVELS))
+    parser.add_argument('--remote', action='store_true', help='Ikut ukur GeoJSON dari URL sumber (butuh internet)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    sources = [(level, geo.load_states(level)) for level in args.levels]
+    if args.remote:
+        sources.insert(0, ('remote', geo.GEOJSON_URL))
+
+    for label, geo_data in sources:
+        if isinstance(geo_data, dict):
+            states = [feature['properties'][geo.STATE_KEY] for feature in geo_data['features']]
+        else:
+            states = ['SP', 'RJ', 'MG']
+        customer_states = pd.DataFrame({'state': states, 'customer_count': np.arange(1, len(states) + 1) * 100})
+
+        renders = [('folium', lambda: render_map(customer_states, geo_data))]
+        if label != 'remote':
+            renders += [
+                ('plotly static', lambda: render_plotly(customer_states, label, True)),
+                ('plotly embed', lambda: render_plotly(customer_states, label, False)),
+            ]
+        for name, render in renders:
+            try:
+                elapsed, size = measure(render, args.repeat)
+            except requests.RequestException as e:
+                print(f"{label:<8} gagal diunduh: {e.__class__.__name__}")
+                break
+            print(f"{label:<8} {name:<14} render {elapsed:8.1f} ms   payload {size:8,.0f} KB")
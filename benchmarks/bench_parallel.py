@@ -0,0 +1,79 @@
+# Benchmark backend paralel eksperimental (dashboard/parallel.py): serial vs process pool
+#
+# RFM (tab 2) dihitung pada dataset sintetis skala N untuk seluruh rentang data. Untuk setiap
+# jumlah worker dilaporkan waktu (median dari --repeat kali), speedup terhadap jalur serial,
+# speedup per core dan apakah hasilnya identik dengan jalur serial. Pembangunan blok shared
+# memory dan start worker dilaporkan terpisah karena hanya terjadi sekali per versi data.
+# Speedup per core hanya bermakna jika jumlah worker tidak melebihi jumlah CPU.
+#
+# Contoh:
+#   python benchmarks/bench_parallel.py --scale 10 --workers 2 4 8
+#   python benchmarks/bench_parallel.py --data data/synthetic_x100
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import analytics
+import parallel
+from rfm import compute_rfm
+from time_index import slice_by_time
+from bench_tabs import load_dataset, synthetic_dir
+
+
+# Fungsi untuk mengukur waktu median sebuah fungsi, mengembalikan (detik, hasil terakhir)
+def timed(func, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)), result
+
+
+# Fungsi jalur serial RFM (sama dengan analytics.customer_segments)
+def serial_rfm(data, filters):
+    lines = slice_by_time(data['payment_lines'], filters.start_date, filters.end_date)
+    return compute_rfm(lines[lines['order_status'] == 'delivered'], filters.end_date)
+
+
+# Fungsi jalur process pool RFM
+def parallel_rfm(data, filters, workers):
+    return parallel.compute_rfm(data, filters.start_date, filters.end_date, workers)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark speedup process pool untuk RFM')
+    parser.add_argument('--scale', type=float, default=10, help='Faktor skala dataset sintetis')
+    parser.add_argument('--data', default=None, help='Pakai direktori data ini sebagai pengganti --scale')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = load_dataset(args.data or synthetic_dir(args.scale))
+    filters = analytics.all_data_filters(data)
+    print(f"CPU: {os.cpu_count()}, baris pembayaran: {len(data['payment_lines']):,}, pesanan: {len(data['orders']):,}")
+
+    serial_seconds, serial_result = timed(lambda: serial_rfm(data, filters), args.repeat)
+
+    print(f"{'tahap':<9} {'worker':>6} {'waktu ms':>10} {'speedup':>8} {'per core':>9} {'identik':>8}")
+    print(f"{'rfm':<9} {'serial':>6} {serial_seconds * 1000:>10.1f} {1:>8.2f} {1:>9.2f} {'-':>8}")
+
+    for workers in args.workers:
+        if workers > (os.cpu_count() or 1):
+            print(f"Peringatan: {workers} worker melebihi {os.cpu_count()} CPU, speedup per core tidak bermakna")
+        start = time.perf_counter()
+        parallel.get_backend(data, workers)
+        # Tugas kecil untuk memanaskan pool (start worker dan membuka shared memory)
+        list(parallel.get_backend(data, workers)['pool'].map(abs, range(workers)))
+        print(f"{'setup':<9} {workers:>6} {(time.perf_counter() - start) * 1000:>10.1f}")
+
+        seconds, result = timed(lambda: parallel_rfm(data, filters, workers), args.repeat)
+        speedup = serial_seconds / seconds
+        same = result.equals(serial_result)
+        print(f"{'rfm':<9} {workers:>6} {seconds * 1000:>10.1f} {speedup:>8.2f} {speedup / workers:>9.2f} "
+              f"{str(same):>8}")
+    parallel.shutdown()
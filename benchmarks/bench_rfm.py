@@ -0,0 +1,117 @@
+# Benchmark RFM tab 2: implementasi lama (3x groupby + 2x merge + qcut) vs kernel sekali jalan
+#
+# Dataset diperbesar SCALE kali dengan menyalin baris pembayaran pesanan terkirim memakai
+# key pelanggan/pesanan baru, waktu pembelian digeser acak (+-12 jam) dan nilai pembayaran
+# diberi jitter +-10%, sehingga jumlah pelanggan ikut naik SCALE kali.
+#
+# Contoh:
+#   python benchmarks/bench_rfm.py --scale 10
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import data_store
+import rfm
+
+
+# Implementasi RFM lama dari dashboard.py (sebelum rfm.compute_rfm), dipakai sebagai acuan
+def legacy_rfm(orders_with_payments, end_date):
+    recency_df = orders_with_payments.groupby('customer_id', observed=True)['order_purchase_timestamp'].max().reset_index()
+    recency_df['recency'] = (end_date - recency_df['order_purchase_timestamp']).dt.days
+
+    frequency_df = orders_with_payments.groupby('customer_id', observed=True)['order_id'].nunique().reset_index()
+    frequency_df.columns = ['customer_id', 'frequency']
+
+    monetary_df = orders_with_payments.groupby('customer_id', observed=True)['payment_value'].sum().reset_index()
+    monetary_df.columns = ['customer_id', 'monetary']
+
+    result = pd.merge(recency_df[['customer_id', 'recency']], frequency_df, on='customer_id')
+    result = pd.merge(result, monetary_df, on='customer_id')
+
+    if result['recency'].nunique() < 5:
+        result['r_score'] = 3
+    else:
+        try:
+            result['r_score'] = pd.qcut(result['recency'], q=5, labels=[5, 4, 3, 2, 1], duplicates='drop')
+        except ValueError:
+            result['r_score'] = pd.cut(result['recency'], bins=5, labels=[5, 4, 3, 2, 1], duplicates='drop')
+
+    for metric, column in [('frequency', 'f_score'), ('monetary', 'm_score')]:
+        if result[metric].nunique() < 5:
+            result[column] = 3
+        else:
+            try:
+                result[column] = pd.qcut(result[metric].rank(method='first'), q=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
+            except ValueError:
+                result[column] = pd.cut(result[metric], bins=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
+
+    for col in ['r_score', 'f_score', 'm_score']:
+        result[col] = pd.to_numeric(result[col], errors='coerce')
+
+    result['rfm_score'] = result['r_score'] + result['f_score'] + result['m_score']
+    result['segment'] = pd.cut(
+        result['rfm_score'],
+        bins=[0, 4, 8, 12, 15],
+        labels=['Bronze', 'Silver', 'Gold', 'Platinum'],
+        include_lowest=True
+    )
+    return result
+
+
+# Fungsi untuk memperbesar baris pembayaran `scale` kali dengan key baru dan jitter
+def scale_lines(lines, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = ['customer_id', 'order_id', 'order_purchase_timestamp', 'payment_value']
+    lines = lines[columns].reset_index(drop=True)
+    customer_span = int(lines['customer_id'].max()) + 1
+    order_span = int(lines['order_id'].max()) + 1
+
+    copies = []
+    for copy in range(scale):
+        part = lines.copy()
+        if copy:
+            part['customer_id'] = (part['customer_id'].astype(np.int64) + copy * customer_span).astype(np.int32)
+            part['order_id'] = (part['order_id'].astype(np.int64) + copy * order_span).astype(np.int32)
+            shift = rng.integers(-12 * 3600, 12 * 3600, len(part))
+            part['order_purchase_timestamp'] += pd.to_timedelta(shift, unit='s')
+            part['payment_value'] = (part['payment_value'] * rng.uniform(0.9, 1.1, len(part))).round(2)
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+
+# Fungsi untuk mengukur rata-rata waktu eksekusi (ms) beserta hasil terakhir
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark RFM lama vs rfm.compute_rfm')
+    parser.add_argument('--scale', type=int, default=10, help='Faktor perbesaran dataset')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tables = data_store.load_tables()
+    payments = tables['payment_lines']
+    lines = scale_lines(payments[payments['order_status'] == 'delivered'], args.scale)
+    end_date = lines['order_purchase_timestamp'].max()
+    print(f"Baris pembayaran: {len(lines):,}  pelanggan: {lines['customer_id'].nunique():,}  (skala {args.scale}x)")
+
+    legacy_ms, expected = timed(lambda: legacy_rfm(lines, end_date), args.repeat)
+    kernel_ms, result = timed(lambda: rfm.compute_rfm(lines, end_date), args.repeat)
+    state_ms, from_state = timed(lambda: rfm.rfm_table(rfm.build_state(lines), end_date), args.repeat)
+
+    print(f"{'lama (groupby+merge+qcut)':<28} {legacy_ms:9.1f} ms")
+    print(f"{'rfm.compute_rfm':<28} {kernel_ms:9.1f} ms   ({legacy_ms / kernel_ms:.1f}x)")
+    print(f"{'rfm.build_state + rfm_table':<28} {state_ms:9.1f} ms   ({legacy_ms / state_ms:.1f}x)")
+
+    for label, other in [('compute_rfm', result), ('build_state', from_state)]:
+        same = np.array_equal(expected['segment'].astype(str).values, other['segment'].astype(str).values)
+        print(f"Segmen {label} identik dengan implementasi lama: {same}")
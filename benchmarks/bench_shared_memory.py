@@ -0,0 +1,132 @@
+# Benchmark memori: berapa RSS/PSS yang bertambah per sesi dan per proses worker
+#
+# Mensimulasikan beberapa proses Streamlit (replika) yang masing-masing melayani
+# beberapa sesi. Mode cache "data" meniru st.cache_data (setiap sesi menerima
+# salinan hasil pickle), mode "resource" meniru st.cache_resource (semua sesi
+# berbagi objek yang sama). Loader "auto" memanggil data_store.load_tables() seperti
+# dashboard; loader lain memaksa satu sumber, tetapi tetap melalui add_derived_tables()
+# sehingga tabel turunan dan kamus key ikut terukur.
+#
+# Contoh:
+#   python benchmarks/bench_shared_memory.py --loader csv --cache data
+#   python benchmarks/bench_shared_memory.py --cache resource --workers 4 --sessions 20
+import os
+import sys
+import argparse
+import time
+import queue
+import pickle
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import data_store
+import schema
+
+LOADERS = {
+    'auto': data_store.load_tables,
+    'csv': lambda snapshot_dir: data_store.add_derived_tables(schema.apply_schema(data_store.load_csv_tables())),
+    'parquet': lambda snapshot_dir: data_store.add_derived_tables(data_store.load_snapshot(snapshot_dir)),
+    'mmap': lambda snapshot_dir: data_store.add_derived_tables(data_store.load_mapped_snapshot(snapshot_dir)),
+}
+
+
+# Fungsi untuk membaca pemakaian memori proses saat ini (Linux) dalam MB
+# PSS membagi halaman bersama (mis. file ter-mmap) secara proporsional antar proses;
+# Private_Dirty adalah memori yang hanya dimiliki proses ini (tidak bisa dibagi)
+def memory_usage_mb():
+    usage = {'rss': 0.0, 'pss': 0.0, 'private': 0.0}
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Private_Dirty': 'private'}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                if key in fields:
+                    usage[fields[key]] = int(value.split()[0]) / 1024
+    except (FileNotFoundError, PermissionError):
+        import resource
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        usage['pss'] = usage['private'] = usage['rss']
+    return usage
+
+
+def run_worker(loader, cache, snapshot_dir, sessions, barrier, results):
+    baseline = memory_usage_mb()
+    tables = LOADERS[loader](snapshot_dir)
+    loaded = memory_usage_mb()
+
+    session_data = []
+    for _ in range(sessions):
+        if cache == 'data':
+            # st.cache_data mengembalikan salinan hasil pickle untuk setiap sesi
+            session_data.append(pickle.loads(pickle.dumps(tables)))
+        else:
+            session_data.append(tables)
+    after_sessions = memory_usage_mb()
+
+    # Tunggu semua worker selesai memuat sebelum PSS diukur, agar halaman bersama
+    # benar-benar terbagi antar proses
+    barrier.wait()
+    shared = memory_usage_mb()
+    results.put({
+        'pid': os.getpid(),
+        'load_rss': loaded['rss'] - baseline['rss'],
+        'load_private': loaded['private'] - baseline['private'],
+        'per_session_rss': (after_sessions['rss'] - loaded['rss']) / max(sessions, 1),
+        'rss': shared['rss'],
+        'pss': shared['pss'],
+    })
+    barrier.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--loader', choices=sorted(LOADERS), default='auto')
+    parser.add_argument('--cache', choices=['data', 'resource'], default='resource')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument('--snapshot-dir', default=data_store.SNAPSHOT_DIR)
+    parser.add_argument('--timeout', type=float, default=600, help='Batas waktu (detik) menunggu semua worker')
+    args = parser.parse_args()
+
+    if args.loader in ('parquet', 'mmap') and not data_store.snapshot_exists(args.snapshot_dir, 'arrow' if args.loader == 'mmap' else 'parquet'):
+        sys.exit(f"Snapshot tidak ditemukan di {args.snapshot_dir}. Jalankan: python dashboard/data_store.py")
+
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(args.workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=run_worker, args=(args.loader, args.cache, args.snapshot_dir, args.sessions, barrier, results))
+        for _ in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+
+    # Worker yang gagal (mis. file data tidak ditemukan) tidak pernah mengirim hasil dan
+    # meninggalkan worker lain di barrier: barrier dibatalkan dan benchmark berhenti dengan error
+    rows = []
+    deadline = time.monotonic() + args.timeout
+    while len(rows) < len(procs):
+        try:
+            rows.append(results.get(timeout=1))
+            continue
+        except queue.Empty:
+            pass
+        failed = [p for p in procs if p.exitcode not in (None, 0)]
+        if failed or time.monotonic() > deadline:
+            barrier.abort()
+            for p in procs:
+                p.join(timeout=5)
+                if p.is_alive():
+                    p.terminate()
+            reason = f"exit code {failed[0].exitcode}" if failed else f"tidak selesai dalam {args.timeout:.0f} detik"
+            sys.exit(f"Worker gagal ({reason}), benchmark dibatalkan")
+    for p in procs:
+        p.join()
+
+    print(f"loader={args.loader} cache={args.cache} workers={args.workers} sessions/worker={args.sessions}")
+    print(f"{'pid':>8} {'load MB':>10} {'privat MB':>10} {'MB/sesi':>10} {'RSS MB':>10} {'PSS MB':>10}")
+    for row in rows:
+        print(f"{row['pid']:>8} {row['load_rss']:>10.1f} {row['load_private']:>10.1f} {row['per_session_rss']:>10.2f} "
+              f"{row['rss']:>10.1f} {row['pss']:>10.1f}")
+    print(f"Total PSS semua worker: {sum(r['pss'] for r in rows):,.1f} MB")
@@ -0,0 +1,169 @@
+# Benchmark end-to-end perhitungan setiap tab dashboard (dashboard/analytics.py) tanpa Streamlit
+#
+# Setiap tab diukur pada beberapa faktor skala dataset dan kombinasi filter sidebar
+# ("Semua Data", 90 hari terakhir, satu negara bagian, satu kategori). Dilaporkan
+# waktu (median dari --repeat kali), puncak memori selama perhitungan (tracemalloc)
+# serta jumlah dan ukuran blok memori yang masih dipegang hasilnya.
+#
+# Dataset skala N diambil dari data/synthetic_x<N> (dibuat dengan generate_data.py
+# bila belum ada). Hasil dibandingkan dengan baseline tersimpan; skrip keluar dengan
+# status 1 jika ada tab yang lebih lambat / lebih boros memori melebihi toleransi.
+#
+# Contoh:
+#   python benchmarks/bench_tabs.py --scales 1 10 --save-baseline
+#   python benchmarks/bench_tabs.py --scales 1 10
+#   python benchmarks/bench_tabs.py --data processed_data --tabs rfm payments
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import data_store
+import analytics
+import generate_data
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_tabs.json')
+
+# Nama tab -> fungsi query(data, filters) yang menjalankan perhitungan tab tersebut
+TABS = {
+    'sales': analytics.sales_overview,
+    'rfm': analytics.customer_segments,
+    'payments': analytics.payment_overview,
+    'delivery': analytics.delivery_performance,
+    'geo': analytics.geo_overview,
+    'sellers': analytics.seller_performance,
+    'reviews': analytics.review_overview,
+}
+
+SCENARIOS = ['Semua Data', '90 Hari Terakhir', 'Satu Negara Bagian', 'Satu Kategori']
+
+
+# Fungsi untuk membuat Filters sidebar dari sebuah skenario
+def scenario_filters(data, scenario, state, category):
+    filters = analytics.all_data_filters(data)
+    if scenario == '90 Hari Terakhir':
+        return filters._replace(start_date=filters.end_date - pd.Timedelta(days=90))
+    if scenario == 'Satu Negara Bagian':
+        return filters._replace(state=state)
+    if scenario == 'Satu Kategori':
+        return filters._replace(category=category)
+    return filters
+
+
+# Fungsi untuk memuat dataset sebuah direktori (snapshot di <dir>/snapshot jika ada, jika tidak CSV)
+def load_dataset(data_dir):
+    os.environ['OLIST_DATA_DIR'] = data_dir
+    return data_store.load_tables(os.path.join(data_dir, 'snapshot'))
+
+
+# Fungsi untuk menyiapkan direktori dataset sintetis skala N
+def synthetic_dir(scale):
+    out_dir = os.path.join(generate_data.ROOT_DIR, 'data', f'synthetic_x{scale:g}')
+    if not os.path.exists(os.path.join(out_dir, 'orders_dataset.csv')):
+        print(f"Membuat dataset sintetis skala {scale:g} di {out_dir} ...")
+        generate_data.generate(out_dir, scale)
+    return out_dir
+
+
+# Fungsi untuk mengukur satu perhitungan: waktu median, puncak memori dan memori hasil
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = after.compare_to(before, 'filename')
+    del result
+    return {
+        'wall_ms': float(np.median(times)) * 1000,
+        'peak_mb': peak / 1024 ** 2,
+        'blocks': sum(max(stat.count_diff, 0) for stat in retained),
+        'retained_kb': sum(max(stat.size_diff, 0) for stat in retained) / 1024,
+    }
+
+
+# Fungsi untuk membandingkan hasil dengan baseline, mengembalikan daftar regresi
+def find_regressions(results, baseline, tolerance, min_ms):
+    regressions = []
+    for key, current in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        if current['wall_ms'] > base['wall_ms'] * (1 + tolerance) and current['wall_ms'] - base['wall_ms'] > min_ms:
+            regressions.append(f"{key}: waktu {base['wall_ms']:.1f} -> {current['wall_ms']:.1f} ms")
+        if current['peak_mb'] > base['peak_mb'] * (1 + tolerance) + 1:
+            regressions.append(f"{key}: puncak memori {base['peak_mb']:.1f} -> {current['peak_mb']:.1f} MB")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark perhitungan setiap tab dashboard terhadap baseline')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1], help='Faktor skala dataset sintetis')
+    parser.add_argument('--data', default=None, help='Pakai satu direktori data ini sebagai pengganti --scales')
+    parser.add_argument('--tabs', nargs='+', default=list(TABS), choices=list(TABS))
+    parser.add_argument('--scenarios', nargs='+', default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument('--state', default='SP', help='Negara bagian untuk skenario "Satu Negara Bagian"')
+    parser.add_argument('--category', default='bed_bath_table', help='Kategori untuk skenario "Satu Kategori"')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='Simpan hasil sebagai baseline baru')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Kenaikan relatif yang dianggap regresi')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='Selisih waktu minimum (ms) yang dianggap regresi')
+    args = parser.parse_args()
+
+    if args.data:
+        datasets = [(os.path.basename(os.path.normpath(args.data)), args.data)]
+    else:
+        datasets = [(f'x{scale:g}', synthetic_dir(scale)) for scale in args.scales]
+
+    results = {}
+    print(f"{'dataset':<10} {'tab':<9} {'skenario':<20} {'waktu ms':>10} {'puncak MB':>10} {'blok':>8} {'hasil KB':>10}")
+    for label, data_dir in datasets:
+        data = load_dataset(data_dir)
+        for tab in args.tabs:
+            for scenario in args.scenarios:
+                filters = scenario_filters(data, scenario, args.state, args.category)
+                stats = measure(lambda: TABS[tab](data, filters), args.repeat)
+                results[f'{label}/{tab}/{scenario}'] = stats
+                print(f"{label:<10} {tab:<9} {scenario:<20} {stats['wall_ms']:>10.1f} {stats['peak_mb']:>10.1f} "
+                      f"{stats['blocks']:>8,} {stats['retained_kb']:>10.1f}")
+        del data
+        gc.collect()
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline disimpan di {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance, args.min_ms)
+        if regressions:
+            print(f"Regresi terhadap baseline (toleransi {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("Tidak ada regresi terhadap baseline")
+    else:
+        print(f"Baseline {args.baseline} belum ada, jalankan dengan --save-baseline")
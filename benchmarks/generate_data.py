@@ -0,0 +1,437 @@
+# Generator data sintetis berbentuk Olist untuk uji skala (10x-100x dataset asli)
+#
+# Menulis customers, orders, order_items, order_payments dan order_reviews dengan
+# distribusi yang menyerupai dataset publik Olist:
+# - negara bagian pelanggan condong ke SP (~42%), lalu RJ dan MG
+# - volume pesanan naik dari 2016 ke 2018, lonjakan Black Friday, pola jam/hari
+# - lama pengiriman dan estimasi per negara bagian (utara lebih lambat), ~8% terlambat
+# - 1-4 item per pesanan, produk diambil dari products_dataset.csv (campuran kategori ikut katalog)
+# - metode pembayaran, cicilan kartu kredit, pesanan dengan voucher bertingkat
+# - skor ulasan lebih rendah untuk pesanan terlambat
+# - geolocation mentah (~1 juta baris, tidak ikut diskalakan) dengan banyak duplikat per zip
+#   prefix, untuk zip prefix pelanggan sintetis dan penjual katalog
+#
+# products, sellers dan terjemahan kategori disalin dari data/ sehingga direktori output
+# bisa langsung dipakai dashboard lewat OLIST_DATA_DIR. Data dibuat per potongan (chunk)
+# agar skala 100x tidak perlu menampung semua tabel di memori.
+#
+# Contoh:
+#   python benchmarks/generate_data.py --scale 10 --out data/synthetic_x10
+#   python benchmarks/generate_data.py --scale 100 --format parquet --out data/synthetic_x100
+#   OLIST_DATA_DIR=data/synthetic_x10 python dashboard/data_store.py --out data/synthetic_x10/snapshot
+import os
+import time
+import shutil
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Jumlah pesanan pada dataset Olist asli (skala 1.0)
+BASE_ORDERS = 99441
+
+# File katalog yang disalin apa adanya dari data/
+CATALOG_FILES = ['products_dataset.csv', 'sellers_dataset.csv', 'product_category_name_translation.csv']
+
+GENERATED_TABLES = ['customers', 'orders', 'order_items', 'order_payments', 'order_reviews', 'geolocation']
+
+# Jumlah baris geolocation_dataset.csv asli; tabel referensi, sama untuk semua skala
+BASE_GEOLOCATION_ROWS = 1000163
+
+# Jumlah titik koordinat berbeda per zip prefix (baris lain adalah duplikat)
+POINTS_PER_PREFIX = 20
+
+START_DATE = pd.Timestamp('2016-09-04')
+END_DATE = pd.Timestamp('2018-09-03')
+BLACK_FRIDAY = pd.Timestamp('2017-11-24')
+
+# Negara bagian -> (porsi pelanggan, rata-rata hari pengiriman, prefix zip awal, ibu kota)
+STATES = {
+    'SP': (0.4198, 8.3, 1000, 'sao paulo'),
+    'RJ': (0.1292, 14.8, 20000, 'rio de janeiro'),
+    'MG': (0.1170, 11.5, 30000, 'belo horizonte'),
+    'RS': (0.0550, 14.8, 90000, 'porto alegre'),
+    'PR': (0.0507, 11.5, 80000, 'curitiba'),
+    'SC': (0.0366, 14.5, 88000, 'florianopolis'),
+    'BA': (0.0340, 18.9, 40000, 'salvador'),
+    'DF': (0.0215, 12.5, 70000, 'brasilia'),
+    'ES': (0.0204, 15.3, 29000, 'vitoria'),
+    'GO': (0.0203, 15.2, 72800, 'goiania'),
+    'PE': (0.0166, 18.0, 50000, 'recife'),
+    'CE': (0.0134, 20.8, 60000, 'fortaleza'),
+    'PA': (0.0098, 23.3, 66000, 'belem'),
+    'MT': (0.0091, 17.6, 78000, 'cuiaba'),
+    'MA': (0.0075, 21.1, 65000, 'sao luis'),
+    'MS': (0.0072, 15.2, 79000, 'campo grande'),
+    'PB': (0.0054, 20.0, 58000, 'joao pessoa'),
+    'PI': (0.0050, 19.0, 64000, 'teresina'),
+    'RN': (0.0049, 18.8, 59000, 'natal'),
+    'AL': (0.0041, 24.0, 57000, 'maceio'),
+    'SE': (0.0034, 21.0, 49000, 'aracaju'),
+    'TO': (0.0028, 17.2, 77000, 'palmas'),
+    'RO': (0.0025, 18.9, 76800, 'porto velho'),
+    'AM': (0.0015, 26.0, 69000, 'manaus'),
+    'AC': (0.0008, 21.0, 69900, 'rio branco'),
+    'AP': (0.0007, 26.7, 68900, 'macapa'),
+    'RR': (0.0005, 29.0, 69300, 'boa vista'),
+}
+
+# Koordinat (lat, lng) ibu kota negara bagian, pusat titik geolocation sintetis
+STATE_CENTERS = {
+    'SP': (-23.55, -46.63), 'RJ': (-22.91, -43.17), 'MG': (-19.92, -43.94), 'RS': (-30.03, -51.23),
+    'PR': (-25.43, -49.27), 'SC': (-27.60, -48.55), 'BA': (-12.97, -38.50), 'DF': (-15.79, -47.88),
+    'ES': (-20.32, -40.34), 'GO': (-16.68, -49.25), 'PE': (-8.05, -34.88), 'CE': (-3.73, -38.52),
+    'PA': (-1.46, -48.50), 'MT': (-15.60, -56.10), 'MA': (-2.53, -44.30), 'MS': (-20.47, -54.62),
+    'PB': (-7.12, -34.86), 'PI': (-5.09, -42.80), 'RN': (-5.79, -35.21), 'AL': (-9.67, -35.74),
+    'SE': (-10.91, -37.07), 'TO': (-10.18, -48.33), 'RO': (-8.76, -63.90), 'AM': (-3.12, -60.02),
+    'AC': (-9.97, -67.81), 'AP': (0.03, -51.07), 'RR': (2.82, -60.67),
+}
+
+ORDER_STATUS = {
+    'delivered': 0.9702, 'shipped': 0.0111, 'canceled': 0.0063, 'unavailable': 0.0061,
+    'invoiced': 0.0032, 'processing': 0.0030, 'created': 0.0001,
+}
+
+ITEMS_PER_ORDER = {1: 0.900, 2: 0.076, 3: 0.013, 4: 0.007, 5: 0.004}
+
+PAYMENT_TYPES = {'credit_card': 0.765, 'boleto': 0.195, 'voucher': 0.025, 'debit_card': 0.015}
+
+INSTALLMENTS = {
+    1: 0.48, 2: 0.12, 3: 0.10, 4: 0.07, 5: 0.05, 6: 0.04, 7: 0.016,
+    8: 0.04, 9: 0.006, 10: 0.074, 12: 0.002, 15: 0.001, 24: 0.001,
+}
+
+# Skor ulasan 1..5 untuk pesanan tepat waktu dan terlambat / tidak terkirim
+REVIEW_SCORES_ON_TIME = [0.07, 0.03, 0.08, 0.20, 0.62]
+REVIEW_SCORES_LATE = [0.45, 0.10, 0.15, 0.14, 0.16]
+
+REVIEW_MESSAGES = [
+    'recebi bem antes do prazo estipulado', 'otimo produto, recomendo', 'produto de boa qualidade',
+    'entrega rapida e produto conforme anunciado', 'nao recebi o produto ate agora',
+    'produto veio com defeito', 'gostei muito', 'chegou antes do prazo', 'ainda nao recebi',
+    'veio diferente do anunciado',
+]
+REVIEW_TITLES = ['recomendo', 'otimo', 'bom', 'nao recebi', 'ruim', 'excelente']
+
+HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+# Fungsi untuk mengubah distribusi dict menjadi (nilai, peluang ternormalisasi)
+def distribution(weights):
+    values = np.array(list(weights))
+    probs = np.array(list(weights.values()), dtype=np.float64)
+    return values, probs / probs.sum()
+
+
+# Fungsi untuk membuat id hex 32 karakter acak (seperti id Olist) secara tervektorisasi
+def random_ids(rng, n):
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    chars = np.empty((n, 32), dtype=np.uint8)
+    chars[:, 0::2] = HEX_DIGITS[raw >> 4]
+    chars[:, 1::2] = HEX_DIGITS[raw & 15]
+    return chars.view('S32').ravel().astype(str)
+
+
+# Fungsi untuk menyiapkan katalog produk/penjual dan bobot waktu yang dipakai semua chunk
+def load_catalog(data_dir, rng):
+    products = pd.read_csv(os.path.join(data_dir, 'products_dataset.csv'))
+    sellers = pd.read_csv(os.path.join(data_dir, 'sellers_dataset.csv'))
+
+    # Popularitas produk/penjual mengikuti pola ekor panjang (Zipf), harga dasar per produk
+    product_weight = 1.0 / np.arange(1, len(products) + 1) ** 0.8
+    seller_weight = 1.0 / np.arange(1, len(sellers) + 1) ** 0.9
+    weight_kg = products['product_weight_g'].fillna(products['product_weight_g'].median()).values / 1000
+
+    # Bobot harian: tren naik, Black Friday, lebih ramai di awal minggu
+    days = pd.date_range(START_DATE, END_DATE, freq='D')
+    trend = np.clip(np.asarray((days - START_DATE).days) / 365.0, 0.05, None) ** 0.8
+    weekday = np.array([1.15, 1.15, 1.08, 1.02, 0.97, 0.80, 0.83])[days.dayofweek]
+    spike = np.where(days == BLACK_FRIDAY, 4.0, 1.0)
+    day_weight = trend * weekday * spike
+
+    # Pola jam: sepi dini hari, ramai pukul 10-22
+    hour_weight = np.array([3, 1.5, 0.8, 0.5, 0.4, 0.5, 1, 2.5, 4.5, 6, 7, 7, 6.5, 7, 7, 6.8,
+                            6.7, 6.5, 6, 6.2, 6.6, 6.6, 6, 4.5])
+
+    return {
+        'product_id': products['product_id'].values,
+        'product_p': rng.permutation(product_weight / product_weight.sum()),
+        'product_price': np.round(rng.lognormal(4.2, 0.85, len(products)), 2),
+        'product_freight': np.round(7.5 + weight_kg * 2.2, 2),
+        'seller_id': sellers['seller_id'].values,
+        'seller_zip': sellers['seller_zip_code_prefix'].values,
+        'seller_state': sellers['seller_state'].values,
+        'seller_p': rng.permutation(seller_weight / seller_weight.sum()),
+        'days': days.values,
+        'day_p': day_weight / day_weight.sum(),
+        'hour_p': hour_weight / hour_weight.sum(),
+    }
+
+
+# Fungsi untuk membuat pelanggan dan pesanan untuk satu chunk
+def generate_orders(rng, n, catalog):
+    states, state_p = distribution({state: spec[0] for state, spec in STATES.items()})
+    state_index = rng.choice(len(states), n, p=state_p)
+    state = states[state_index]
+    delivery_days = np.array([spec[1] for spec in STATES.values()])[state_index]
+    zip_start = np.array([spec[2] for spec in STATES.values()])[state_index]
+    capital = np.array([spec[3] for spec in STATES.values()])[state_index]
+
+    # ~3% pelanggan unik berbelanja lebih dari sekali
+    customer_id = random_ids(rng, n)
+    unique_id = random_ids(rng, n)
+    repeat = rng.random(n) < 0.03
+    unique_id[repeat] = unique_id[rng.integers(0, n, repeat.sum())]
+
+    # Setengah pelanggan tinggal di ibu kota, sisanya di kota lain di negara bagian yang sama
+    city = np.where(rng.random(n) < 0.5, capital, np.char.add(capital, ' regiao'))
+    customers = pd.DataFrame({
+        'customer_id': customer_id,
+        'customer_unique_id': unique_id,
+        'customer_zip_code_prefix': zip_start + rng.integers(0, 900, n),
+        'customer_city': city,
+        'customer_state': state,
+    })
+
+    day = rng.choice(catalog['days'], n, p=catalog['day_p'])
+    seconds = rng.choice(24, n, p=catalog['hour_p']) * 3600 + rng.integers(0, 3600, n)
+    purchase = pd.to_datetime(day) + pd.to_timedelta(seconds, unit='s')
+
+    statuses, status_p = distribution(ORDER_STATUS)
+    status = rng.choice(statuses, n, p=status_p)
+    approved = purchase + pd.to_timedelta(rng.gamma(1.2, 8, n) * 3600, unit='s')
+    carrier = approved + pd.to_timedelta(rng.gamma(2.0, 1.4, n) * 86400, unit='s')
+    delivered = purchase + pd.to_timedelta(rng.gamma(4.0, delivery_days / 4.0) * 86400, unit='s')
+    estimated = purchase.normalize() + pd.to_timedelta(
+        np.round(delivery_days + 11 + rng.normal(0, 3, n)).clip(3), unit='D')
+
+    not_delivered = status != 'delivered'
+    not_shipped = np.isin(status, ['canceled', 'unavailable', 'invoiced', 'processing', 'created'])
+    orders = pd.DataFrame({
+        'order_id': random_ids(rng, n),
+        'customer_id': customer_id,
+        'order_status': status,
+        'order_purchase_timestamp': purchase.floor('s'),
+        'order_approved_at': approved.floor('s').where(status != 'created'),
+        'order_delivered_carrier_date': carrier.floor('s').where(~not_shipped),
+        'order_delivered_customer_date': delivered.floor('s').where(~not_delivered),
+        'order_estimated_delivery_date': estimated,
+    })
+    return customers, orders
+
+
+# Fungsi untuk membuat item pesanan (produk, penjual, harga, ongkir)
+def generate_items(rng, orders, catalog):
+    counts, count_p = distribution(ITEMS_PER_ORDER)
+    items_per_order = rng.choice(counts, len(orders), p=count_p)
+    rows = np.repeat(np.arange(len(orders)), items_per_order)
+    item_number = np.arange(len(rows)) - np.repeat(np.cumsum(items_per_order) - items_per_order, items_per_order) + 1
+
+    # Pesanan multi-item sering berisi produk yang sama beberapa kali
+    product = rng.choice(len(catalog['product_id']), len(rows), p=catalog['product_p'])
+    same_as_first = (item_number > 1) & (rng.random(len(rows)) < 0.6)
+    first_row = np.repeat(np.cumsum(items_per_order) - items_per_order, items_per_order)
+    product[same_as_first] = product[first_row[same_as_first]]
+    seller = rng.choice(len(catalog['seller_id']), len(rows), p=catalog['seller_p'])
+    seller[same_as_first] = seller[first_row[same_as_first]]
+
+    purchase = orders['order_purchase_timestamp'].values[rows]
+    return pd.DataFrame({
+        'order_id': orders['order_id'].values[rows],
+        'order_item_id': item_number,
+        'product_id': catalog['product_id'][product],
+        'seller_id': catalog['seller_id'][seller],
+        'shipping_limit_date': pd.to_datetime(purchase) + pd.Timedelta(days=6),
+        'price': np.round(catalog['product_price'][product] * rng.uniform(0.9, 1.1, len(rows)), 2),
+        'freight_value': np.round(catalog['product_freight'][product] * rng.uniform(0.8, 1.6, len(rows)), 2),
+    })
+
+
+# Fungsi untuk membuat baris pembayaran yang jumlahnya sama dengan total item + ongkir
+def generate_payments(rng, orders, items):
+    totals = (items['price'] + items['freight_value']).groupby(items['order_id'], sort=False).sum()
+    totals = totals.reindex(orders['order_id']).fillna(0).values
+    n = len(orders)
+
+    types, type_p = distribution(PAYMENT_TYPES)
+    main_type = rng.choice(types, n, p=type_p)
+
+    # ~1.5% pesanan memakai satu sampai tiga voucher sebelum pembayaran utama
+    vouchers = np.where(rng.random(n) < 0.015, rng.integers(1, 4, n), 0)
+    voucher_share = np.where(vouchers > 0, rng.uniform(0.1, 0.6, n), 0.0)
+    lines_per_order = vouchers + 1
+    rows = np.repeat(np.arange(n), lines_per_order)
+    sequential = np.arange(len(rows)) - np.repeat(np.cumsum(lines_per_order) - lines_per_order, lines_per_order) + 1
+    is_main = sequential == lines_per_order[rows]
+
+    voucher_value = totals * voucher_share / np.maximum(vouchers, 1)
+    value = np.where(is_main, totals[rows] - voucher_value[rows] * vouchers[rows], voucher_value[rows])
+    payment_type = np.where(is_main, main_type[rows], 'voucher')
+
+    # Cicilan hanya untuk kartu kredit; nilai kecil cenderung dibayar sekali
+    options, option_p = distribution(INSTALLMENTS)
+    installments = rng.choice(options, len(rows), p=option_p)
+    installments = np.minimum(installments, np.maximum(1, (value // 20).astype(np.int64)))
+    installments = np.where(payment_type == 'credit_card', installments, 1)
+
+    return pd.DataFrame({
+        'order_id': orders['order_id'].values[rows],
+        'payment_sequential': sequential,
+        'payment_type': payment_type,
+        'payment_installments': installments,
+        'payment_value': np.round(value, 2),
+    })
+
+
+# Fungsi untuk membuat ulasan (satu per pesanan), skor lebih rendah bila terlambat
+def generate_reviews(rng, orders):
+    n = len(orders)
+    delivered = orders['order_delivered_customer_date']
+    estimated = orders['order_estimated_delivery_date']
+    late = (delivered.isna() | (delivered > estimated)).values
+
+    score = np.where(
+        late,
+        rng.choice(np.arange(1, 6), n, p=REVIEW_SCORES_LATE),
+        rng.choice(np.arange(1, 6), n, p=REVIEW_SCORES_ON_TIME),
+    )
+    has_message = rng.random(n) < 0.41
+    has_title = rng.random(n) < 0.12
+    message = np.where(has_message, rng.choice(REVIEW_MESSAGES, n), None)
+    title = np.where(has_title, rng.choice(REVIEW_TITLES, n), None)
+
+    created = delivered.fillna(estimated).dt.normalize() + pd.Timedelta(days=1)
+    answered = created + pd.to_timedelta(rng.gamma(1.5, 2.0, n) * 86400, unit='s')
+    return pd.DataFrame({
+        'review_id': random_ids(rng, n),
+        'order_id': orders['order_id'].values,
+        'review_score': score,
+        'review_comment_title': title,
+        'review_comment_message': message,
+        'review_creation_date': created,
+        'review_answer_timestamp': answered.dt.floor('s'),
+    })
+
+
+# Fungsi untuk menyiapkan zip prefix geolocation: rentang zip pelanggan sintetis per negara bagian
+# ditambah zip penjual katalog, masing-masing dengan titik pusat di sekitar ibu kota negara bagian
+def geolocation_places(rng, catalog):
+    prefix = np.concatenate([spec[2] + np.arange(900) for spec in STATES.values()] + [catalog['seller_zip']])
+    state = np.concatenate([np.repeat(list(STATES), 900), catalog['seller_state']])
+    known = np.isin(state, list(STATES))
+    prefix, first = np.unique(prefix[known], return_index=True)
+    state = state[known][first]
+
+    capital = np.array([STATES[s][3] for s in state])
+    return {
+        'prefix': prefix,
+        'state': state,
+        'city': np.where(prefix % 2 == 0, capital, np.char.add(capital, ' regiao')),
+        'center': np.array([STATE_CENTERS[s] for s in state]) + rng.normal(0, 0.8, (len(prefix), 2)),
+    }
+
+
+# Fungsi untuk membuat satu chunk baris geolocation mentah; setiap baris mengambil salah satu
+# dari POINTS_PER_PREFIX titik tetap milik zip prefix-nya sehingga banyak baris duplikat
+def generate_geolocation(rng, places, n):
+    place = rng.integers(0, len(places['prefix']), n)
+    point = rng.integers(0, POINTS_PER_PREFIX, n)
+    offset = np.stack([np.sin(point * 2.4), np.cos(point * 1.7)], axis=1) * 0.02
+    coordinates = np.round(places['center'][place] + offset, 6)
+
+    # Sebagian kecil koordinat salah input (di luar Brasil), seperti pada data asli
+    wrong = rng.random(n) < 0.0005
+    coordinates[wrong] = rng.uniform(-60, 60, (wrong.sum(), 2))
+    return pd.DataFrame({
+        'geolocation_zip_code_prefix': places['prefix'][place],
+        'geolocation_lat': coordinates[:, 0],
+        'geolocation_lng': coordinates[:, 1],
+        'geolocation_city': places['city'][place],
+        'geolocation_state': places['state'][place],
+    })
+
+
+# Fungsi untuk membuat semua tabel untuk satu chunk pesanan
+def generate_chunk(rng, n, catalog):
+    customers, orders = generate_orders(rng, n, catalog)
+    items = generate_items(rng, orders, catalog)
+    return {
+        'customers': customers,
+        'orders': orders,
+        'order_items': items,
+        'order_payments': generate_payments(rng, orders, items),
+        'order_reviews': generate_reviews(rng, orders),
+    }
+
+
+# Fungsi untuk menambahkan chunk ke file CSV / Parquet output
+def write_chunk(tables, out_dir, formats, writers, first):
+    for name, df in tables.items():
+        if 'csv' in formats:
+            df.to_csv(os.path.join(out_dir, f'{name}_dataset.csv'), mode='w' if first else 'a',
+                      header=first, index=False)
+        if 'parquet' in formats:
+            if name not in writers:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writers[name] = pq.ParquetWriter(os.path.join(out_dir, f'{name}_dataset.parquet'), table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=writers[name].schema, preserve_index=False)
+            writers[name].write_table(table)
+
+
+# Fungsi utama: membuat dataset sintetis dengan skala tertentu ke out_dir
+def generate(out_dir, scale=1.0, formats=('csv',), chunk_size=250000, seed=0, data_dir=None):
+    data_dir = data_dir or os.path.join(ROOT_DIR, 'data')
+    os.makedirs(out_dir, exist_ok=True)
+    for filename in CATALOG_FILES:
+        shutil.copy(os.path.join(data_dir, filename), os.path.join(out_dir, filename))
+
+    seeds = np.random.SeedSequence(seed)
+    catalog = load_catalog(data_dir, np.random.default_rng(seeds.spawn(1)[0]))
+
+    total = int(round(BASE_ORDERS * scale))
+    sizes = [chunk_size] * (total // chunk_size) + ([total % chunk_size] if total % chunk_size else [])
+    rows = dict.fromkeys(GENERATED_TABLES, 0)
+    writers = {}
+    try:
+        for index, (size, chunk_seed) in enumerate(zip(sizes, seeds.spawn(len(sizes)))):
+            tables = generate_chunk(np.random.default_rng(chunk_seed), size, catalog)
+            write_chunk(tables, out_dir, formats, writers, first=index == 0)
+            for name, df in tables.items():
+                rows[name] += len(df)
+
+        # Geolocation adalah tabel referensi: ukurannya tetap, tidak mengikuti skala
+        places = geolocation_places(np.random.default_rng(seeds.spawn(1)[0]), catalog)
+        geo_rows = BASE_GEOLOCATION_ROWS
+        geo_sizes = [chunk_size] * (geo_rows // chunk_size) + ([geo_rows % chunk_size] if geo_rows % chunk_size else [])
+        for index, (size, chunk_seed) in enumerate(zip(geo_sizes, seeds.spawn(len(geo_sizes)))):
+            geolocation = generate_geolocation(np.random.default_rng(chunk_seed), places, size)
+            write_chunk({'geolocation': geolocation}, out_dir, formats, writers, first=index == 0)
+            rows['geolocation'] += len(geolocation)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Buat dataset sintetis berbentuk Olist untuk uji skala')
+    parser.add_argument('--scale', type=float, default=10, help='Faktor skala terhadap dataset asli (~99 ribu pesanan)')
+    parser.add_argument('--out', default=None, help='Direktori output (default: data/synthetic_x<scale>)')
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet', 'both'])
+    parser.add_argument('--chunk-size', type=int, default=250000, help='Jumlah pesanan per chunk')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    out_dir = args.out or os.path.join(ROOT_DIR, 'data', f'synthetic_x{args.scale:g}')
+    formats = ['csv', 'parquet'] if args.format == 'both' else [args.format]
+
+    start = time.perf_counter()
+    rows = generate(out_dir, args.scale, formats, args.chunk_size, args.seed)
+    for name, count in rows.items():
+        print(f"{name:<16} {count:>12,} baris")
+    print(f"Dataset sintetis ({', '.join(formats)}) di {out_dir} selesai dalam {time.perf_counter() - start:.1f} detik")
+    print(f"Gunakan dengan: OLIST_DATA_DIR={out_dir} python dashboard/data_store.py --out {os.path.join(out_dir, 'snapshot')}")
@@ -0,0 +1,346 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from time_index import slice_by_time
+from cube import query_cells, aggregate, where_mask
+from distinct import count_distinct
+from rfm import compute_rfm
+from geolocation import point_density
+from seller_stats import seller_summary
+from facts import DELIVERY_STATUS_LABELS, DELIVERY_CODE_COLUMN, NO_DELIVERY_STATUS
+from lead_times import (QUANTILES, query_lead_times, merge_histograms, histogram_quantiles, binned_histogram,
+                        group_quantiles, density_grid)
+
+# API query analitik tanpa Streamlit
+#
+# Setiap fungsi query bersifat murni: menerima dict tabel dari data_store.load_tables()
+# dan objek Filters, lalu mengembalikan dict berisi DataFrame/angka kecil yang siap
+# divisualisasikan. dashboard.py hanya menggambar hasilnya dan notebook.ipynb memanggil
+# fungsi yang sama, sehingga jalur query bisa di-cache, diprofil dan diukur di satu tempat
+# (benchmarks/bench_tabs.py).
+
+CATEGORY_COLUMN = 'product_category_name_english'
+
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+               'September', 'October', 'November', 'December']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Skor ulasan yang dianggap rendah dan jumlah contoh ulasan rendah terbaru di tab 7
+LOW_REVIEW_SCORE = 2
+LOW_REVIEW_SAMPLE = 20
+
+# Status pengiriman yang dihitung sebagai terlambat
+LATE_STATUSES = ['Late', 'Very Late']
+
+# Nilai filter sidebar. Tuple immutable (hashable) sehingga bisa langsung menjadi key cache;
+# buat dengan make_filters() agar tanggal dan pilihan "semua" dinormalisasi
+Filters = namedtuple('Filters', ['start_date', 'end_date', 'category', 'state', 'distinct_mode'],
+                     defaults=[None, None, 'exact'])
+
+# Pilihan selectbox sidebar yang berarti tanpa filter
+ALL_OPTIONS = ['All Categories', 'All States']
+
+
+# Fungsi untuk membuat Filters dengan tanggal sebagai pd.Timestamp dan "semua" sebagai None
+def make_filters(start_date, end_date, category=None, state=None, distinct_mode='exact'):
+    return Filters(
+        start_date=pd.Timestamp(start_date),
+        end_date=pd.Timestamp(end_date),
+        category=None if category in ALL_OPTIONS else category,
+        state=None if state in ALL_OPTIONS else state,
+        distinct_mode=distinct_mode,
+    )
+
+
+# Fungsi untuk membuat Filters seluruh rentang data (setara "Semua Data" di sidebar)
+def all_data_filters(data, **kwargs):
+    timestamps = data['orders']['order_purchase_timestamp']
+    return make_filters(timestamps.min(), timestamps.max(), **kwargs)
+
+
+# Tab 1: total, tren bulanan dan penjualan per kategori dari cube penjualan harian
+def sales_overview(data, filters):
+    start_date, end_date, distinct_mode = filters.start_date, filters.end_date, filters.distinct_mode
+    where = {CATEGORY_COLUMN: filters.category}
+    sales_cells = query_cells(data, 'sales', start_date, end_date, where=where)
+
+    totals = aggregate(sales_cells, None, 'sales')
+    # Pesanan unik dihitung dari order key per sel cube (pesanan multi-kategori tidak terhitung dua kali)
+    totals['order_count'] = count_distinct(data, 'sales', start_date, end_date,
+                                           where=where, mode=distinct_mode)
+
+    # Agregasi penjualan per bulan dari sel cube harian
+    month = pd.Series(sales_cells['date'].values.astype('datetime64[M]'), index=sales_cells.index, name='month')
+    monthly_sales = aggregate(sales_cells, month, 'sales').rename(columns={'price_sum': 'price'})
+    monthly_sales['month'] = monthly_sales['month'].dt.strftime('%Y-%m')
+
+    # Agregasi berdasarkan kategori dari sel cube
+    category_sales = aggregate(sales_cells, CATEGORY_COLUMN, 'sales').rename(
+        columns={'price_sum': 'price', 'order_count': 'order_id'}
+    )
+    category_sales['order_id'] = count_distinct(
+        data, 'sales', start_date, end_date, where=where, by=CATEGORY_COLUMN, mode=distinct_mode
+    ).reindex(category_sales[CATEGORY_COLUMN]).values
+
+    return {
+        'totals': totals,
+        'monthly_sales': monthly_sales,
+        'category_sales': category_sales,
+    }
+
+
+# Tab 2: tabel RFM pelanggan untuk pesanan terkirim dalam rentang tanggal (None jika kosong)
+# Hanya memakai rentang tanggal dari filter
+def customer_segments(data, filters):
+    payment_lines = slice_by_time(data['payment_lines'], filters.start_date, filters.end_date)
+    orders_with_payments = payment_lines[payment_lines['order_status'] == 'delivered']
+    if len(orders_with_payments) == 0:
+        return None
+
+    rfm = compute_rfm(orders_with_payments, filters.end_date)
+    segment_dist = rfm['segment'].value_counts().reset_index()
+    segment_dist.columns = ['segment', 'count']
+
+    # Rata-rata metrik untuk setiap segmen
+    segment_metrics = rfm.groupby('segment', observed=False).agg({
+        'recency': 'mean',
+        'frequency': 'mean',
+        'monetary': 'mean'
+    }).reset_index()
+
+    return {
+        'rfm': rfm,
+        'segment_dist': segment_dist,
+        'segment_metrics': segment_metrics,
+    }
+
+
+# Tab 3: ringkasan metode pembayaran dan pola cicilan kartu kredit
+# Memakai rentang tanggal dan mode hitung unik (kategori/negara bagian tidak berlaku)
+def payment_overview(data, filters):
+    start_date, end_date, distinct_mode = filters.start_date, filters.end_date, filters.distinct_mode
+    payment_cells = query_cells(data, 'payments', start_date, end_date)
+    payment_summary = aggregate(payment_cells, 'payment_type', 'payments')
+
+    payment_summary['order_count'] = count_distinct(
+        data, 'payments', start_date, end_date, by='payment_type', mode=distinct_mode
+    ).reindex(payment_summary['payment_type']).values
+
+    payment_summary = payment_summary[['payment_type', 'payment_value', 'order_count']]
+    payment_summary.columns = ['payment_type', 'total_value', 'order_count']
+    payment_summary['percentage'] = payment_summary['total_value'] / payment_summary['total_value'].sum() * 100
+
+    # Distribusi dan rata-rata nilai per jumlah cicilan kartu kredit dari sel cube yang sama
+    # (jumlah baris pembayaran dan total nilai per cicilan, tanpa memotong payment_lines)
+    credit_cells = payment_cells[where_mask(payment_cells, {'payment_type': 'credit_card'})]
+    installments = aggregate(credit_cells, 'payment_installments', 'payments')
+
+    installment_counts = pd.DataFrame({
+        'installments': installments['payment_installments'].to_numpy(),
+        'count': installments['payment_count'].to_numpy(dtype='int64'),
+    })
+    installment_values = pd.DataFrame({
+        'installments': installments['payment_installments'].to_numpy(),
+        'avg_value': installments['payment_value'].to_numpy() / installments['payment_count'].to_numpy(),
+    })
+
+    return {
+        'payment_summary': payment_summary,
+        'credit_count': int(installments['payment_count'].sum()),
+        'installment_counts': installment_counts,
+        'installment_values': installment_values,
+    }
+
+
+# Tab 4: waktu pengiriman aktual vs estimasi untuk pesanan terkirim (None jika kosong)
+# Hanya memakai rentang tanggal dari filter; metrik dan jumlah per status dihitung dengan
+# bincount dari kolom pra-hitung di tabel orders, distribusi waktu pengiriman dari sketsa
+# histogram per hari x negara bagian (lead_times.py), sehingga ukuran hasil tidak mengikuti jumlah pesanan
+def delivery_performance(data, filters):
+    orders = slice_by_time(data['orders'], filters.start_date, filters.end_date)
+    codes = orders[DELIVERY_CODE_COLUMN].to_numpy()
+    delivered = codes != NO_DELIVERY_STATUS
+    delivered_count = int(delivered.sum())
+    if delivered_count == 0:
+        return None
+
+    # Jumlah pesanan per status, diurutkan berdasarkan kategori
+    counts = np.bincount(codes[delivered], minlength=len(DELIVERY_STATUS_LABELS))
+    delivery_summary = pd.DataFrame({
+        'delivery_status': pd.Categorical(DELIVERY_STATUS_LABELS, categories=DELIVERY_STATUS_LABELS, ordered=True),
+        'count': counts.astype('int64'),
+    })
+
+    # Very Early, Early dan On Time = selisih hari <= 0
+    on_time = counts[:DELIVERY_STATUS_LABELS.index('On Time') + 1].sum()
+
+    # Histogram dan kuantil waktu pengiriman dari sel sketsa yang digabung dalam rentang tanggal
+    cells = query_lead_times(data, filters.start_date, filters.end_date)
+    values, day_counts = merge_histograms(cells)
+    quantiles = histogram_quantiles(values, day_counts, list(QUANTILES.values()))[0]
+    state_quantiles = group_quantiles(cells, 'customer_state').sort_values('p50', ascending=False)
+
+    return {
+        'delivery_summary': delivery_summary,
+        'lead_time_histogram': binned_histogram(values, day_counts[0]),
+        'lead_time_quantiles': dict(zip(QUANTILES, quantiles)),
+        'state_quantiles': state_quantiles,
+        'density_grid': density_grid(orders),
+        'avg_delivery_time': orders['actual_delivery_days'].to_numpy()[delivered].sum(dtype='int64') / delivered_count,
+        'avg_estimated_time': orders['estimated_delivery_days'].to_numpy()[delivered].sum(dtype='int64') / delivered_count,
+        'on_time_percentage': on_time / delivered_count * 100,
+    }
+
+
+# Tab 5: distribusi pelanggan, kategori teratas per wilayah, peta panas bulan x hari dan
+# kepadatan pelanggan/penjual per sel grid (None jika tabel zip_centroids tidak tersedia)
+def geo_overview(data, filters):
+    start_date, end_date, distinct_mode = filters.start_date, filters.end_date, filters.distinct_mode
+    state = filters.state
+    customer_states = data['customers']['customer_state'].value_counts().reset_index()
+    customer_states.columns = ['state', 'customer_count']
+
+    city_counts = None
+    if state:
+        customer_states = customer_states[customer_states['state'] == state]
+        # Jika state dipilih, distribusi kota
+        customers = data['customers']
+        city_counts = customers[customers['customer_state'] == state]['customer_city'].value_counts().reset_index()
+        city_counts.columns = ['city', 'count']
+        city_counts = city_counts[city_counts['count'] > 0]
+
+    # Kategori teratas dari sel cube penjualan, difilter negara bagian jika ditentukan
+    where = {'customer_state': state}
+    state_cells = query_cells(data, 'sales', start_date, end_date, where=where)
+    category_summary = aggregate(state_cells, CATEGORY_COLUMN, 'sales')
+
+    category_summary['order_count'] = count_distinct(
+        data, 'sales', start_date, end_date, where=where, by=CATEGORY_COLUMN, mode=distinct_mode
+    ).reindex(category_summary[CATEGORY_COLUMN]).values
+
+    category_summary = category_summary[[CATEGORY_COLUMN, 'price_sum', 'order_count']]
+    category_summary.columns = ['category', 'total_sales', 'order_count']
+
+    # Sel cube harian (semua kategori) untuk pola waktu bulan x hari dalam seminggu
+    daily_cells = query_cells(data, 'orders', start_date, end_date, where=where)
+    month = daily_cells['date'].dt.month_name().rename('month')
+    day_of_week = daily_cells['date'].dt.day_name().rename('day_of_week')
+    sales_heatmap = daily_cells.groupby([month, day_of_week])['price_sum'].sum().unstack().fillna(0)
+    sales_heatmap = sales_heatmap.reindex(MONTH_ORDER).reindex(columns=DAY_ORDER)
+
+    # Kepadatan lokasi pelanggan dan penjual lewat centroid zip prefix
+    customer_density = seller_density = None
+    if 'zip_centroids' in data:
+        customers, sellers = data['customers'], data['sellers']
+        if state:
+            customers = customers[customers['customer_state'] == state]
+            sellers = sellers[sellers['seller_state'] == state]
+        customer_density = point_density(customers['customer_zip_code_prefix'], data['zip_centroids'])
+        seller_density = point_density(sellers['seller_zip_code_prefix'], data['zip_centroids'])
+
+    return {
+        'customer_states': customer_states,
+        'city_counts': city_counts,
+        'category_summary': category_summary,
+        'sales_heatmap': sales_heatmap,
+        'customer_density': customer_density,
+        'seller_density': seller_density,
+    }
+
+
+# Tab 6: metrik per penjual dari seller_months (None jika tidak ada penjual aktif)
+# Memakai rentang tanggal (dibulatkan ke bulan) dan negara bagian penjual
+def seller_performance(data, filters):
+    summary = seller_summary(data['seller_months'], filters.start_date, filters.end_date)
+
+    sellers = data['sellers']
+    seller_state = pd.Series(sellers['seller_state'].to_numpy(), index=sellers['seller_id'])
+    summary['seller_state'] = seller_state.reindex(summary['seller_id']).to_numpy()
+    if filters.state:
+        summary = summary[summary['seller_state'] == filters.state].reset_index(drop=True)
+    if len(summary) == 0:
+        return None
+
+    return {
+        'summary': summary,
+        'totals': {
+            'seller_count': len(summary),
+            'revenue': summary['revenue'].sum(),
+            'median_review': summary['avg_review'].median(),
+            'median_on_time_rate': summary['on_time_rate'].median(),
+        },
+    }
+
+
+# Tab 7: skor ulasan rata-rata per kategori, negara bagian, status pengiriman dan penjual,
+# serta ulasan bernilai rendah terbaru (tanpa teks; teks dibaca terpisah lewat reviews.py)
+# Rata-rata per kategori/negara bagian/status dihitung per item pesanan (sama dengan cube)
+def review_overview(data, filters):
+    start_date, end_date = filters.start_date, filters.end_date
+    category, state = filters.category, filters.state
+
+    # Per kategori (difilter negara bagian) dan per negara bagian (difilter kategori) dari cube
+    category_cells = query_cells(data, 'sales', start_date, end_date, where={'customer_state': state})
+    state_cells = query_cells(data, 'sales', start_date, end_date, where={CATEGORY_COLUMN: category})
+    totals = aggregate(state_cells[where_mask(state_cells, {'customer_state': state})], None, 'sales')
+    if totals['review_count'] == 0:
+        return None
+
+    by_category = aggregate(category_cells, CATEGORY_COLUMN, 'sales')
+    by_state = aggregate(state_cells, 'customer_state', 'sales')
+    for summary in (by_category, by_state):
+        summary['avg_review'] = summary['review_sum'] / summary['review_count']
+    by_category = by_category[by_category['review_count'] > 0][[CATEGORY_COLUMN, 'avg_review', 'review_count']]
+    by_category.columns = ['category', 'avg_review', 'review_count']
+    by_state = by_state[by_state['review_count'] > 0][['customer_state', 'avg_review', 'review_count']]
+    by_state.columns = ['state', 'avg_review', 'review_count']
+
+    # Per status ketepatan pengiriman dari potongan tabel fakta (kolom pra-hitung di facts.py)
+    lines = slice_by_time(data['order_lines'], start_date, end_date)
+    lines = lines[where_mask(lines, {CATEGORY_COLUMN: category, 'customer_state': state})]
+    by_delivery_status = lines.groupby('delivery_status', observed=False)['review_score'].agg(
+        avg_review='mean', review_count='count'
+    ).reindex(DELIVERY_STATUS_LABELS).reset_index()
+    late = lines[lines['delivery_status'].isin(LATE_STATUSES)]['review_score']
+
+    # Per penjual dari seller_months (rentang dibulatkan ke bulan, negara bagian penjual)
+    by_seller = seller_summary(data['seller_months'], start_date, end_date)
+    if state:
+        seller_state = pd.Series(data['sellers']['seller_state'].to_numpy(), index=data['sellers']['seller_id'])
+        by_seller = by_seller[seller_state.reindex(by_seller['seller_id']).to_numpy() == state]
+    by_seller = by_seller.dropna(subset=['avg_review'])[['seller_id', 'avg_review', 'order_count']]
+
+    # Ulasan bernilai rendah terbaru dalam rentang tanggal pembuatan ulasan
+    order_reviews = data['order_reviews']
+    created = order_reviews['review_creation_date']
+    low = order_reviews[(order_reviews['review_score'] <= LOW_REVIEW_SCORE) &
+                        (created >= start_date) & (created <= end_date)]
+    low_reviews = low.nlargest(LOW_REVIEW_SAMPLE, 'review_creation_date')[
+        ['review_id', 'order_id', 'review_score', 'review_creation_date']
+    ]
+
+    return {
+        'totals': {
+            'avg_review': totals['review_sum'] / totals['review_count'],
+            'review_count': int(totals['review_count']),
+            'late_avg_review': late.mean(),
+        },
+        'by_category': by_category.reset_index(drop=True),
+        'by_state': by_state.reset_index(drop=True),
+        'by_delivery_status': by_delivery_status,
+        'by_seller': by_seller.reset_index(drop=True),
+        'low_reviews': low_reviews.reset_index(drop=True),
+    }
+
+
+# Nama query -> (fungsi, field Filters yang dipakai). Field lain tidak memengaruhi hasil,
+# sehingga tidak ikut menjadi key cache (lihat query_cache.py)
+QUERIES = {
+    'sales': (sales_overview, ['start_date', 'end_date', 'category', 'distinct_mode']),
+    'segments': (customer_segments, ['start_date', 'end_date']),
+    'payments': (payment_overview, ['start_date', 'end_date', 'distinct_mode']),
+    'delivery': (delivery_performance, ['start_date', 'end_date']),
+    'geo': (geo_overview, ['start_date', 'end_date', 'state', 'distinct_mode']),
+    'sellers': (seller_performance, ['start_date', 'end_date', 'state']),
+    'reviews': (review_overview, ['start_date', 'end_date', 'category', 'state']),
+}
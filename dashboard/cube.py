@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+from time_index import time_bounds
+
+# Cube rollup harian yang dimaterialisasi sekali dari tabel fakta
+#
+# Setiap cube berisi ukuran aditif (jumlah harga, jumlah item, nilai pembayaran) per
+# hari x dimensi. Jumlah pesanan unik (nunique order_id) juga aditif antar hari dan
+# negara bagian karena satu pesanan hanya jatuh pada satu tanggal dan satu negara bagian.
+# Pesanan bisa berisi beberapa kategori / metode pembayaran / jumlah cicilan, sehingga
+# order_count pada cube 'sales'/'payments' hanya boleh dijumlahkan di dalam satu kategori /
+# metode pembayaran + cicilan. Total pesanan lintas sel dihitung dengan distinct.py.
+#
+# review_sum / review_count menjumlahkan skor ulasan pesanan per item (pesanan dengan
+# beberapa item ikut dihitung per item), sehingga rata-rata skor bisa dihitung per sel.
+#
+# Filter tanggal bisa dimulai/berakhir di tengah hari. Hari yang tercakup penuh dijawab
+# dari cube, sedangkan sisa jam di hari tepi dihitung dari potongan kecil tabel fakta
+# (dicari dengan binary search), sehingga hasilnya tetap sama persis.
+
+CUBES = {
+    'sales': {
+        'source': 'order_lines',
+        'dimensions': ['customer_state', 'product_category_name_english'],
+        'measures': {
+            'price_sum': ('price', 'sum'),
+            'item_count': ('price', 'size'),
+            'order_count': ('order_id', 'nunique'),
+            'review_sum': ('review_score', 'sum'),
+            'review_count': ('review_score', 'count'),
+        },
+    },
+    'orders': {
+        'source': 'order_lines',
+        'dimensions': ['customer_state'],
+        'measures': {
+            'price_sum': ('price', 'sum'),
+            'item_count': ('price', 'size'),
+            'order_count': ('order_id', 'nunique'),
+            'review_sum': ('review_score', 'sum'),
+            'review_count': ('review_score', 'count'),
+        },
+    },
+    # Tab 3: metode pembayaran x jumlah cicilan per hari (tanpa negara bagian karena tab 3 tidak
+    # memfilter wilayah); pesanan dengan beberapa baris pembayaran dihitung unik lewat distinct.py
+    'payments': {
+        'source': 'payment_lines',
+        'dimensions': ['payment_type', 'payment_installments'],
+        'measures': {
+            'payment_value': ('payment_value', 'sum'),
+            'payment_count': ('payment_value', 'size'),
+            'order_count': ('order_id', 'nunique'),
+        },
+    },
+}
+
+CUBE_TABLES = [f'cube_{name}' for name in CUBES]
+
+TIME_COLUMN = 'order_purchase_timestamp'
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+# Fungsi untuk menyiapkan kunci sel (hari + dimensi) dari baris fakta
+def cell_keys(rows, spec):
+    dimensions = [col for col in spec['dimensions'] if col in rows.columns]
+    day = pd.Series(rows[TIME_COLUMN].values.astype('datetime64[D]'), index=rows.index, name='date')
+    return [day] + [rows[col] for col in dimensions]
+
+
+# Fungsi untuk meringkas baris fakta menjadi sel cube per hari
+def rollup(rows, spec):
+    cells = rows.groupby(cell_keys(rows, spec), observed=True, dropna=False).agg(
+        **{measure: agg for measure, agg in spec['measures'].items()}
+    ).reset_index()
+    cells['date'] = cells['date'].astype('datetime64[ns]')
+    return cells
+
+
+# Fungsi untuk memberi nomor sel cube (posisi baris di cube) pada setiap baris fakta
+def cell_codes(rows, spec):
+    return rows.groupby(cell_keys(rows, spec), observed=True, dropna=False).ngroup().values
+
+
+# Fungsi untuk memeriksa apakah cube berisi semua dimensi dan ukuran spesifikasi saat ini
+# (dimensi yang tidak ada di tabel sumber memang tidak ikut di cube)
+def is_current(tables, name):
+    spec = CUBES[name]
+    columns = [col for col in spec['dimensions'] if col in tables[spec['source']].columns] + list(spec['measures'])
+    return f'cube_{name}' in tables and all(col in tables[f'cube_{name}'].columns for col in columns)
+
+
+# Fungsi untuk menambahkan cube ke dict data jika belum ada atau berasal dari snapshot lama (mis. jalur CSV)
+def add_cubes(tables):
+    stale = [name for name in CUBES if not is_current(tables, name)]
+    for name in stale:
+        tables[f'cube_{name}'] = rollup(tables[CUBES[name]['source']], CUBES[name])
+        # Order key / sketsa per sel mengikuti nomor sel cube, sehingga ikut dibangun ulang (distinct.py)
+        tables.pop(f'distinct_{name}', None)
+        tables.pop(f'sketch_{name}', None)
+    return tables
+
+
+# Fungsi untuk membagi rentang start..end (inklusif) menjadi hari penuh [day_lo, day_hi)
+def full_days(start, end):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    day_lo = start.normalize()
+    if day_lo < start:
+        day_lo += ONE_DAY
+    day_hi = (end + pd.Timedelta(1, 'ns')).normalize()
+    return day_lo, max(day_lo, day_hi)
+
+
+# Fungsi untuk membagi rentang tanggal menjadi baris tabel sel harian [lo, hi) untuk hari penuh
+# dan potongan tabel sumber terurut waktu untuk sisa jam pada hari tepi
+def split_cells(cells, source, start, end):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    day_lo, day_hi = full_days(start, end)
+
+    # Hari penuh dari tabel sel (terurut berdasarkan date)
+    dates = cells['date'].values
+    lo = dates.searchsorted(day_lo.to_datetime64(), side='left')
+    hi = dates.searchsorted(day_hi.to_datetime64(), side='left')
+
+    # Sisa jam pada hari tepi dari tabel sumber
+    if day_lo >= day_hi:
+        edges = [(start, end)]
+    else:
+        edges = [(start, day_lo - pd.Timedelta(1, 'ns')), (day_hi, end)]
+    edge_rows = []
+    for edge_start, edge_end in edges:
+        if edge_start > edge_end:
+            continue
+        edge_lo, edge_hi = time_bounds(source, edge_start, edge_end)
+        if edge_hi > edge_lo:
+            edge_rows.append(source.iloc[edge_lo:edge_hi])
+    return lo, hi, edge_rows
+
+
+# Fungsi untuk membagi rentang tanggal menjadi baris cube [lo, hi) untuk hari penuh
+# dan potongan tabel fakta untuk sisa jam pada hari tepi
+def split_range(tables, name, start, end):
+    return split_cells(tables[f'cube_{name}'], tables[CUBES[name]['source']], start, end)
+
+
+# Fungsi untuk membuat mask filter kesamaan pada dimensi
+# where: dict kolom -> nilai (None berarti tidak difilter)
+def where_mask(df, where):
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in (where or {}).items():
+        if value is not None:
+            mask &= (df[column] == value).values
+    return mask
+
+
+# Fungsi utama query: sel cube dalam rentang tanggal dengan filter kesamaan pada dimensi
+def query_cells(tables, name, start, end, where=None):
+    lo, hi, edge_rows = split_range(tables, name, start, end)
+    parts = [tables[f'cube_{name}'].iloc[lo:hi]]
+    parts += [rollup(rows, CUBES[name]) for rows in edge_rows]
+
+    cells = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    return cells[where_mask(cells, where)]
+
+
+# Fungsi untuk menjumlahkan ukuran sel cube berdasarkan kolom/Series pengelompokan
+def aggregate(cells, by, name):
+    measures = list(CUBES[name]['measures'])
+    if by is None:
+        return cells[measures].sum()
+    return cells.groupby(by, observed=True)[measures].sum().reset_index()
@@ -4,8 +4,16 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import folium
-from streamlit_folium import folium_static
+from data_store import load_tables
+import analytics
+from query_cache import run_query, prefetch, cache_stats
+from state_map import state_choropleth
+from geo import load_states
+import seller_stats
+from schema import decode_ids
+import reviews
+from data_store import SNAPSHOT_DIR, find_table_file
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -16,72 +24,15 @@ st.set_page_config(page_title="Olist E-commerce Dashboard",
                    initial_sidebar_state="expanded")
 
 # Fungsi untuk memuat data hasil analisis dari notebook.ipynb
-@st.cache_data
+# st.cache_resource: satu salinan data per proses yang dipakai bersama oleh semua sesi
+# (tanpa pickle/copy per sesi). Frame bersifat read-only, jadi jangan diubah di tempat.
+@st.cache_resource
 def load_processed_data():
     try:
-        # Dalam aplikasi nyata, file-file ini akan dihasilkan dari notebook.ipynb
-        # Untuk demo, kita akan mencoba memuat langsung dari path data mentah
-        import os
-        
-        # Check if processed_data directory exists, create if it doesn't
-        if not os.path.exists('processed_data'):
-            os.makedirs('processed_data')
-            st.info("Created 'processed_data' directory. Run the notebook.ipynb first to generate processed datasets.")
-        
-        is_cloud = os.getenv('STREAMLIT_SHARING') == 'true' or os.getenv('STREAMLIT_RUN_ON_SAVE') == 'true'
-        
-        if is_cloud:
-            base_path = 'data'  
-        else:
-            base_path = '../data'  
-
-        def get_file_path(filename):
-            possible_paths = [
-                os.path.join('processed_data', filename),  # Check processed data first
-                os.path.join(base_path, filename),
-                os.path.join('data', filename),  
-                os.path.join('../data', filename)
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    return path
-            return os.path.join(base_path, filename)
-        
-        # Memuat semua dataset
-        # Umumnya kita memuat data hasil proses, tapi karena belum dibuat, kita memuat data mentah
-        df_customers = pd.read_csv(get_file_path('customers_dataset.csv'))
-        df_order_items = pd.read_csv(get_file_path('order_items_dataset.csv'))
-        df_order_payments = pd.read_csv(get_file_path('order_payments_dataset.csv'))
-        df_order_reviews = pd.read_csv(get_file_path('order_reviews_dataset.csv'))
-        df_orders = pd.read_csv(get_file_path('orders_dataset.csv'))
-        df_product_category = pd.read_csv(get_file_path('product_category_name_translation.csv'))
-        df_products = pd.read_csv(get_file_path('products_dataset.csv'))
-        df_sellers = pd.read_csv(get_file_path('sellers_dataset.csv'))
-        
-        # Mengkonversi kolom tanggal ke format datetime
-        orders_col = ['order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
-                      'order_delivered_customer_date', 'order_estimated_delivery_date']
-        for col in orders_col:
-            df_orders[col] = pd.to_datetime(df_orders[col])
-        
-        # Menggabungkan kategori produk dengan nama bahasa Inggris
-        df_products = pd.merge(
-            df_products, 
-            df_product_category, 
-            on='product_category_name', 
-            how='left'
-        )
-        
-        return {
-            'customers': df_customers,
-            'order_items': df_order_items,
-            'order_payments': df_order_payments,
-            'order_reviews': df_order_reviews,
-            'orders': df_orders,
-            'products': df_products,
-            'sellers': df_sellers
-        }
+        # Memuat semua dataset (lokasi file ditentukan data_store.get_file_path)
+        # Snapshot Arrow IPC ter-mmap / Parquet (python dashboard/data_store.py) dipakai
+        # jika tersedia, jika tidak kita memuat CSV hasil notebook atau data mentah
+        return load_tables()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -95,6 +46,13 @@ if not data:
     st.error("Gagal memuat data. Silakan periksa jalur file.")
     st.stop()
 
+# Memeriksa GeoJSON negara bagian untuk peta tab 5 (dimuat sekali per proses)
+try:
+    load_states()
+except FileNotFoundError as e:
+    st.error(str(e))
+    st.stop()
+
 # ---------------------- Dashboard ----------------------
 
 st.title("🛍️ Olist E-commerce Analytics Dashboard")
@@ -110,6 +68,8 @@ with st.expander("ℹ️ Tentang Dashboard"):
     3. **Metode Pembayaran**: Apa metode pembayaran yang paling populer dan bagaimana pola penggunaan cicilan kartu kredit?
     4. **Performa Pengiriman**: Bagaimana performa pengiriman pesanan dibandingkan dengan estimasi waktu?
     5. **Distribusi Geografis**: Bagaimana distribusi geografis pelanggan dan perbedaan perilaku pembelian antar wilayah?
+    6. **Performa Penjual**: Penjual mana yang unggul dalam pendapatan, ulasan, dan ketepatan pengiriman?
+    7. **Kepuasan Pelanggan**: Bagaimana skor ulasan bervariasi antar kategori, wilayah, penjual dan ketepatan pengiriman?
     
     Setiap tab dashboard dirancang untuk menjawab satu pertanyaan bisnis spesifik dengan visualisasi yang jelas dan wawasan yang dapat ditindaklanjuti.
     """)
@@ -175,45 +135,41 @@ with st.sidebar.expander("🌎 Lokasi Geografis", expanded=True):
     if selected_state == 'All States':
         selected_state = None
 
-# ---- Tab layout untuk menjawab pertanyaan bisnis ----
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Pertanyaan 1: Tren Penjualan", 
-    "👥 Pertanyaan 2: Segmentasi Pelanggan", 
-    "💳 Pertanyaan 3: Metode Pembayaran", 
-    "🚚 Pertanyaan 4: Performa Pengiriman",
-    "🌎 Pertanyaan 5: Distribusi Geografis"
-])
+# Mode hitung pesanan unik: exact (bitmap order key) atau perkiraan (sketsa HyperLogLog)
+with st.sidebar.expander("⚙️ Perhitungan", expanded=False):
+    distinct_option = st.radio(
+        "Hitung Pesanan Unik:",
+        ["Exact", "Perkiraan (HyperLogLog)"],
+        help="Perkiraan HyperLogLog menggabungkan sketsa per sel cube dengan galat sekitar 1-2%"
+    )
+    distinct_mode = 'exact' if distinct_option == "Exact" else 'hll'
+
+# Semua nilai filter sidebar dalam satu objek untuk API query (analytics.py)
+# Hasil query diambil lewat run_query: di-cache per (query, filter, versi data) untuk semua sesi,
+# sehingga hasilnya dipakai bersama dan tidak boleh diubah di tempat
+filters = analytics.make_filters(start_date, end_date, selected_category, selected_state, distinct_mode)
+
+# Mode tampilan tab: 'lazy' (default) hanya menjalankan tab yang sedang dibuka, query tab lain
+# dihitung di latar belakang; 'tabs' memakai st.tabs yang menjalankan semua tab setiap rerun
+TAB_MODE = os.getenv('OLIST_TAB_MODE', 'lazy')
 
 # ----- Tab 1: Tren Penjualan dan Kategori Terlaris -----
-with tab1:
+def render_sales_tab():
     st.header("📊 Pertanyaan 1: Bagaimana tren penjualan bulanan dan kategori produk apa yang paling laris?")
     
-    # Filter orders berdasarkan tanggal
-    filtered_orders = data['orders'][(data['orders']['order_purchase_timestamp'] >= start_date) & 
-                                (data['orders']['order_purchase_timestamp'] <= end_date)]
-    
-    # Gabungkan dengan items
-    filtered_items = pd.merge(
-        filtered_orders[['order_id']],
-        data['order_items'],
-        on='order_id',
-        how='inner'
-    )
-    
-    # Filter berdasarkan kategori jika ditentukan
-    if selected_category:
-        product_ids = data['products'][data['products']['product_category_name_english'] == selected_category]['product_id'].unique()
-        filtered_items = filtered_items[filtered_items['product_id'].isin(product_ids)]
+    # Total, tren bulanan dan penjualan per kategori dari cube penjualan harian (analytics.py)
+    sales = run_query(data, 'sales', filters)
+    totals = sales['totals']
     
     # Metrik utama dalam 3 kolom
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        total_orders = filtered_items['order_id'].nunique()
+        total_orders = int(totals['order_count'])
         st.metric("Total Pesanan", f"{total_orders:,}")
     
     with col2:
-        total_sales = filtered_items['price'].sum()
+        total_sales = totals['price_sum']
         st.metric("Total Penjualan", f"R$ {total_sales:,.2f}")
     
     with col3:
@@ -223,17 +179,8 @@ with tab1:
     # Visualisasi 1: Tren Penjualan Bulanan
     st.subheader("Visualisasi 1: Tren Penjualan Bulanan")
     
-    # Menggabungkan data pesanan dengan waktu
-    sales_over_time = pd.merge(
-        filtered_orders[['order_id', 'order_purchase_timestamp']],
-        filtered_items[['order_id', 'price']],
-        on='order_id',
-        how='inner'
-    )
-    
-    # Agregasi penjualan per bulan
-    sales_over_time['month'] = sales_over_time['order_purchase_timestamp'].dt.to_period('M')
-    monthly_sales = sales_over_time.groupby(sales_over_time['month'].astype(str))['price'].sum().reset_index()
+    # Agregasi penjualan per bulan dari sel cube harian
+    monthly_sales = sales['monthly_sales']
     
     # Plotting
     fig = px.line(
@@ -264,20 +211,9 @@ with tab1:
     # Visualisasi 2: Top 10 Kategori Berdasarkan Penjualan
     st.subheader("Visualisasi 2: Top 10 Kategori Produk Berdasarkan Penjualan")
     
-    # Menggabungkan data item dengan produk
-    items_with_categories = pd.merge(
-        filtered_items,
-        data['products'][['product_id', 'product_category_name', 'product_category_name_english']],
-        on='product_id',
-        how='inner'
-    )
-    
-    # Agregasi berdasarkan kategori
-    cat_column = 'product_category_name_english' if 'product_category_name_english' in items_with_categories.columns else 'product_category_name'
-    category_sales = items_with_categories.groupby(cat_column).agg({
-        'price': 'sum',
-        'order_id': 'nunique'
-    }).reset_index()
+    # Agregasi berdasarkan kategori dari sel cube
+    cat_column = analytics.CATEGORY_COLUMN
+    category_sales = sales['category_sales']
     
     # Sorting dan mengambil top 10
     top_categories = category_sales.sort_values('price', ascending=False).head(10)
@@ -311,7 +247,7 @@ with tab1:
         """)
 
 # ----- Tab 2: Segmentasi Pelanggan -----
-with tab2:
+def render_segments_tab():
     st.header("👥 Pertanyaan 2: Bagaimana segmentasi pelanggan berdasarkan analisis RFM (Recency, Frequency, Monetary)?")
     
     # Penjelasan tentang analisis RFM
@@ -325,38 +261,11 @@ with tab2:
         Metode ini sangat berguna untuk memahami nilai dan perilaku pelanggan, membantu bisnis dalam mengembangkan strategi pemasaran yang ditargetkan.
         """)
     
-    # Filter orders berdasarkan tanggal untuk RFM
-    filtered_orders_rfm = data['orders'][
-        (data['orders']['order_purchase_timestamp'] >= start_date) & 
-        (data['orders']['order_purchase_timestamp'] <= end_date) &
-        (data['orders']['order_status'] == 'delivered')
-    ]
-    
-    # Gabungkan dengan pembayaran
-    orders_with_payments = pd.merge(
-        filtered_orders_rfm[['order_id', 'customer_id', 'order_purchase_timestamp']],
-        data['order_payments'][['order_id', 'payment_value']],
-        on='order_id',
-        how='inner'
-    )
+    # RFM metrics (recency, frequency, monetary) beserta skor dan segmen untuk pesanan terkirim
+    segments = run_query(data, 'segments', filters)
     
-    if len(orders_with_payments) > 0:
-        # Hitung RFM metrics
-        # Recency
-        recency_df = orders_with_payments.groupby('customer_id')['order_purchase_timestamp'].max().reset_index()
-        recency_df['recency'] = (end_date - recency_df['order_purchase_timestamp']).dt.days
-        
-        # Frequency
-        frequency_df = orders_with_payments.groupby('customer_id')['order_id'].nunique().reset_index()
-        frequency_df.columns = ['customer_id', 'frequency']
-        
-        # Monetary
-        monetary_df = orders_with_payments.groupby('customer_id')['payment_value'].sum().reset_index()
-        monetary_df.columns = ['customer_id', 'monetary']
-        
-        # Combine
-        rfm = pd.merge(recency_df[['customer_id', 'recency']], frequency_df, on='customer_id')
-        rfm = pd.merge(rfm, monetary_df, on='customer_id')
+    if segments is not None:
+        rfm = segments['rfm']
         
         # Visualisasi 1: Metrik RFM
         st.subheader("Visualisasi 1: Metrik RFM")
@@ -376,55 +285,11 @@ with tab2:
             avg_monetary = rfm['monetary'].mean()
             st.metric("Rata-rata Monetary", f"R$ {avg_monetary:.2f}")
         
-        # Create segments - Penanganan khusus untuk recency
-        if rfm['recency'].nunique() < 5:
-            # Jika tidak cukup variasi, tetapkan nilai tengah
-            rfm['r_score'] = 3
-        else:
-            try:
-                rfm['r_score'] = pd.qcut(rfm['recency'], q=5, labels=[5, 4, 3, 2, 1], duplicates='drop')
-            except ValueError:
-                rfm['r_score'] = pd.cut(rfm['recency'], bins=5, labels=[5, 4, 3, 2, 1], duplicates='drop')
-        
-        # Penanganan untuk frequency
-        if rfm['frequency'].nunique() < 5:
-            rfm['f_score'] = 3
-        else:
-            try:
-                rfm['f_score'] = pd.qcut(rfm['frequency'].rank(method='first'), q=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-            except ValueError:
-                rfm['f_score'] = pd.cut(rfm['frequency'], bins=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-        
-        # Penanganan untuk monetary
-        if rfm['monetary'].nunique() < 5:
-            rfm['m_score'] = 3
-        else:
-            try:
-                rfm['m_score'] = pd.qcut(rfm['monetary'].rank(method='first'), q=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-            except ValueError:
-                rfm['m_score'] = pd.cut(rfm['monetary'], bins=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-        
-        # Convert score columns to numeric
-        for col in ['r_score', 'f_score', 'm_score']:
-            rfm[col] = pd.to_numeric(rfm[col], errors='coerce')
-        
-        # Calculate overall RFM score
-        rfm['rfm_score'] = rfm['r_score'] + rfm['f_score'] + rfm['m_score']
-        
-        # Create segment labels
-        rfm['segment'] = pd.cut(
-            rfm['rfm_score'],
-            bins=[0, 4, 8, 12, 15],
-            labels=['Bronze', 'Silver', 'Gold', 'Platinum'],
-            include_lowest=True
-        )
-        
         # Visualisasi 2: Distribusi Segmen RFM
         st.subheader("Visualisasi 2: Distribusi Segmen Pelanggan")
         
         # Visualize segment distribution
-        segment_dist = rfm['segment'].value_counts().reset_index()
-        segment_dist.columns = ['segment', 'count']
+        segment_dist = segments['segment_dist']
         
         fig = px.pie(
             segment_dist, 
@@ -466,12 +331,8 @@ with tab2:
             # Visualisasi 3: Karakteristik Segmen
             st.subheader("Visualisasi 3: Karakteristik Segmen Pelanggan")
             
-            # Hitung rata-rata metrik untuk setiap segmen
-            segment_metrics = rfm.groupby('segment').agg({
-                'recency': 'mean',
-                'frequency': 'mean',
-                'monetary': 'mean'
-            }).reset_index()
+            # Rata-rata metrik untuk setiap segmen
+            segment_metrics = segments['segment_metrics']
             
             # Reshape untuk visualisasi
             segment_metrics_melted = pd.melt(
@@ -551,32 +412,17 @@ with tab2:
         st.warning("Tidak ada data yang cukup untuk analisis RFM dalam rentang waktu yang dipilih.")
 
 # ----- Tab 3: Metode Pembayaran -----
-with tab3:
+def render_payments_tab():
     st.header("💳 Pertanyaan 3: Apa metode pembayaran yang paling populer dan bagaimana pola penggunaan cicilan kartu kredit?")
     
-    # Filter orders berdasarkan rentang tanggal
-    filtered_orders_payment = data['orders'][(data['orders']['order_purchase_timestamp'] >= start_date) & 
-                                         (data['orders']['order_purchase_timestamp'] <= end_date)]
-    
-    # Gabungkan dengan data pembayaran
-    payment_data = pd.merge(
-        filtered_orders_payment[['order_id']],
-        data['order_payments'],
-        on='order_id',
-        how='inner'
-    )
+    # Ringkasan metode pembayaran dan pola cicilan dalam rentang tanggal (analytics.py)
+    payments = run_query(data, 'payments', filters)
     
     # Visualisasi 1: Distribusi Metode Pembayaran
     st.subheader("Visualisasi 1: Distribusi Metode Pembayaran")
     
-    # Agregasi berdasarkan jenis pembayaran
-    payment_summary = payment_data.groupby('payment_type').agg({
-        'payment_value': 'sum',
-        'order_id': 'nunique'
-    }).reset_index()
-    
-    payment_summary.columns = ['payment_type', 'total_value', 'order_count']
-    payment_summary['percentage'] = payment_summary['total_value'] / payment_summary['total_value'].sum() * 100
+    # Agregasi berdasarkan jenis pembayaran dari cube pembayaran harian
+    payment_summary = payments['payment_summary']
     
     # Visualisasi distribusi metode pembayaran
     col1, col2 = st.columns([2, 1])
@@ -624,14 +470,10 @@ with tab3:
     # Visualisasi 2: Analisis Cicilan Kartu Kredit
     st.subheader("Visualisasi 2: Analisis Cicilan Kartu Kredit")
     
-    # Filter hanya metode pembayaran credit_card
-    credit_data = payment_data[payment_data['payment_type'] == 'credit_card']
-    
-    if len(credit_data) > 0:
+    # Hanya metode pembayaran credit_card
+    if payments['credit_count'] > 0:
         # Distribusi jumlah cicilan
-        installment_counts = credit_data['payment_installments'].value_counts().reset_index()
-        installment_counts.columns = ['installments', 'count']
-        installment_counts = installment_counts.sort_values('installments')
+        installment_counts = payments['installment_counts']
         
         fig = px.bar(
             installment_counts,
@@ -663,8 +505,7 @@ with tab3:
         st.subheader("Visualisasi 3: Hubungan Nilai Pesanan dan Jumlah Cicilan")
         
         # Rata-rata nilai pembelian berdasarkan jumlah cicilan
-        installment_values = credit_data.groupby('payment_installments')['payment_value'].mean().reset_index()
-        installment_values.columns = ['installments', 'avg_value']
+        installment_values = payments['installment_values']
         
         fig = px.line(
             installment_values,
@@ -695,68 +536,33 @@ with tab3:
         st.info("Tidak ada data pembayaran kartu kredit dalam periode yang dipilih.")
 
 # ----- Tab 4: Performa Pengiriman -----
-with tab4:
+def render_delivery_tab():
     st.header("🚚 Pertanyaan 4: Bagaimana performa pengiriman pesanan dibandingkan dengan estimasi waktu?")
     
-    # Filter orders berdasarkan rentang tanggal dan status terkirim
-    delivery_data = data['orders'][
-        (data['orders']['order_purchase_timestamp'] >= start_date) & 
-        (data['orders']['order_purchase_timestamp'] <= end_date) &
-        (data['orders']['order_status'] == 'delivered')
-    ].copy()
-    
-    # Filter out rows with missing delivery dates
-    delivery_data = delivery_data.dropna(subset=['order_delivered_customer_date', 'order_estimated_delivery_date'])
+    # Waktu pengiriman aktual vs estimasi untuk pesanan terkirim dalam rentang tanggal (analytics.py)
+    delivery = run_query(data, 'delivery', filters)
     
-    if len(delivery_data) > 0:
-        # Hitung selisih waktu antara estimasi dan aktual pengiriman
-        delivery_data['delivery_difference'] = (delivery_data['order_delivered_customer_date'] - 
-                                               delivery_data['order_estimated_delivery_date']).dt.days
-        
+    if delivery is not None:
         # Metrik performa pengiriman
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            # Hitung waktu pengiriman actual
-            delivery_data['actual_delivery_days'] = (delivery_data['order_delivered_customer_date'] - 
-                                                   delivery_data['order_purchase_timestamp']).dt.days
-            avg_delivery_time = delivery_data['actual_delivery_days'].mean()
+            avg_delivery_time = delivery['avg_delivery_time']
             st.metric("Rata-rata Waktu Pengiriman", f"{avg_delivery_time:.1f} hari")
         
         with col2:
-            # Hitung waktu pengiriman estimasi
-            delivery_data['estimated_delivery_days'] = (delivery_data['order_estimated_delivery_date'] - 
-                                                      delivery_data['order_purchase_timestamp']).dt.days
-            avg_estimated_time = delivery_data['estimated_delivery_days'].mean()
+            avg_estimated_time = delivery['avg_estimated_time']
             st.metric("Rata-rata Estimasi Pengiriman", f"{avg_estimated_time:.1f} hari")
         
         with col3:
-            # Hitung persentase tepat waktu
-            on_time_percentage = (delivery_data['delivery_difference'] <= 0).mean() * 100
+            on_time_percentage = delivery['on_time_percentage']
             st.metric("Persentase Tepat Waktu", f"{on_time_percentage:.1f}%")
         
         # Visualisasi 1: Status Performa Pengiriman
         st.subheader("Visualisasi 1: Status Performa Pengiriman")
         
-        # Definisi kategori ketepatan waktu
-        delivery_data['delivery_status'] = pd.cut(
-            delivery_data['delivery_difference'],
-            bins=[-float('inf'), -3, -1, 0, 2, float('inf')],
-            labels=['Very Early', 'Early', 'On Time', 'Late', 'Very Late']
-        )
-        
-        # Agregasi berdasarkan status pengiriman
-        delivery_summary = delivery_data['delivery_status'].value_counts().reset_index()
-        delivery_summary.columns = ['delivery_status', 'count']
-        
-        # Urutkan berdasarkan kategori
-        status_order = ['Very Early', 'Early', 'On Time', 'Late', 'Very Late']
-        delivery_summary['delivery_status'] = pd.Categorical(
-            delivery_summary['delivery_status'], 
-            categories=status_order, 
-            ordered=True
-        )
-        delivery_summary = delivery_summary.sort_values('delivery_status')
+        # Agregasi berdasarkan status pengiriman, urut berdasarkan kategori
+        delivery_summary = delivery['delivery_summary']
         
         # Warna untuk setiap kategori
         color_map = {
@@ -796,22 +602,35 @@ with tab4:
         # Visualisasi 2: Distribusi Waktu Pengiriman
         st.subheader("Visualisasi 2: Distribusi Waktu Pengiriman")
         
-        fig = px.histogram(
-            delivery_data,
-            x='actual_delivery_days',
-            nbins=30,
-            title='Distribusi Waktu Pengiriman (Hari)',
-            labels={'actual_delivery_days': 'Waktu Pengiriman (Hari)'},
-            color_discrete_sequence=['royalblue']
+        # Histogram sudah dikelompokkan di server (lead_times.py): hanya ~30 bin yang dikirim ke browser
+        lead_time_histogram = delivery['lead_time_histogram']
+        bin_width = lead_time_histogram['bin_end'] - lead_time_histogram['bin_start']
+        
+        fig = go.Figure(
+            go.Bar(
+                x=lead_time_histogram['bin_start'] + (bin_width - 1) / 2,
+                y=lead_time_histogram['count'],
+                width=bin_width,
+                marker_color='royalblue',
+                name='Jumlah Pesanan'
+            )
         )
+        fig.update_layout(title='Distribusi Waktu Pengiriman (Hari)')
         
         fig.add_vline(
-            x=delivery_data['actual_delivery_days'].mean(), 
+            x=delivery['avg_delivery_time'], 
             line_dash="dash", 
             line_color="red",
-            annotation_text=f"Rata-rata: {delivery_data['actual_delivery_days'].mean():.1f} hari",
+            annotation_text=f"Rata-rata: {delivery['avg_delivery_time']:.1f} hari",
             annotation_position="top right"
         )
+        fig.add_vline(
+            x=delivery['lead_time_quantiles']['p90'],
+            line_dash="dot",
+            line_color="gray",
+            annotation_text=f"P90: {delivery['lead_time_quantiles']['p90']:.0f} hari",
+            annotation_position="top left"
+        )
         
         fig.update_layout(
             xaxis_title="Waktu Pengiriman (Hari)",
@@ -832,29 +651,29 @@ with tab4:
         # Visualisasi 3: Perbandingan Waktu Pengiriman dengan Estimasi
         st.subheader("Visualisasi 3: Perbandingan Waktu Pengiriman vs Estimasi")
         
-        # Persiapkan data untuk visualisasi
-        delivery_comparison = delivery_data[['actual_delivery_days', 'estimated_delivery_days']].copy()
-        delivery_comparison = delivery_comparison.sample(min(len(delivery_comparison), 1000))  # Sample untuk visualisasi yang lebih jelas
-        
-        fig = px.scatter(
-            delivery_comparison,
-            x='estimated_delivery_days',
-            y='actual_delivery_days',
-            title='Perbandingan Waktu Pengiriman Estimasi vs Aktual',
-            labels={
-                'estimated_delivery_days': 'Estimasi Waktu Pengiriman (Hari)',
-                'actual_delivery_days': 'Waktu Pengiriman Aktual (Hari)'
-            },
-            opacity=0.6
+        # Grid kepadatan estimasi x aktual untuk semua pesanan terkirim (deterministik, pengganti sampel acak)
+        density = delivery['density_grid']
+        counts = density['counts'].astype('float64')
+        counts[counts == 0] = np.nan
+        
+        fig = go.Figure(
+            go.Heatmap(
+                x=density['estimated_days'],
+                y=density['actual_days'],
+                z=counts,
+                colorscale='Blues',
+                colorbar=dict(title='Jumlah Pesanan'),
+                hovertemplate='Estimasi: %{x:.0f} hari<br>Aktual: %{y:.0f} hari<br>Pesanan: %{z}<extra></extra>'
+            )
         )
+        fig.update_layout(title='Perbandingan Waktu Pengiriman Estimasi vs Aktual')
         
         # Tambahkan garis referensi untuk pengiriman tepat waktu
+        max_days = max(density['estimated_days'].max(), density['actual_days'].max())
         fig.add_trace(
             go.Scatter(
-                x=[0, max(delivery_comparison['estimated_delivery_days'].max(), 
-                         delivery_comparison['actual_delivery_days'].max())],
-                y=[0, max(delivery_comparison['estimated_delivery_days'].max(), 
-                         delivery_comparison['actual_delivery_days'].max())],
+                x=[0, max_days],
+                y=[0, max_days],
                 mode='lines',
                 name='Tepat Waktu',
                 line=dict(color='green', dash='dash')
@@ -871,49 +690,62 @@ with tab4:
         
         with st.expander("ℹ️ Insight Perbandingan Waktu Pengiriman"):
             st.markdown("""
-            - Titik-titik di bawah garis diagonal menunjukkan pengiriman yang lebih cepat dari estimasi, sedangkan titik-titik di atas garis menunjukkan keterlambatan.
-            - Sebagian besar titik berada di bawah atau di sekitar garis diagonal, mengonfirmasi bahwa mayoritas pengiriman memenuhi atau melampaui ekspektasi waktu.
+            - Sel di bawah garis diagonal menunjukkan pengiriman yang lebih cepat dari estimasi, sedangkan sel di atas garis menunjukkan keterlambatan.
+            - Sebagian besar pesanan berada di bawah atau di sekitar garis diagonal, mengonfirmasi bahwa mayoritas pengiriman memenuhi atau melampaui ekspektasi waktu.
             - Terlihat pola di mana pengiriman dengan estimasi waktu yang lebih lama cenderung lebih sering tiba lebih awal dari perkiraan.
             - Outlier di atas garis diagonal menunjukkan kasus-kasus dengan keterlambatan signifikan yang memerlukan investigasi lebih lanjut.
             """)
+        
+        # Visualisasi 4: Kuantil Waktu Pengiriman per Negara Bagian
+        st.subheader("Visualisasi 4: Kuantil Waktu Pengiriman per Negara Bagian")
+        
+        # Median (P50) dan P90 dari sketsa histogram per negara bagian yang digabung dalam rentang tanggal
+        state_quantiles = delivery['state_quantiles'].melt(
+            id_vars=['customer_state', 'order_count'],
+            value_vars=['p50', 'p90'],
+            var_name='quantile',
+            value_name='days'
+        )
+        
+        fig = px.bar(
+            state_quantiles,
+            x='customer_state',
+            y='days',
+            color='quantile',
+            barmode='group',
+            title='Median dan P90 Waktu Pengiriman per Negara Bagian',
+            labels={'customer_state': 'Negara Bagian', 'days': 'Waktu Pengiriman (Hari)', 'quantile': 'Kuantil'},
+            hover_data={'order_count': True},
+            color_discrete_map={'p50': 'royalblue', 'p90': 'orange'}
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        with st.expander("ℹ️ Insight Kuantil Waktu Pengiriman"):
+            st.markdown("""
+            - Negara bagian di utara dan timur laut Brasil memiliki median dan P90 waktu pengiriman yang lebih panjang, sejalan dengan jarak dari pusat penjual di tenggara.
+            - Selisih besar antara median dan P90 menandakan waktu pengiriman yang kurang dapat diprediksi di negara bagian tersebut.
+            """)
     else:
         st.warning("Tidak ada data yang cukup untuk analisis pengiriman dalam rentang waktu yang dipilih.")
 
 # ----- Tab 5: Distribusi Geografis -----
-with tab5:
+def render_geo_tab():
     st.header("🌎 Pertanyaan 5: Bagaimana distribusi geografis pelanggan dan perbedaan perilaku pembelian antar wilayah?")
     
     # Visualisasi 1: Distribusi Pelanggan berdasarkan Negara Bagian
     st.subheader("Visualisasi 1: Distribusi Pelanggan berdasarkan Negara Bagian")
     
-    # Distribusi pelanggan berdasarkan negara bagian
-    customer_states = data['customers']['customer_state'].value_counts().reset_index()
-    customer_states.columns = ['state', 'customer_count']
-    
-    # Filter berdasarkan state jika dipilih
-    if selected_state:
-        customer_states = customer_states[customer_states['state'] == selected_state]
-    
-    # Buat peta Brazil
-    brazil_map = folium.Map(location=[-14.235, -51.9253], zoom_start=4, tiles="CartoDB positron")
-    
-    # Tambahkan GeoJson dari Brazil
-    folium.Choropleth(
-        geo_data='https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson',
-        name='choropleth',
-        data=customer_states,
-        columns=['state', 'customer_count'],
-        key_on='feature.properties.sigla',
-        fill_color='YlOrRd',
-        fill_opacity=0.7,
-        line_opacity=0.2,
-        legend_name='Customer Count'
-    ).add_to(brazil_map)
+    # Distribusi pelanggan, kategori teratas dan pola waktu per wilayah (analytics.py)
+    geo = run_query(data, 'geo', filters)
     
-    folium.LayerControl().add_to(brazil_map)
+    # Distribusi pelanggan berdasarkan negara bagian (difilter jika state dipilih)
+    customer_states = geo['customer_states']
     
-    # Tampilkan peta
-    folium_static(brazil_map)
+    # Peta choropleth Plotly: geometri dan layout di-cache per proses (state_map.py),
+    # setiap rerun hanya mengirim jumlah pelanggan per negara bagian
+    fig = state_choropleth(customer_states, static_serving=st.get_option('server.enableStaticServing'))
+    st.plotly_chart(fig, use_container_width=True)
     
     with st.expander("ℹ️ Insight Distribusi Geografis Pelanggan"):
         st.markdown("""
@@ -949,8 +781,7 @@ with tab5:
         st.plotly_chart(fig, use_container_width=True)
     else:
         # Jika state dipilih, tampilkan distribusi kota
-        city_counts = data['customers'][data['customers']['customer_state'] == selected_state]['customer_city'].value_counts().reset_index()
-        city_counts.columns = ['city', 'count']
+        city_counts = geo['city_counts']
         top_cities = city_counts.head(10)
         
         fig = px.bar(
@@ -974,44 +805,8 @@ with tab5:
     # Visualisasi 3: Kategori Produk Teratas berdasarkan Wilayah
     st.subheader("Visualisasi 3: Kategori Produk Teratas berdasarkan Wilayah")
     
-    # Filter pesanan berdasarkan negara bagian jika ditentukan
-    if selected_state:
-        state_customers = data['customers'][data['customers']['customer_state'] == selected_state]['customer_id'].unique()
-        state_orders = data['orders'][data['orders']['customer_id'].isin(state_customers)]
-    else:
-        state_orders = data['orders']
-    
-    # Filter berdasarkan rentang tanggal
-    state_orders = state_orders[
-        (state_orders['order_purchase_timestamp'] >= start_date) & 
-        (state_orders['order_purchase_timestamp'] <= end_date)
-    ]
-    
-    # Gabungkan dengan item dan produk
-    order_items = pd.merge(
-        state_orders[['order_id']],
-        data['order_items'][['order_id', 'product_id', 'price']],
-        on='order_id',
-        how='inner'
-    )
-    
-    order_products = pd.merge(
-        order_items,
-        data['products'],
-        on='product_id',
-        how='inner'
-    )
-    
-    # Pilih kolom kategori yang sesuai
-    cat_column = 'product_category_name_english' if 'product_category_name_english' in order_products.columns else 'product_category_name'
-    
-    # Agregasi berdasarkan kategori
-    category_summary = order_products.groupby(cat_column).agg({
-        'price': 'sum',
-        'order_id': 'nunique'
-    }).reset_index()
-    
-    category_summary.columns = ['category', 'total_sales', 'order_count']
+    # Agregasi berdasarkan kategori dari sel cube, difilter negara bagian jika ditentukan
+    category_summary = geo['category_summary']
     
     # Urutkan berdasarkan total penjualan dan ambil 5 teratas
     top_categories = category_summary.sort_values('total_sales', ascending=False).head(5)
@@ -1054,31 +849,8 @@ with tab5:
     # Visualisasi 4: Pola Pembelian Waktu berdasarkan Wilayah
     st.subheader("Visualisasi 4: Pola Pembelian Waktu berdasarkan Wilayah")
     
-    # Gabungkan pesanan dengan item untuk analisis pola waktu
-    order_items_with_date = pd.merge(
-        state_orders[['order_id', 'order_purchase_timestamp']],
-        data['order_items'][['order_id', 'price']],
-        on='order_id',
-        how='inner'
-    )
-    
-    # Ekstrak bulan dan hari dalam seminggu
-    order_items_with_date['month'] = order_items_with_date['order_purchase_timestamp'].dt.month_name()
-    order_items_with_date['day_of_week'] = order_items_with_date['order_purchase_timestamp'].dt.day_name()
-    
-    # Agregasi berdasarkan bulan dan hari dalam seminggu
-    sales_heatmap = order_items_with_date.groupby(['month', 'day_of_week'])['price'].sum().unstack().fillna(0)
-    
-    # Pastikan urutan hari dan bulan yang benar
-    month_order = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    
-    # Reindeks untuk memastikan urutan yang benar
-    try:
-        sales_heatmap = sales_heatmap.reindex(month_order).reindex(columns=day_order)
-    except:
-        # Jika tidak semua bulan atau hari tersedia dalam data
-        st.warning("Beberapa bulan atau hari tidak tersedia dalam data yang dipilih.")
+    # Penjualan per bulan x hari dalam seminggu dari sel cube harian (urutan bulan dan hari sudah benar)
+    sales_heatmap = geo['sales_heatmap']
     
     # Buat peta panas jika data tersedia
     if not sales_heatmap.empty and not sales_heatmap.isna().all().all():
@@ -1113,7 +885,7 @@ with tab5:
         st.info("""
         **Olist E-commerce Data Analytics Project**
 
-        Dashboard ini menampilkan hasil analisis dari dataset e-commerce Olist Brasil, menjawab lima pertanyaan bisnis utama.
+        Dashboard ini menampilkan hasil analisis dari dataset e-commerce Olist Brasil, menjawab tujuh pertanyaan bisnis utama.
         Setiap visualisasi dilengkapi dengan insights yang dapat ditindaklanjuti untuk membantu pengambilan keputusan.
 
         Untuk analisis lebih mendalam, silakan buka notebook.ipynb yang berisi proses analisis lengkap termasuk:
@@ -1129,4 +901,374 @@ with tab5:
         <div style="text-align: center">
             <p>Olist E-commerce Analytics Dashboard | Dibuat dengan Streamlit | Ashim Izzuddin</p>
         </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """, unsafe_allow_html=True)
+
+    # Visualisasi 5: Peta Kepadatan Pelanggan dan Penjual (jika geolocation_dataset.csv tersedia)
+    if geo['customer_density'] is not None:
+        st.subheader("Visualisasi 5: Peta Kepadatan Pelanggan dan Penjual")
+        
+        density_choice = st.radio("Tampilkan kepadatan:", ['Pelanggan', 'Penjual'], horizontal=True, key="density_points")
+        
+        # Jumlah titik per sel grid 0.1 derajat dari centroid zip prefix (dihitung di analytics.py),
+        # sehingga browser hanya menerima beberapa ribu sel, bukan setiap pelanggan
+        density = geo['customer_density'] if density_choice == 'Pelanggan' else geo['seller_density']
+        
+        if not density.empty:
+            if selected_state:
+                center = {'lat': np.average(density['lat'], weights=density['count']),
+                          'lon': np.average(density['lng'], weights=density['count'])}
+                zoom = 5
+            else:
+                center = {'lat': -14.235, 'lon': -51.9253}
+                zoom = 3
+            
+            fig = px.density_map(
+                density,
+                lat='lat',
+                lon='lng',
+                z='count',
+                radius=10,
+                center=center,
+                zoom=zoom,
+                map_style='carto-positron',
+                color_continuous_scale='YlOrRd',
+                labels={'count': f'Jumlah {density_choice}'},
+                title=f'Kepadatan {density_choice} {selected_state if selected_state else "Semua Wilayah"}'
+            )
+            
+            fig.update_layout(height=550)
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            with st.expander("ℹ️ Insight Kepadatan Pelanggan dan Penjual"):
+                st.markdown("""
+                - Pelanggan dan penjual terkonsentrasi di koridor tenggara (São Paulo, Rio de Janeiro, Belo Horizonte) dan sepanjang pesisir.
+                - Penjual jauh lebih terpusat dibandingkan pelanggan, sehingga sebagian besar pesanan dari utara dan timur laut dikirim jarak jauh.
+                - Wilayah dengan banyak pelanggan tetapi sedikit penjual merupakan kandidat untuk rekrutmen penjual lokal atau gudang regional.
+                """)
+        else:
+            st.info(f"Tidak ada data lokasi {density_choice.lower()} untuk wilayah yang dipilih.")
+
+def render_sellers_tab():
+    st.header("🏪 Pertanyaan 6: Penjual mana yang unggul dalam pendapatan, ulasan, dan ketepatan pengiriman?")
+    
+    # Metrik per penjual dari agregat penjual x bulan (seller_stats.py), difilter negara bagian penjual
+    sellers = run_query(data, 'sellers', filters)
+    
+    if sellers is None:
+        st.warning("Tidak ada data penjual untuk filter yang dipilih.")
+        return
+    
+    summary = sellers['summary']
+    totals = sellers['totals']
+    
+    # Metrik utama dalam 3 kolom
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Penjual Aktif", f"{totals['seller_count']:,}")
+    
+    with col2:
+        st.metric("Median Skor Ulasan", f"{totals['median_review']:.2f}")
+    
+    with col3:
+        st.metric("Median Tingkat Tepat Waktu", f"{totals['median_on_time_rate']:.1f}%")
+    
+    # Visualisasi 1: Papan Peringkat Penjual
+    st.subheader("Visualisasi 1: Papan Peringkat Penjual")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        metric = st.selectbox("Urutkan berdasarkan:", list(seller_stats.METRICS),
+                              format_func=lambda name: seller_stats.METRICS[name][0], key="seller_metric")
+    
+    with col2:
+        top_k = st.slider("Jumlah penjual:", 5, 50, 10, key="seller_top_k")
+    
+    with col3:
+        min_orders = st.number_input("Minimal pesanan:", min_value=1, value=10, key="seller_min_orders")
+    
+    # Peringkat top-k dengan np.argpartition di atas ringkasan yang sudah di-cache,
+    # sehingga mengganti metrik / jumlah penjual tidak menghitung ulang agregat
+    top = seller_stats.top_sellers(summary, metric, top_k, min_orders)
+    
+    if len(top) > 0:
+        leaderboard = top.copy()
+        leaderboard['seller'] = decode_ids(top['seller_id'], data['keys']['seller_id'])
+        leaderboard['seller'] = leaderboard['seller'].str[:8]
+        metric_label = seller_stats.METRICS[metric][0]
+        
+        fig = px.bar(
+            leaderboard,
+            x='seller',
+            y=metric,
+            title=f'Top {len(top)} Penjual berdasarkan {metric_label}',
+            labels={'seller': 'Penjual', metric: metric_label},
+            color=metric,
+            color_continuous_scale='Viridis',
+            hover_data=['seller_state', 'order_count']
+        )
+        
+        fig.update_layout(
+            xaxis={'categoryorder': 'array', 'categoryarray': leaderboard['seller'].tolist()},
+            xaxis_title="Penjual",
+            yaxis_title=metric_label
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(
+            leaderboard[['seller', 'seller_state', 'revenue', 'order_count', 'avg_review', 'on_time_rate', 'avg_distance_km']].rename(columns={
+                'seller': 'Penjual',
+                'seller_state': 'Negara Bagian',
+                'revenue': 'Pendapatan (R$)',
+                'order_count': 'Pesanan',
+                'avg_review': 'Skor Ulasan',
+                'on_time_rate': 'Tepat Waktu (%)',
+                'avg_distance_km': 'Jarak (km)'
+            }).round(2),
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info(f"Tidak ada penjual dengan minimal {min_orders} pesanan pada filter yang dipilih.")
+    
+    # Visualisasi 2: Skor Ulasan vs Ketepatan Waktu
+    st.subheader("Visualisasi 2: Skor Ulasan vs Ketepatan Pengiriman")
+    
+    # Hanya penjual dengan minimal pesanan yang dipilih, dibatasi 2000 penjual dengan pendapatan terbesar
+    # agar browser tidak menerima titik untuk setiap penjual
+    active = seller_stats.top_sellers(summary, 'revenue', 2000, min_orders).dropna(subset=['avg_review', 'on_time_rate'])
+    
+    if len(active) > 0:
+        fig = px.scatter(
+            active,
+            x='on_time_rate',
+            y='avg_review',
+            size='revenue',
+            color='avg_distance_km',
+            title='Skor Ulasan vs Tingkat Tepat Waktu per Penjual',
+            labels={'on_time_rate': 'Tingkat Tepat Waktu (%)', 'avg_review': 'Rata-rata Skor Ulasan',
+                    'revenue': 'Pendapatan (R$)', 'avg_distance_km': 'Jarak (km)'},
+            color_continuous_scale='RdYlBu_r',
+            opacity=0.7
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        with st.expander("ℹ️ Insight Performa Penjual"):
+            st.markdown("""
+            - Pendapatan sangat terkonsentrasi pada sejumlah kecil penjual teratas, mengikuti pola ekor panjang yang umum di marketplace.
+            - Penjual dengan tingkat tepat waktu rendah cenderung memiliki skor ulasan lebih rendah, sejalan dengan temuan bahwa keterlambatan menurunkan kepuasan pelanggan.
+            - Jarak penjual ke pelanggan yang jauh berkaitan dengan pengiriman yang lebih lama; penjual di luar tenggara Brasil lebih sering melayani pelanggan jarak jauh.
+            - Penjual dengan ulasan rendah dan pendapatan tinggi layak diprioritaskan untuk program peningkatan layanan.
+            """)
+    else:
+        st.info("Tidak ada data yang cukup untuk membandingkan skor ulasan dan ketepatan pengiriman.")
+
+# Fungsi untuk memuat teks komentar ulasan hanya saat diminta (tidak dimuat saat startup)
+@st.cache_data(show_spinner=False)
+def load_review_comments(review_ids):
+    return reviews.load_review_text(review_ids, data['keys']['review_id'], SNAPSHOT_DIR,
+                                    find_table_file('order_reviews'))
+
+def render_reviews_tab():
+    st.header("⭐ Pertanyaan 7: Bagaimana skor ulasan bervariasi antar kategori, wilayah, penjual dan ketepatan pengiriman?")
+    
+    # Skor ulasan dari cube penjualan dan tabel fakta (tanpa teks komentar)
+    review_data = run_query(data, 'reviews', filters)
+    
+    if review_data is None:
+        st.warning("Tidak ada ulasan untuk filter yang dipilih.")
+        return
+    
+    totals = review_data['totals']
+    by_delivery_status = review_data['by_delivery_status'].dropna(subset=['avg_review'])
+    
+    # Metrik utama dalam 3 kolom
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Rata-rata Skor Ulasan", f"{totals['avg_review']:.2f}")
+    
+    with col2:
+        st.metric("Jumlah Item Berulasan", f"{totals['review_count']:,}")
+    
+    with col3:
+        st.metric("Skor Ulasan Pesanan Terlambat", f"{totals['late_avg_review']:.2f}")
+    
+    # Visualisasi 1: Skor Ulasan berdasarkan Ketepatan Pengiriman
+    st.subheader("Visualisasi 1: Skor Ulasan berdasarkan Ketepatan Pengiriman")
+    
+    if len(by_delivery_status) > 0:
+        fig = px.bar(
+            by_delivery_status,
+            x='delivery_status',
+            y='avg_review',
+            title='Rata-rata Skor Ulasan berdasarkan Status Pengiriman',
+            labels={'delivery_status': 'Status Pengiriman', 'avg_review': 'Rata-rata Skor Ulasan',
+                    'review_count': 'Jumlah Item'},
+            color='delivery_status',
+            color_discrete_map={
+                'Very Early': 'darkgreen',
+                'Early': 'lightgreen',
+                'On Time': 'blue',
+                'Late': 'orange',
+                'Very Late': 'red'
+            },
+            hover_data=['review_count']
+        )
+        
+        fig.update_layout(yaxis_range=[1, 5], showlegend=False)
+        
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Tidak ada pesanan terkirim dengan ulasan pada filter yang dipilih.")
+    
+    # Visualisasi 2: Skor Ulasan per Kategori
+    st.subheader("Visualisasi 2: Kategori dengan Skor Ulasan Tertinggi dan Terendah")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        min_reviews = st.number_input("Minimal item berulasan:", min_value=1, value=30, key="review_min_count")
+    
+    with col2:
+        top_n = st.slider("Jumlah kategori:", 5, 20, 10, key="review_top_n")
+    
+    by_category = review_data['by_category']
+    by_category = by_category[by_category['review_count'] >= min_reviews].sort_values('avg_review')
+    
+    if len(by_category) > 0:
+        ranked = pd.concat([by_category.tail(top_n), by_category.head(top_n)]).drop_duplicates('category')
+        ranked = ranked.sort_values('avg_review')
+        
+        fig = px.bar(
+            ranked,
+            x='avg_review',
+            y='category',
+            orientation='h',
+            title=f'Skor Ulasan per Kategori (minimal {min_reviews} item)',
+            labels={'avg_review': 'Rata-rata Skor Ulasan', 'category': 'Kategori', 'review_count': 'Jumlah Item'},
+            color='avg_review',
+            color_continuous_scale='RdYlGn',
+            range_color=[1, 5],
+            hover_data=['review_count']
+        )
+        
+        fig.update_layout(height=max(400, 25 * len(ranked)))
+        
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info(f"Tidak ada kategori dengan minimal {min_reviews} item berulasan.")
+    
+    # Visualisasi 3: Skor Ulasan per Negara Bagian dan Penjual
+    st.subheader("Visualisasi 3: Skor Ulasan per Negara Bagian dan Penjual")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        by_state = review_data['by_state'].sort_values('avg_review', ascending=False)
+        
+        fig = px.bar(
+            by_state,
+            x='state',
+            y='avg_review',
+            title='Rata-rata Skor Ulasan per Negara Bagian Pelanggan',
+            labels={'state': 'Negara Bagian', 'avg_review': 'Rata-rata Skor Ulasan', 'review_count': 'Jumlah Item'},
+            color='avg_review',
+            color_continuous_scale='RdYlGn',
+            range_color=[1, 5],
+            hover_data=['review_count']
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Sebaran skor rata-rata penjual (minimal pesanan yang sama dengan kategori)
+        by_seller = review_data['by_seller']
+        by_seller = by_seller[by_seller['order_count'] >= min_reviews]
+        
+        if len(by_seller) > 0:
+            fig = px.histogram(
+                by_seller,
+                x='avg_review',
+                nbins=40,
+                title=f'Sebaran Skor Ulasan Penjual ({len(by_seller):,} penjual, minimal {min_reviews} pesanan)',
+                labels={'avg_review': 'Rata-rata Skor Ulasan'}
+            )
+            
+            fig.update_layout(yaxis_title="Jumlah Penjual")
+            
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info(f"Tidak ada penjual dengan minimal {min_reviews} pesanan.")
+    
+    # Visualisasi 4: Contoh Ulasan Bernilai Rendah (teks dimuat hanya jika diminta)
+    st.subheader("Visualisasi 4: Ulasan Bernilai Rendah Terbaru")
+    
+    low_reviews = review_data['low_reviews']
+    
+    if len(low_reviews) > 0 and st.toggle("Tampilkan teks komentar", key="review_show_text"):
+        comments = load_review_comments(tuple(low_reviews['review_id'].tolist()))
+        comments = low_reviews.merge(comments, on='review_id', how='inner')
+        
+        if len(comments) > 0:
+            st.dataframe(
+                comments[['review_creation_date', 'review_score', 'review_comment_title', 'review_comment_message']].rename(columns={
+                    'review_creation_date': 'Tanggal',
+                    'review_score': 'Skor',
+                    'review_comment_title': 'Judul',
+                    'review_comment_message': 'Komentar'
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.info("Ulasan bernilai rendah terbaru tidak berisi komentar.")
+    elif len(low_reviews) == 0:
+        st.info("Tidak ada ulasan bernilai rendah pada rentang tanggal yang dipilih.")
+    
+    with st.expander("ℹ️ Insight Kepuasan Pelanggan"):
+        st.markdown("""
+        - Skor ulasan turun tajam untuk pesanan yang terlambat, sehingga ketepatan pengiriman merupakan pendorong utama kepuasan pelanggan.
+        - Kategori dengan skor terendah layak ditinjau dari sisi kualitas produk, deskripsi, dan penjual yang melayaninya.
+        - Perbedaan skor antar negara bagian sebagian besar mengikuti jarak dan lama pengiriman dari pusat penjual di tenggara Brasil.
+        - Komentar ulasan bernilai rendah membantu mengidentifikasi masalah yang berulang (produk tidak sesuai, barang belum diterima).
+        """)
+
+# ---- Tab layout untuk menjawab pertanyaan bisnis ----
+# Label tab -> (fungsi render, nama query analytics yang dipakai tab tersebut)
+TABS = {
+    "📊 Pertanyaan 1: Tren Penjualan": (render_sales_tab, 'sales'),
+    "👥 Pertanyaan 2: Segmentasi Pelanggan": (render_segments_tab, 'segments'),
+    "💳 Pertanyaan 3: Metode Pembayaran": (render_payments_tab, 'payments'),
+    "🚚 Pertanyaan 4: Performa Pengiriman": (render_delivery_tab, 'delivery'),
+    "🌎 Pertanyaan 5: Distribusi Geografis": (render_geo_tab, 'geo'),
+    "🏪 Pertanyaan 6: Performa Penjual": (render_sellers_tab, 'sellers'),
+    "⭐ Pertanyaan 7: Kepuasan Pelanggan": (render_reviews_tab, 'reviews'),
+}
+
+if TAB_MODE == 'tabs':
+    for tab, (render, _) in zip(st.tabs(list(TABS)), TABS.values()):
+        with tab:
+            render()
+else:
+    # Hanya tab terpilih yang dihitung dan digambar; pilihan tersimpan antar rerun
+    active_tab = st.radio("Pilih Pertanyaan:", list(TABS), horizontal=True,
+                          label_visibility="collapsed", key="active_tab")
+    render, query = TABS[active_tab]
+    render()
+    
+    # Query tab lain untuk filter yang sama dihitung di latar belakang dan masuk cache,
+    # sehingga berpindah tab tidak perlu menunggu perhitungan
+    prefetch(data, [name for _, name in TABS.values() if name != query], filters)
+
+# Metrik cache hasil query (dipakai bersama oleh semua sesi di proses ini)
+stats = cache_stats()
+st.sidebar.caption(
+    f"Cache query: {stats['hits']:,} hit / {stats['misses']:,} miss ({stats['hit_rate']:.0%}), "
+    f"{stats['prefetched']:,} prefetch ({stats['cancelled']:,} batal), "
+    f"{stats['entries']} entri, {stats['size_mb']:.1f} / {stats['max_mb']:.0f} MB"
+)
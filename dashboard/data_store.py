@@ -0,0 +1,282 @@
+import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import schema
+import facts
+import time_index
+import cube
+import distinct
+import geolocation
+import seller_stats
+import reviews
+import lead_times
+
+# Lokasi root repositori (satu tingkat di atas folder dashboard/)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Direktori snapshot kolumnar hasil build_snapshot()
+SNAPSHOT_DIR = os.getenv('OLIST_SNAPSHOT_DIR', os.path.join(ROOT_DIR, 'processed_data', 'snapshot'))
+
+# Nama tabel -> (file hasil ekspor notebook, file data mentah)
+TABLES = {
+    'customers': ('customers_processed.csv', 'customers_dataset.csv'),
+    'order_items': ('order_items_processed.csv', 'order_items_dataset.csv'),
+    'order_payments': ('order_payments_processed.csv', 'order_payments_dataset.csv'),
+    'order_reviews': ('order_reviews_processed.csv', 'order_reviews_dataset.csv'),
+    'orders': ('orders_processed.csv', 'orders_dataset.csv'),
+    'product_category': (None, 'product_category_name_translation.csv'),
+    'products': ('products_processed.csv', 'products_dataset.csv'),
+    'sellers': ('sellers_processed.csv', 'sellers_dataset.csv'),
+}
+
+# Kolom tanggal yang disimpan sebagai datetime64 asli
+DATETIME_COLUMNS = {
+    'order_items': ['shipping_limit_date'],
+    'order_reviews': ['review_creation_date', 'review_answer_timestamp'],
+    'orders': ['order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
+               'order_delivered_customer_date', 'order_estimated_delivery_date'],
+}
+
+# Jumlah thread untuk membaca tabel sumber dan mengkonversi kolom tanggal secara paralel.
+# Pembaca CSV pyarrow dan Parquet melepas GIL, sehingga waktu muat mendekati waktu file paling lambat
+LOAD_WORKERS = int(os.getenv('OLIST_LOAD_WORKERS', len(TABLES)))
+
+# Tabel yang dikembalikan ke dashboard (product_category sudah digabung ke products)
+DASHBOARD_TABLES = ['customers', 'order_items', 'order_payments', 'order_reviews',
+                    'orders', 'products', 'sellers']
+
+# Tabel turunan (fakta pra-join, cube rollup, order key / sketsa HLL per sel, centroid zip prefix,
+# agregat penjual per bulan, histogram waktu pengiriman per hari) yang ikut disimpan di snapshot
+DERIVED_TABLES = (facts.FACT_TABLES + cube.CUBE_TABLES + distinct.DISTINCT_TABLES + distinct.SKETCH_TABLES +
+                  geolocation.GEOLOCATION_TABLES + seller_stats.SELLER_TABLES + lead_times.LEAD_TIME_TABLES)
+
+
+# Fungsi untuk mencari lokasi file CSV dari beberapa kemungkinan direktori
+def get_file_path(filename):
+    # OLIST_DATA_DIR mengarahkan dashboard ke dataset lain (mis. data uji skala besar). Hanya
+    # direktori ini yang dicari, agar file di processed_data/ repo tidak menutupi dataset tersebut
+    if os.getenv('OLIST_DATA_DIR'):
+        return os.path.join(os.getenv('OLIST_DATA_DIR'), filename)
+
+    is_cloud = os.getenv('STREAMLIT_SHARING') == 'true' or os.getenv('STREAMLIT_RUN_ON_SAVE') == 'true'
+    base_path = 'data' if is_cloud else '../data'
+
+    possible_paths = [
+        os.path.join('processed_data', filename),  # Check processed data first
+        os.path.join(ROOT_DIR, 'processed_data', filename),
+        os.path.join(base_path, filename),
+        os.path.join('data', filename),
+        os.path.join('../data', filename),
+        os.path.join(ROOT_DIR, 'data', filename)
+    ]
+
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return os.path.join(base_path, filename)
+
+
+# Fungsi untuk mencari file sumber sebuah tabel: Parquet hasil ingest.py, lalu CSV hasil
+# ekspor notebook, lalu data mentah
+def find_table_file(name):
+    processed_file, raw_file = TABLES[name]
+    if processed_file:
+        for ext in ('.parquet', '.csv'):
+            path = get_file_path(os.path.splitext(processed_file)[0] + ext)
+            if os.path.exists(path):
+                return path
+    return get_file_path(raw_file)
+
+
+# Fungsi untuk membaca satu tabel dari file sumber (tanpa konversi tanggal, lihat parse_datetime)
+# CSV dibaca dengan engine pyarrow (multithread, melepas GIL); order_reviews dibaca tanpa
+# kolom teks komentar (lihat reviews.py)
+def read_source_table(name):
+    path = find_table_file(name)
+    if name == 'order_reviews':
+        return reviews.read_review_scores(path)
+    return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path, engine='pyarrow')
+
+
+# Fungsi untuk mengkonversi satu kolom tanggal ke datetime64[ns]
+# (engine pyarrow sudah mengenali sebagian kolom sebagai timestamp detik; Parquet hasil ingest.py sudah bertipe datetime)
+def parse_datetime(series):
+    if series.dtype.kind != 'M':
+        series = pd.to_datetime(series)
+    return series.astype('datetime64[ns]')
+
+
+# Fungsi untuk menggabungkan kategori produk dengan nama bahasa Inggris
+def merge_product_categories(df_products, df_product_category):
+    # products_processed.csv dari notebook sudah berisi kolom terjemahan
+    if 'product_category_name_english' in df_products.columns:
+        return df_products
+
+    return pd.merge(
+        df_products,
+        df_product_category,
+        on='product_category_name',
+        how='left'
+    )
+
+
+# Fungsi untuk membaca semua tabel dari file sumber (jalur lama tanpa snapshot, dipakai sebagai fallback)
+# Tabel dibaca paralel dengan thread pool, lalu semua kolom tanggal dikonversi paralel.
+# Jika timings diberikan (dict), diisi lama baca dan konversi tanggal (detik) per tabel
+def load_csv_tables(workers=LOAD_WORKERS, timings=None):
+    timings = {} if timings is None else timings
+
+    def read(name):
+        start = time.perf_counter()
+        df = read_source_table(name)
+        timings[name] = {'read': time.perf_counter() - start, 'parse': 0.0}
+        return df
+
+    def parse(item):
+        name, col = item
+        start = time.perf_counter()
+        values = parse_datetime(tables[name][col])
+        return name, col, values, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        tables = dict(zip(TABLES, pool.map(read, TABLES)))
+        columns = [(name, col) for name, cols in DATETIME_COLUMNS.items() for col in cols if col in tables[name].columns]
+        for name, col, values, seconds in pool.map(parse, columns):
+            tables[name][col] = values
+            timings[name]['parse'] += seconds
+
+    tables['products'] = merge_product_categories(tables['products'], tables.pop('product_category'))
+    return tables
+
+
+# Fungsi untuk menulis satu DataFrame sebagai Parquet dan Arrow IPC
+def write_table(df, out_dir, name):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Parquet: ringkas untuk disimpan/dipindahkan
+    parquet_path = os.path.join(out_dir, f'{name}.parquet')
+    pq.write_table(table, parquet_path)
+
+    # Arrow IPC tanpa kompresi: bisa di-memory-map dan dibaca tanpa salinan
+    arrow_path = os.path.join(out_dir, f'{name}.arrow')
+    with pa.OSFile(arrow_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    return [parquet_path, arrow_path]
+
+
+# Fungsi untuk mengubah CSV hasil notebook menjadi file Parquet dan Arrow IPC bertipe
+def build_snapshot(out_dir=SNAPSHOT_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    tables = add_derived_tables(schema.apply_schema(load_csv_tables()))
+
+    # Tabel fakta dan cube ikut disimpan agar tidak perlu dibangun ulang saat startup
+    # (zip_centroids hanya ada jika geolocation_dataset.csv tersedia)
+    written = []
+    for name in DASHBOARD_TABLES + DERIVED_TABLES:
+        if name in tables:
+            written += write_table(tables[name], out_dir, name)
+
+    # Kamus surrogate key -> id hex disimpan sekali per kolom id
+    for column, index in tables['keys'].items():
+        written += write_table(pd.DataFrame({column: index.values}), out_dir, f'keys_{column}')
+
+    # Teks komentar ulasan disimpan terpisah dan hanya dibaca saat diminta
+    written += reviews.write_review_text(find_table_file('order_reviews'), out_dir, tables['keys']['review_id'])
+    return written
+
+
+# Fungsi untuk memeriksa apakah snapshot lengkap tersedia
+def snapshot_exists(snapshot_dir=SNAPSHOT_DIR, ext='parquet'):
+    return all(os.path.exists(os.path.join(snapshot_dir, f'{name}.{ext}')) for name in DASHBOARD_TABLES)
+
+
+# Fungsi untuk membaca satu file Arrow IPC lewat memory map
+# Buffer kolom menunjuk langsung ke page cache OS, sehingga semua proses Streamlit
+# di host yang sama berbagi halaman memori fisik yang sama
+def read_mapped_table(path):
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks=True mencegah pandas menyalin kolom ke dalam satu blok 2D;
+    # kolom numerik tanpa null tetap menjadi view di atas memory map
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+# Fungsi untuk membaca satu kolom file Arrow IPC lewat memory map sebagai ChunkedArray
+# (tanpa konversi ke pandas, sehingga kolom string tetap menunjuk ke page cache OS)
+def read_mapped_column(path, column):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all().column(column)
+
+
+# Fungsi untuk membaca satu kolom file Parquet sebagai ChunkedArray
+def read_parquet_column(path, column):
+    return pq.read_table(path, columns=[column]).column(column)
+
+
+# Fungsi untuk memuat semua tabel (beserta kamus key) dari snapshot
+# Kamus key dibungkus langsung sebagai ArrowStringArray: tidak ada objek str Python per id
+# dan tidak ada salinan array string per proses
+def read_snapshot(snapshot_dir, ext, reader, column_reader):
+    tables = {
+        name: reader(os.path.join(snapshot_dir, f'{name}.{ext}'))
+        for name in DASHBOARD_TABLES
+    }
+    for name in DERIVED_TABLES:
+        path = os.path.join(snapshot_dir, f'{name}.{ext}')
+        if os.path.exists(path):
+            tables[name] = reader(path)
+
+    tables['keys'] = {}
+    for column in schema.ID_SPACES:
+        path = os.path.join(snapshot_dir, f'keys_{column}.{ext}')
+        if os.path.exists(path):
+            tables['keys'][column] = pd.Index(pd.arrays.ArrowStringArray(column_reader(path, column)), name=column)
+    return tables
+
+
+# Fungsi untuk memuat semua tabel dari snapshot Parquet
+def load_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    return read_snapshot(snapshot_dir, 'parquet', pd.read_parquet, read_parquet_column)
+
+
+# Fungsi untuk memuat semua tabel dari snapshot Arrow IPC (zero-copy, read-only)
+def load_mapped_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    return read_snapshot(snapshot_dir, 'arrow', read_mapped_table, read_mapped_column)
+
+
+# Fungsi untuk melengkapi tabel turunan yang belum ada (fakta, urutan waktu, cube, distinct,
+# centroid zip, agregat penjual, histogram waktu pengiriman; seller_months memakai zip_centroids untuk jarak)
+def add_derived_tables(tables):
+    tables = time_index.ensure_sorted(facts.add_fact_tables(tables))
+    tables = distinct.add_distinct_tables(cube.add_cubes(tables))
+    tables = geolocation.add_zip_centroids(tables, get_file_path(geolocation.GEOLOCATION_FILE))
+    return lead_times.add_lead_time_tables(seller_stats.add_seller_tables(tables))
+
+
+# Fungsi utama pemuatan data: Arrow IPC ter-mmap, lalu Parquet, lalu CSV
+# Hasilnya selalu mengikuti skema ringkas di schema.py, berisi tabel fakta dari facts.py
+# dan cube dari cube.py (beserta tabel distinct.py), dengan tabel ber-waktu terurut (time_index.py)
+def load_tables(snapshot_dir=SNAPSHOT_DIR):
+    if snapshot_exists(snapshot_dir, 'arrow'):
+        tables = load_mapped_snapshot(snapshot_dir)
+    elif snapshot_exists(snapshot_dir):
+        tables = load_snapshot(snapshot_dir)
+    else:
+        tables = schema.apply_schema(load_csv_tables())
+    return add_derived_tables(tables)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bangun snapshot Parquet/Arrow dari CSV hasil notebook.ipynb')
+    parser.add_argument('--out', default=SNAPSHOT_DIR, help='Direktori output snapshot')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for path in build_snapshot(args.out):
+        print(f"{os.path.basename(path):<24} -> {path} ({os.path.getsize(path) / 1024:,.0f} KB)")
+    print(f"Snapshot selesai dalam {time.perf_counter() - start:.1f} detik")
@@ -0,0 +1,236 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import cube
+
+# Mesin hitung unik (distinct count) order_id di atas cube rollup harian
+#
+# Jumlah pesanan unik tidak bisa dijumlahkan begitu saja antar sel cube bila satu pesanan
+# muncul di beberapa sel (mis. pesanan multi-kategori). Untuk setiap cube disimpan daftar
+# order key per sel, sehingga sel mana pun bisa digabung (antar tanggal, negara bagian,
+# kategori, metode pembayaran) dengan dua mode:
+#
+# - 'exact': gabungan order key (surrogate key int32) dihitung dengan bitmap sepanjang
+#            jumlah pesanan, hasilnya sama persis dengan nunique.
+# - 'hll'  : sketsa HyperLogLog per sel disimpan dalam bentuk sparse (register, rank);
+#            penggabungan cukup mengambil rank maksimum per register. Galat standar
+#            sekitar 1.04 / sqrt(2^HLL_PRECISION) (~1.6% untuk presisi 12).
+
+DISTINCT_COLUMN = 'order_id'
+
+# Atribut tingkat pesanan: satu pesanan hanya punya satu nilai (selain tanggal pembelian)
+ORDER_LEVEL_COLUMNS = ['customer_state']
+
+MODES = ['exact', 'hll']
+
+HLL_PRECISION = 12
+
+# Hitung unik exact per grup memakai bitmap grup x order key selama ukurannya (byte) tidak melebihi
+# GROUP_BITMAP_BYTES dan GROUP_BITMAP_PER_KEY x jumlah key (mengisi bitmap ~30x lebih murah per byte
+# daripada hash pd.unique per key); selain itu pasangan (grup, key) dideduplikasi dengan pd.unique
+GROUP_BITMAP_BYTES = 64 * 1024 ** 2
+GROUP_BITMAP_PER_KEY = 32
+
+DISTINCT_TABLES = [f'distinct_{name}' for name in cube.CUBES]
+SKETCH_TABLES = [f'sketch_{name}' for name in cube.CUBES]
+
+
+# Fungsi hash 64-bit (splitmix64) untuk key bilangan bulat
+def hash_keys(keys):
+    z = np.asarray(keys).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+# Fungsi untuk menghitung register dan rank HyperLogLog dari key
+# Register diambil dari bit teratas hash, rank = posisi bit 1 pertama pada 32 bit terbawah
+def hll_entries(keys, precision=HLL_PRECISION):
+    hashed = hash_keys(keys)
+    register = (hashed >> np.uint64(64 - precision)).astype(np.uint16)
+    low = (hashed & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    bit_length = np.frexp(low)[1]
+    rank = (33 - bit_length).astype(np.uint8)
+    return register, rank
+
+
+# Fungsi untuk mengestimasi kardinalitas dari matriks register (satu baris per grup)
+def hll_estimate(registers):
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.ldexp(1.0, -registers.astype(np.int32)).sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+    # Koreksi rentang kecil (linear counting)
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where(small, linear, raw)
+
+
+# Fungsi untuk membangun daftar order key unik per sel cube (terurut berdasarkan sel)
+def build_distinct_table(rows, spec):
+    entries = pd.DataFrame({
+        'cell': cube.cell_codes(rows, spec).astype('int32'),
+        DISTINCT_COLUMN: rows[DISTINCT_COLUMN].values,
+    })
+    return entries.drop_duplicates().sort_values(['cell', DISTINCT_COLUMN]).reset_index(drop=True)
+
+
+# Fungsi untuk membangun sketsa HLL sparse per sel dari daftar order key
+def build_sketch_table(entries, precision=HLL_PRECISION):
+    register, rank = hll_entries(entries[DISTINCT_COLUMN].values, precision)
+    sketch = pd.DataFrame({'cell': entries['cell'].values, 'register': register, 'rank': rank})
+    sketch = sketch.groupby(['cell', 'register'], sort=True)['rank'].max().reset_index()
+    return sketch.astype({'cell': 'int32', 'register': 'uint16', 'rank': 'uint8'})
+
+
+# Fungsi untuk membangun semua tabel distinct dan sketsa dari tabel fakta
+def build_distinct_tables(tables):
+    result = {}
+    for name, spec in cube.CUBES.items():
+        entries = build_distinct_table(tables[spec['source']], spec)
+        result[f'distinct_{name}'] = entries
+        result[f'sketch_{name}'] = build_sketch_table(entries)
+    return result
+
+
+# Fungsi untuk menambahkan tabel distinct ke dict data jika belum ada (mis. jalur CSV)
+def add_distinct_tables(tables):
+    if not all(name in tables for name in DISTINCT_TABLES + SKETCH_TABLES):
+        tables.update(build_distinct_tables(tables))
+    return tables
+
+
+# Fungsi untuk mengambil posisi baris tabel entri milik sel-sel terpilih
+def gather_rows(cells_column, cell_ids, n_cells):
+    # Offset CSR: entri sel i berada di baris offsets[i]..offsets[i + 1]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(cells_column, minlength=n_cells))])
+    starts = offsets[cell_ids]
+    lengths = offsets[cell_ids + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), lengths
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return offsets + np.arange(total), lengths
+
+
+# Fungsi untuk mengumpulkan (label grup, order key atau register/rank) dari cube dan hari tepi
+def collect(tables, name, start, end, where, by, mode):
+    spec = cube.CUBES[name]
+    cube_df = tables[f'cube_{name}']
+    lo, hi, edge_rows = cube.split_range(tables, name, start, end)
+
+    # Sel cube untuk hari penuh
+    cells = cube_df.iloc[lo:hi]
+    cell_ids = (np.flatnonzero(cube.where_mask(cells, where)) + lo).astype(np.int32)
+    entries = tables[f'{"distinct" if mode == "exact" else "sketch"}_{name}']
+    positions, lengths = gather_rows(entries['cell'].values, cell_ids, len(cube_df))
+
+    labels = []
+    if by is not None:
+        labels.append(pd.Series(np.repeat(cube_df[by].values[cell_ids], lengths)))
+    if mode == 'exact':
+        values = [entries[DISTINCT_COLUMN].values[positions]]
+    else:
+        values = [(entries['register'].values[positions], entries['rank'].values[positions])]
+
+    # Sisa jam pada hari tepi langsung dari tabel fakta
+    for rows in edge_rows:
+        rows = rows[cube.where_mask(rows, where)]
+        # Baris fakta mentah bisa berisi pesanan yang sama beberapa kali (multi item)
+        rows = rows.drop_duplicates(subset=[col for col in (by, DISTINCT_COLUMN) if col is not None])
+        keys = rows[DISTINCT_COLUMN].values
+        if by is not None:
+            labels.append(rows[by].reset_index(drop=True))
+        values.append(keys if mode == 'exact' else hll_entries(keys))
+    return labels, values
+
+
+# Fungsi untuk memeriksa apakah sebuah pesanan hanya bisa muncul sekali per grup `by`
+# (semua dimensi cube selain atribut tingkat pesanan sudah menjadi kolom pengelompokan)
+def is_partitioned(name, by):
+    return all(col in ORDER_LEVEL_COLUMNS or col == by for col in cube.CUBES[name]['dimensions'])
+
+
+# Fungsi utama: jumlah order unik dalam rentang tanggal, opsional per kolom dimensi `by`
+# Mengembalikan angka (by=None) atau Series label -> jumlah pesanan unik
+def count_distinct(tables, name, start, end, where=None, by=None, mode='exact'):
+    if mode not in MODES:
+        raise ValueError(f"Mode distinct tidak dikenal: {mode}")
+    labels, values = collect(tables, name, start, end, where, by, mode)
+
+    if by is None:
+        codes, uniques, n_groups = None, None, 1
+    else:
+        codes, uniques = pd.factorize(pd.concat(labels, ignore_index=True), sort=True)
+        n_groups = len(uniques)
+
+    if mode == 'exact':
+        keys = np.concatenate(values).astype(np.int64)
+        if codes is None:
+            # Bitmap sepanjang jumlah order key
+            bitmap = np.zeros(int(keys.max()) + 1 if len(keys) else 0, dtype=bool)
+            bitmap[keys] = True
+            return int(bitmap.sum())
+        valid = codes >= 0
+        if is_partitioned(name, by):
+            # Setiap order key muncul paling banyak sekali per grup, cukup dihitung
+            counts = np.bincount(codes[valid], minlength=n_groups)
+        else:
+            width = int(keys.max()) + 1 if len(keys) else 0
+            if n_groups * width <= min(GROUP_BITMAP_BYTES, GROUP_BITMAP_PER_KEY * len(keys)):
+                # Satu bitmap sepanjang jumlah order key per grup (pesanan dengan beberapa baris cukup ditandai)
+                bitmap = np.zeros((n_groups, width), dtype=bool)
+                bitmap[codes[valid], keys[valid]] = True
+                counts = bitmap.sum(axis=1)
+            else:
+                pairs = pd.unique(codes[valid].astype(np.int64) * width + keys[valid])
+                counts = np.bincount(pairs // width, minlength=n_groups)
+    else:
+        register = np.concatenate([v[0] for v in values]).astype(np.int64)
+        rank = np.concatenate([v[1] for v in values])
+        if codes is None:
+            codes = np.zeros(len(register), dtype=np.int64)
+        valid = codes >= 0
+        registers = np.zeros((n_groups, 1 << HLL_PRECISION), dtype=np.uint8)
+        np.maximum.at(registers, (codes[valid], register[valid]), rank[valid])
+        counts = np.rint(hll_estimate(registers)).astype(np.int64)
+        if by is None:
+            return int(counts[0])
+
+    return pd.Series(counts, index=pd.Index(uniques, name=by), name='order_count')
+
+
+if __name__ == '__main__':
+    import data_store
+
+    parser = argparse.ArgumentParser(description='Bandingkan hitung unik exact vs HyperLogLog terhadap nunique')
+    parser.add_argument('--cube', default='sales', choices=list(cube.CUBES))
+    parser.add_argument('--by', default=None, help='Kolom dimensi pengelompokan (mis. product_category_name_english)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tables = data_store.load_tables()
+    source = tables[cube.CUBES[args.cube]['source']]
+    start, end = source[cube.TIME_COLUMN].min(), source[cube.TIME_COLUMN].max()
+
+    def rescan():
+        if args.by is None:
+            return source[DISTINCT_COLUMN].nunique()
+        return source.groupby(args.by, observed=True)[DISTINCT_COLUMN].nunique()
+
+    expected = rescan()
+    for label, func in [('rescan nunique', rescan)] + [
+        (mode, lambda mode=mode: count_distinct(tables, args.cube, start, end, by=args.by, mode=mode))
+        for mode in MODES
+    ]:
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            result = func()
+        elapsed = (time.perf_counter() - t0) / args.repeat * 1000
+        if args.by is None:
+            error = abs(result - expected) / max(expected, 1) * 100
+        else:
+            result = result.reindex(expected.index).fillna(0)
+            error = ((result - expected).abs() / expected.clip(lower=1)).max() * 100
+        print(f"{label:<16} {elapsed:8.1f} ms   galat maks {error:5.2f}%")
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+from time_index import sort_by_time
+
+# Tabel fakta yang sudah di-join (denormalisasi) sekali saja, sehingga setiap tab
+# dashboard cukup melakukan filter + groupby tanpa rantai pd.merge pada setiap rerun.
+#
+# - order_lines  : satu baris per item pesanan (order_items x orders x customers x products)
+# - payment_lines: satu baris per baris pembayaran (order_payments x orders x customers)
+#
+# Keduanya diurutkan berdasarkan order_purchase_timestamp dan membawa atribut hasil pesanan:
+# skor ulasan rata-rata pesanan (review_score) dan status ketepatan pengiriman (delivery_status).
+#
+# Tabel orders sendiri menjadi fakta tingkat pesanan dengan kolom pengiriman pra-hitung
+# (selisih hari int16 dan kode status uint8), sehingga tab 4 cukup memotong dan menghitung bincount.
+
+FACT_TABLES = ['order_lines', 'payment_lines']
+
+ORDER_COLUMNS = ['order_id', 'customer_id', 'order_status', 'order_purchase_timestamp']
+
+CATEGORY_COLUMNS = ['product_category_name', 'product_category_name_english']
+
+# Status ketepatan pengiriman dari selisih hari (aktual - estimasi) pesanan terkirim
+DELIVERY_STATUS_BINS = [-float('inf'), -3, -1, 0, 2, float('inf')]
+DELIVERY_STATUS_LABELS = ['Very Early', 'Early', 'On Time', 'Late', 'Very Late']
+
+# Kolom turunan pengiriman di tabel orders, dihitung sekali saat load (dan ikut disimpan di snapshot):
+# selisih hari (int16) dan kode status (uint8, indeks DELIVERY_STATUS_LABELS). Pesanan yang belum
+# terkirim atau tanpa tanggal pengiriman/estimasi diberi kode NO_DELIVERY_STATUS dan selisih hari 0.
+DELIVERY_DAY_COLUMNS = {
+    'delivery_difference': ('order_delivered_customer_date', 'order_estimated_delivery_date'),
+    'actual_delivery_days': ('order_delivered_customer_date', 'order_purchase_timestamp'),
+    'estimated_delivery_days': ('order_estimated_delivery_date', 'order_purchase_timestamp'),
+}
+DELIVERY_CODE_COLUMN = 'delivery_code'
+NO_DELIVERY_STATUS = 255
+
+# Batas kanan bin status (tanpa -inf/inf), dipakai dengan searchsorted seperti pd.cut
+DELIVERY_STATUS_EDGES = np.array(DELIVERY_STATUS_BINS[1:-1], dtype=np.int64)
+
+
+# Fungsi untuk menghitung kolom hari dan kode status pengiriman pada tabel orders
+def delivery_columns(orders):
+    delivered = ((orders['order_status'] == 'delivered') & orders['order_delivered_customer_date'].notna() &
+                 orders['order_estimated_delivery_date'].notna()).to_numpy()
+
+    columns = {}
+    for column, (end, start) in DELIVERY_DAY_COLUMNS.items():
+        days = (orders[end] - orders[start]).dt.days.to_numpy()
+        columns[column] = np.where(delivered, days, 0).astype('int16')
+
+    codes = DELIVERY_STATUS_EDGES.searchsorted(columns['delivery_difference'], side='left')
+    columns[DELIVERY_CODE_COLUMN] = np.where(delivered, codes, NO_DELIVERY_STATUS).astype('uint8')
+    return columns
+
+
+# Fungsi untuk menambahkan kolom pengiriman ke tabel orders jika belum ada (snapshot lama / jalur CSV)
+def add_delivery_columns(tables):
+    if DELIVERY_CODE_COLUMN not in tables['orders'].columns:
+        orders = tables['orders']
+        # concat tanpa salinan: kolom orders yang di-memory-map tetap menunjuk ke snapshot
+        tables['orders'] = pd.concat([orders, pd.DataFrame(delivery_columns(orders), index=orders.index)],
+                                     axis=1, copy=False)
+    return tables
+
+
+# Fungsi untuk mengubah kode status pengiriman menjadi categorical berurutan (kosong untuk NO_DELIVERY_STATUS)
+def delivery_status_from_codes(codes):
+    codes = np.asarray(codes)
+    return pd.Categorical.from_codes(np.where(codes == NO_DELIVERY_STATUS, -1, codes).astype('int8'),
+                                     categories=DELIVERY_STATUS_LABELS, ordered=True)
+
+
+# Fungsi untuk menyiapkan hasil setiap pesanan: status ketepatan pengiriman (kosong jika
+# belum terkirim) dan skor ulasan rata-rata (kosong jika tidak ada ulasan)
+def order_outcomes(tables):
+    orders = tables['orders']
+    review_score = tables['order_reviews'].groupby('order_id')['review_score'].mean()
+    return pd.DataFrame({
+        'order_id': orders['order_id'].values,
+        'delivery_status': delivery_status_from_codes(orders[DELIVERY_CODE_COLUMN]),
+        'review_score': review_score.reindex(orders['order_id']).values.astype('float32'),
+    })
+
+
+# Fungsi untuk menyiapkan atribut pesanan + negara bagian pelanggan + hasil pesanan
+def order_attributes(tables):
+    orders = tables['orders'][ORDER_COLUMNS]
+    orders = pd.merge(
+        orders,
+        tables['customers'][['customer_id', 'customer_state']],
+        on='customer_id',
+        how='left'
+    )
+    return pd.merge(orders, order_outcomes(tables), on='order_id', how='left')
+
+
+# Fungsi untuk membangun fakta item pesanan (order line)
+def build_order_lines(tables, orders=None):
+    if orders is None:
+        orders = order_attributes(tables)
+
+    items = tables['order_items'][['order_id', 'order_item_id', 'product_id', 'seller_id', 'price', 'freight_value']]
+    lines = pd.merge(items, orders, on='order_id', how='inner')
+
+    category_columns = [col for col in CATEGORY_COLUMNS if col in tables['products'].columns]
+    lines = pd.merge(
+        lines,
+        tables['products'][['product_id'] + category_columns],
+        on='product_id',
+        how='left'
+    )
+    return sort_by_time(lines)
+
+
+# Fungsi untuk membangun fakta pembayaran (payment line)
+def build_payment_lines(tables, orders=None):
+    if orders is None:
+        orders = order_attributes(tables)
+
+    payments = tables['order_payments'][['order_id', 'payment_sequential', 'payment_type',
+                                         'payment_installments', 'payment_value']]
+    lines = pd.merge(payments, orders, on='order_id', how='inner')
+    return sort_by_time(lines)
+
+
+# Fungsi untuk membangun semua tabel fakta sekaligus
+def build_fact_tables(tables):
+    orders = order_attributes(tables)
+    return {
+        'order_lines': build_order_lines(tables, orders),
+        'payment_lines': build_payment_lines(tables, orders),
+    }
+
+
+# Fungsi untuk menambahkan kolom pengiriman orders dan tabel fakta ke dict data jika belum ada (mis. jalur CSV)
+def add_fact_tables(tables):
+    tables = add_delivery_columns(tables)
+    if not all(name in tables for name in FACT_TABLES):
+        tables.update(build_fact_tables(tables))
+    return tables
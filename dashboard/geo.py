@@ -0,0 +1,251 @@
+import os
+import json
+import argparse
+import functools
+import numpy as np
+import requests
+
+# Geometri negara bagian Brasil untuk peta choropleth tab 5
+#
+# GeoJSON negara bagian disimpan (di-commit) di dashboard/static/geo/ dalam beberapa tingkat
+# penyederhanaan, sehingga dashboard tidak mengunduh apa pun dan tetap berjalan offline. Folder
+# static/ juga disajikan Streamlit (server.enableStaticServing) di app/static/, sehingga browser
+# bisa mengambil dan meng-cache geometrinya sendiri.
+#
+# Penyederhanaan bersifat topologis: batas yang dipakai bersama dua negara bagian dipecah
+# menjadi arc di titik pertemuan (junction), setiap arc disederhanakan sekali dengan
+# Douglas-Peucker, lalu dipakai kedua poligon sehingga tidak muncul celah atau tumpang tindih
+# antar negara bagian. Karena itu sumber harus berupa coverage: tetangga berbagi titik batas
+# yang identik.
+#
+# File yang di-commit dibuat dari mesh kabupaten/kota IBGE 1:2.500.000 yang digabung per UF
+# (properti sigla/name); GeoJSON click_that_hood (GEOJSON_URL) juga bisa dipakai sebagai sumber.
+#
+# Contoh:
+#   python dashboard/geo.py                  # unduh GEOJSON_URL dan tulis semua tingkat
+#   python dashboard/geo.py --source brazil-states.geojson
+
+GEOJSON_URL = 'https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson'
+
+# Folder static/ aplikasi Streamlit (di samping dashboard.py) dan URL relatifnya di browser
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_URL = 'app/static'
+
+GEO_DIR = os.path.join(STATIC_DIR, 'geo')
+GEOJSON_NAME = 'brazil-states'
+
+# Tingkat penyederhanaan -> (toleransi Douglas-Peucker dalam derajat, jumlah desimal koordinat)
+LEVELS = {
+    'full': (0.0, 6),
+    'medium': (0.01, 3),
+    'low': (0.05, 2),
+}
+
+DEFAULT_LEVEL = os.getenv('OLIST_MAP_DETAIL', 'medium')
+
+# Properti fitur yang dipertahankan (sigla dipakai sebagai key_on choropleth)
+STATE_KEY = 'sigla'
+KEEP_PROPERTIES = [STATE_KEY, 'name']
+
+
+# Fungsi untuk mendapatkan path file GeoJSON satu tingkat penyederhanaan
+def geojson_path(level=DEFAULT_LEVEL, geo_dir=GEO_DIR):
+    return os.path.join(geo_dir, f'{GEOJSON_NAME}-{level}.geojson')
+
+
+# Fungsi untuk mendapatkan URL static (relatif terhadap halaman dashboard) file GeoJSON
+def geojson_static_url(level=DEFAULT_LEVEL):
+    return f'{STATIC_URL}/geo/{GEOJSON_NAME}-{level}.geojson'
+
+
+# Fungsi untuk mengunduh GeoJSON sumber
+def download_geojson(url=GEOJSON_URL):
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+
+# Fungsi untuk mengambil daftar poligon (list ring) dari sebuah geometri Polygon/MultiPolygon
+def geometry_polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    raise ValueError(f"Tipe geometri tidak didukung: {geometry['type']}")
+
+
+# Fungsi Douglas-Peucker (iteratif) untuk satu garis; titik awal dan akhir selalu dipertahankan
+def simplify_line(points, tolerance):
+    if tolerance <= 0 or len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        relative = points[start + 1:end] - points[start]
+        length = np.hypot(segment[0], segment[1])
+        if length == 0:
+            distance = np.hypot(relative[:, 0], relative[:, 1])
+        else:
+            distance = np.abs(segment[0] * relative[:, 1] - segment[1] * relative[:, 0]) / length
+        i = int(np.argmax(distance))
+        if distance[i] > tolerance:
+            middle = start + 1 + i
+            keep[middle] = True
+            stack += [(start, middle), (middle, end)]
+    return points[keep]
+
+
+# Fungsi untuk mencari titik junction: titik yang muncul dengan pasangan tetangga berbeda
+# (titik pertemuan tiga wilayah atau ujung batas bersama)
+def find_junctions(rings):
+    neighbours = {}
+    for ring in rings:
+        n = len(ring)
+        for i in range(n):
+            point = ring[i]
+            pair = frozenset([ring[i - 1], ring[(i + 1) % n]])
+            neighbours.setdefault(point, set()).add(pair)
+    return {point for point, pairs in neighbours.items() if len(pairs) > 1}
+
+
+# Fungsi untuk memecah ring (tanpa titik penutup) menjadi arc di setiap junction
+def split_ring(ring, junctions):
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        # Ring tanpa junction (pulau atau enclave): dimulai dari titik terkecil agar ring yang
+        # sama di dua poligon (mis. lubang Goias dan Distrito Federal) dipecah identik
+        cuts = [ring.index(min(ring))]
+    rotated = ring[cuts[0]:] + ring[:cuts[0]]
+    cuts = [i - cuts[0] for i in cuts] + [len(ring)]
+    rotated = rotated + [rotated[0]]
+    return [rotated[start:end + 1] for start, end in zip(cuts[:-1], cuts[1:])]
+
+
+# Fungsi untuk menyederhanakan arc dengan arah kanonik, sehingga arc yang sama dari dua
+# poligon bertetangga (arah berlawanan) selalu menghasilkan titik yang sama
+def simplify_arc(arc, tolerance, memo):
+    reverse = arc[-1] < arc[0] or (arc[-1] == arc[0] and arc[-2] < arc[1])
+    canonical = tuple(arc[::-1] if reverse else arc)
+    if canonical not in memo:
+        memo[canonical] = [tuple(p) for p in simplify_line(np.array(canonical), tolerance)]
+    simplified = memo[canonical]
+    return simplified[::-1] if reverse else simplified
+
+
+# Fungsi untuk menyederhanakan semua ring secara topologis
+def simplify_rings(rings, tolerance):
+    junctions = find_junctions(rings)
+    memo = {}
+    result = []
+    for ring in rings:
+        points = []
+        for arc in split_ring(ring, junctions):
+            simplified = simplify_arc(arc, tolerance, memo)
+            points += simplified[1:] if points else simplified
+        result.append(points)
+    return result
+
+
+# Fungsi untuk membulatkan koordinat ring dan membuang titik berurutan yang menjadi sama
+# None jika ring runtuh (kurang dari 3 titik unik), mis. pulau kecil di bawah toleransi
+def round_ring(ring, decimals):
+    points = np.round(np.array(ring), decimals)
+    points = points[np.r_[True, (np.diff(points, axis=0) != 0).any(axis=1)]]
+    if len(points) < 4:
+        return None
+    return points.tolist()
+
+
+# Fungsi untuk membuat GeoJSON sederhana: properti dipangkas, geometri disederhanakan
+# dan koordinat dibulatkan
+def simplify_geojson(geojson, tolerance, decimals):
+    # Semua ring dikumpulkan (tanpa titik penutup) beserta posisinya untuk disusun kembali
+    rings, positions = [], []
+    for f, feature in enumerate(geojson['features']):
+        for p, polygon in enumerate(geometry_polygons(feature['geometry'])):
+            for r, ring in enumerate(polygon):
+                rings.append([tuple(point[:2]) for point in ring[:-1]])
+                positions.append((f, p, r))
+
+    simplified = simplify_rings(rings, tolerance)
+
+    features = []
+    for feature in geojson['features']:
+        properties = {key: feature['properties'][key] for key in KEEP_PROPERTIES if key in feature['properties']}
+        polygons = [[None] * len(polygon) for polygon in geometry_polygons(feature['geometry'])]
+        features.append({'type': 'Feature', 'properties': properties, 'polygons': polygons})
+    for (f, p, r), ring in zip(positions, simplified):
+        features[f]['polygons'][p][r] = round_ring(ring, decimals)
+
+    for feature, source in zip(features, geojson['features']):
+        # Lubang yang runtuh dibuang; poligon dibuang jika ring luarnya runtuh
+        polygons = [[ring for ring in polygon if ring is not None]
+                    for polygon in feature.pop('polygons') if polygon[0] is not None]
+        if not polygons:
+            # Wilayah yang seluruhnya runtuh tetap digambar dengan poligon terbesarnya
+            largest = max(geometry_polygons(source['geometry']), key=len)
+            polygons = [[np.round(np.array(largest[0])[:, :2], decimals).tolist()]]
+        if len(polygons) == 1:
+            feature['geometry'] = {'type': 'Polygon', 'coordinates': polygons[0]}
+        else:
+            feature['geometry'] = {'type': 'MultiPolygon', 'coordinates': polygons}
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+# Fungsi untuk menulis GeoJSON semua tingkat penyederhanaan ke dashboard/static/geo/
+def vendor_geojson(source, levels=LEVELS, geo_dir=GEO_DIR):
+    os.makedirs(geo_dir, exist_ok=True)
+    written = []
+    for level in levels:
+        tolerance, decimals = LEVELS[level]
+        path = geojson_path(level, geo_dir)
+        # Ditulis ke file sementara lalu diganti, agar pembaca tidak pernah melihat file setengah jadi
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(simplify_geojson(source, tolerance, decimals), f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+        written.append(path)
+    return written
+
+
+# Fungsi untuk menghitung jumlah titik koordinat dalam GeoJSON
+def count_points(geojson):
+    return sum(len(ring) for feature in geojson['features']
+               for polygon in geometry_polygons(feature['geometry']) for ring in polygon)
+
+
+# Fungsi untuk memuat GeoJSON lokal sekali per proses
+# File yang hilang adalah kesalahan instalasi (tidak ada unduhan saat runtime)
+@functools.lru_cache(maxsize=None)
+def load_states(level=DEFAULT_LEVEL):
+    path = geojson_path(level)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"GeoJSON negara bagian tidak ditemukan: {path} (buat dengan: python dashboard/geo.py)")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simpan GeoJSON negara bagian Brasil yang disederhanakan ke dashboard/static/geo/')
+    parser.add_argument('--source', default=None, help='File GeoJSON sumber (default: unduh dari GEOJSON_URL)')
+    parser.add_argument('--levels', nargs='+', default=list(LEVELS), choices=list(LEVELS))
+    parser.add_argument('--out', default=GEO_DIR, help='Direktori output')
+    args = parser.parse_args()
+
+    if args.source:
+        with open(args.source, encoding='utf-8') as f:
+            source = json.load(f)
+    else:
+        source = download_geojson()
+
+    source_size = len(json.dumps(source, separators=(',', ':')))
+    print(f"{'sumber':<8} {count_points(source):>8,} titik {source_size / 1024:>8,.0f} KB")
+    for path in vendor_geojson(source, args.levels, args.out):
+        with open(path, encoding='utf-8') as f:
+            points = count_points(json.load(f))
+        level = os.path.basename(path)[len(GEOJSON_NAME) + 1:-len('.geojson')]
+        print(f"{level:<8} {points:>8,} titik {os.path.getsize(path) / 1024:>8,.0f} KB -> {path}")
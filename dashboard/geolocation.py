@@ -0,0 +1,142 @@
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Indeks centroid zip prefix dari geolocation_dataset.csv
+#
+# File geolocation mentah berisi ~1 juta baris dengan banyak duplikat per
+# geolocation_zip_code_prefix. File dibaca per potongan (chunk) dan diringkas menjadi satu
+# baris per zip prefix: koordinat rata-rata (centroid), kota dan negara bagian yang paling
+# sering muncul, serta jumlah baris asal. Tabel ringkas ini (~19 ribu baris) disimpan di
+# snapshot sebagai zip_centroids, sehingga dashboard tidak pernah memuat file mentahnya.
+#
+# Pelanggan/penjual digabungkan ke centroid lewat array lookup zip prefix -> baris (O(n),
+# tanpa merge/hash join), lalu dihitung per sel grid untuk peta kepadatan tab 5.
+#
+# Contoh:
+#   python dashboard/geolocation.py
+#   python dashboard/geolocation.py --out processed_data/snapshot
+
+GEOLOCATION_FILE = 'geolocation_dataset.csv'
+GEOLOCATION_TABLES = ['zip_centroids']
+
+GEOLOCATION_DTYPES = {
+    'geolocation_zip_code_prefix': 'int32',
+    'geolocation_lat': 'float64',
+    'geolocation_lng': 'float64',
+    'geolocation_city': 'str',
+    'geolocation_state': 'str',
+}
+
+CHUNK_ROWS = 200000
+
+# Zip prefix Brasil terdiri dari 5 digit, sehingga lookup cukup berupa array 100 ribu elemen
+ZIP_PREFIX_LIMIT = 100000
+
+# Batas koordinat Brasil: titik di luar batas ini (salah input di data mentah) diabaikan
+LAT_BOUNDS = (-34.0, 5.5)
+LNG_BOUNDS = (-74.0, -32.0)
+
+# Ukuran sel grid peta kepadatan (derajat)
+DENSITY_GRID_DEGREES = 0.1
+
+
+# Fungsi untuk meringkas satu chunk: jumlah koordinat per zip prefix dan jumlah baris per (prefix, kota, negara bagian)
+def summarize_chunk(chunk):
+    lat, lng = chunk['geolocation_lat'], chunk['geolocation_lng']
+    inside = lat.between(*LAT_BOUNDS) & lng.between(*LNG_BOUNDS)
+    chunk = chunk[inside]
+
+    coordinates = chunk.groupby('geolocation_zip_code_prefix').agg(
+        lat_sum=('geolocation_lat', 'sum'),
+        lng_sum=('geolocation_lng', 'sum'),
+        points=('geolocation_lat', 'size'),
+    )
+    places = chunk.groupby(['geolocation_zip_code_prefix', 'geolocation_city', 'geolocation_state']).size()
+    return coordinates, places
+
+
+# Fungsi untuk membangun tabel centroid zip prefix dari file geolocation mentah secara streaming
+# Memori dibatasi oleh satu chunk ditambah ringkasan per prefix, bukan ukuran file
+def build_zip_centroids(path, chunk_rows=CHUNK_ROWS):
+    coordinate_parts, place_parts = [], []
+    for chunk in pd.read_csv(path, usecols=list(GEOLOCATION_DTYPES), dtype=GEOLOCATION_DTYPES,
+                             chunksize=chunk_rows):
+        coordinates, places = summarize_chunk(chunk)
+        coordinate_parts.append(coordinates)
+        place_parts.append(places)
+
+    coordinates = pd.concat(coordinate_parts).groupby(level=0).sum()
+    places = pd.concat(place_parts).groupby(level=[0, 1, 2]).sum()
+
+    # Kota dan negara bagian yang paling sering muncul untuk setiap prefix
+    places = places.sort_values(ascending=False, kind='stable').reset_index()
+    places = places.drop_duplicates('geolocation_zip_code_prefix').set_index('geolocation_zip_code_prefix')
+    places = places.reindex(coordinates.index)
+
+    centroids = pd.DataFrame({
+        'zip_code_prefix': coordinates.index.to_numpy(dtype='int32'),
+        'lat': (coordinates['lat_sum'] / coordinates['points']).to_numpy(dtype='float32'),
+        'lng': (coordinates['lng_sum'] / coordinates['points']).to_numpy(dtype='float32'),
+        'city': pd.Categorical(places['geolocation_city'].to_numpy()),
+        'state': pd.Categorical(places['geolocation_state'].to_numpy()),
+        'points': coordinates['points'].to_numpy(dtype='int32'),
+    })
+    return centroids.sort_values('zip_code_prefix', ignore_index=True)
+
+
+# Fungsi untuk menambahkan tabel centroid jika belum ada dan file geolocation mentah tersedia
+def add_zip_centroids(tables, path):
+    if 'zip_centroids' not in tables and os.path.exists(path):
+        tables['zip_centroids'] = build_zip_centroids(path)
+    return tables
+
+
+# Fungsi untuk memetakan zip prefix ke nomor baris tabel centroid (-1 jika tidak dikenal)
+# Lookup langsung pada array berindeks prefix: O(n) tanpa merge
+def centroid_positions(zip_prefixes, centroids):
+    lookup = np.full(ZIP_PREFIX_LIMIT, -1, dtype=np.int32)
+    lookup[centroids['zip_code_prefix'].to_numpy()] = np.arange(len(centroids), dtype=np.int32)
+
+    prefixes = np.asarray(zip_prefixes)
+    valid = (prefixes >= 0) & (prefixes < ZIP_PREFIX_LIMIT)
+    return np.where(valid, lookup[np.where(valid, prefixes, 0)], -1)
+
+
+# Fungsi untuk menghitung jumlah titik (pelanggan/penjual) per sel grid dari zip prefix mereka
+def point_density(zip_prefixes, centroids, grid=DENSITY_GRID_DEGREES):
+    positions = centroid_positions(zip_prefixes, centroids)
+    positions = positions[positions >= 0]
+    lat = centroids['lat'].to_numpy(dtype='float64')[positions]
+    lng = centroids['lng'].to_numpy(dtype='float64')[positions]
+    cells = pd.DataFrame({
+        'lat': np.round(np.round(lat / grid) * grid, 6),
+        'lng': np.round(np.round(lng / grid) * grid, 6),
+    })
+    return cells.groupby(['lat', 'lng']).size().reset_index(name='count')
+
+
+if __name__ == '__main__':
+    import data_store
+
+    parser = argparse.ArgumentParser(description='Ringkas geolocation_dataset.csv menjadi tabel centroid per zip prefix')
+    parser.add_argument('--source', default=None, help='File geolocation mentah (default: dicari seperti data lain)')
+    parser.add_argument('--out', default=None, help='Direktori snapshot untuk menulis zip_centroids.parquet/.arrow')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    source = args.source or data_store.get_file_path(GEOLOCATION_FILE)
+    start = time.perf_counter()
+    centroids = build_zip_centroids(source, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+
+    rows = int(centroids['points'].sum())
+    print(f"{source}: {os.path.getsize(source) / 1024 ** 2:,.1f} MB, {rows:,} baris valid "
+          f"-> {len(centroids):,} zip prefix ({centroids.memory_usage(deep=True).sum() / 1024 ** 2:,.2f} MB)")
+    print(f"Selesai dalam {elapsed:.1f} detik ({rows / elapsed:,.0f} baris/detik)")
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for path in data_store.write_table(centroids, args.out, 'zip_centroids'):
+            print(f"-> {path}")
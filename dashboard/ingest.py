@@ -0,0 +1,179 @@
+import os
+import time
+import argparse
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import data_store
+import schema
+from reviews import TEXT_COLUMNS, MISSING_TEXT
+
+# Ingest streaming file CSV mentah Olist menjadi Parquet dengan memori terbatas
+#
+# Pengganti pd.read_csv satu file utuh di notebook: setiap file mentah dibaca per potongan
+# (chunk) berukuran tetap, dibersihkan dengan langkah yang sama seperti notebook.ipynb, lalu
+# langsung ditulis ke Parquet (pq.ParquetWriter, satu row group per chunk). Puncak memori
+# mengikuti ukuran chunk, bukan ukuran file:
+# - skema Parquet ditetapkan dari tipe di schema.py, bukan ditebak dari chunk pertama, sehingga
+#   chunk berikutnya yang kolomnya seluruhnya kosong atau berisi NaN di kolom integer tetap cocok
+# - ukuran chunk dihitung dari batas memori (--memory-mb) dan perkiraan byte per baris
+#   dari sampel awal file, dikalikan faktor overhead parsing CSV pandas
+# - median dimensi produk dihitung pada lintasan pertama yang hanya membaca kolom dimensi
+#
+# geolocation_dataset.csv tidak di-ingest: satu-satunya pemakainya adalah indeks centroid zip
+# prefix di geolocation.py, yang sudah membaca CSV mentah per chunk dan menghitung rata-rata
+# atas semua baris asal (termasuk duplikat).
+#
+# Hasilnya ditulis ke processed_data/<tabel>_processed.parquet dan dipakai data_store.py
+# sebagai pengganti CSV hasil ekspor notebook.
+#
+# Contoh:
+#   python dashboard/ingest.py
+#   python dashboard/ingest.py --memory-mb 64 --tables orders order_reviews
+
+PROCESSED_DIR = os.path.join(data_store.ROOT_DIR, 'processed_data')
+
+# Nama tabel -> (file data mentah, file Parquet hasil ingest)
+# product_category tidak ditulis terpisah karena digabung ke products (seperti notebook)
+INGEST_TABLES = {
+    name: (raw_file, os.path.splitext(processed_file)[0] + '.parquet')
+    for name, (processed_file, raw_file) in data_store.TABLES.items() if processed_file
+}
+
+# Kolom dimensi produk yang nilai kosongnya diisi median (notebook.ipynb)
+PRODUCT_DIMENSIONS = ['product_name_lenght', 'product_description_lenght', 'product_photos_qty',
+                      'product_weight_g', 'product_length_cm', 'product_height_cm', 'product_width_cm']
+
+MEMORY_MB = 256
+
+# Perkiraan rasio puncak memori parsing CSV terhadap ukuran DataFrame hasilnya
+PARSE_OVERHEAD = 4
+
+SAMPLE_ROWS = 10000
+MIN_CHUNK_ROWS = 10000
+
+
+# Fungsi untuk menghitung jumlah baris per chunk dari batas memori dan sampel awal file
+def chunk_rows_for(path, memory_mb=MEMORY_MB):
+    sample = pd.read_csv(path, nrows=SAMPLE_ROWS)
+    bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+    rows = int(memory_mb * 1024 ** 2 / (max(bytes_per_row, 1) * PARSE_OVERHEAD))
+    return max(MIN_CHUNK_ROWS, rows)
+
+
+# Fungsi untuk menghitung median setiap kolom dimensi produk (lintasan pertama, hanya kolom dimensi)
+def product_medians(path, chunk_rows):
+    parts = [chunk for chunk in pd.read_csv(path, usecols=PRODUCT_DIMENSIONS, dtype='float64', chunksize=chunk_rows)]
+    values = pd.concat(parts, ignore_index=True)
+    return {col: float(values[col].median()) for col in PRODUCT_DIMENSIONS}
+
+
+# Fungsi untuk menerapkan pembersihan notebook pada satu chunk
+# context berisi median produk dan tabel terjemahan kategori
+def clean_chunk(name, chunk, context):
+    for col in data_store.DATETIME_COLUMNS.get(name, []):
+        if col in chunk.columns:
+            chunk[col] = pd.to_datetime(chunk[col])
+
+    if name == 'order_reviews':
+        for col in TEXT_COLUMNS:
+            chunk[col] = chunk[col].fillna(MISSING_TEXT)
+    elif name == 'products':
+        chunk = chunk.fillna(context['medians'])
+        chunk = data_store.merge_product_categories(chunk, context['product_category'])
+    return chunk
+
+
+# Fungsi untuk menentukan tipe Arrow satu kolom dari skema ringkas di schema.py
+# Kolom id, kategori dan teks disimpan sebagai string; kolom integer tetap boleh berisi null
+def arrow_type(name, column):
+    if column in data_store.DATETIME_COLUMNS.get(name, []):
+        return pa.timestamp('ns')
+    if column in schema.NUMERIC_DTYPES.get(name, {}):
+        return pa.from_numpy_dtype(schema.NUMERIC_DTYPES[name][column])
+    if column in schema.MONEY_COLUMNS.get(name, []):
+        return pa.float64()
+    return pa.string()
+
+
+# Fungsi untuk menyusun skema Parquet satu tabel dari daftar kolomnya
+def table_schema(name, columns):
+    return pa.schema([pa.field(column, arrow_type(name, column)) for column in columns])
+
+
+# Fungsi untuk meng-ingest satu tabel: CSV mentah -> chunk bersih -> Parquet (ditulis bertahap)
+# chunk_rows mengabaikan batas memori dan memakai ukuran chunk tetap (mis. untuk benchmark)
+def ingest_table(name, out_dir=PROCESSED_DIR, memory_mb=MEMORY_MB, chunk_rows=None):
+    raw_file, out_file = INGEST_TABLES[name]
+    source = data_store.get_file_path(raw_file)
+    out_path = os.path.join(out_dir, out_file)
+    chunk_rows = chunk_rows or chunk_rows_for(source, memory_mb)
+
+    context = {}
+    if name == 'products':
+        context['medians'] = product_medians(source, chunk_rows)
+        context['product_category'] = pd.read_csv(data_store.get_file_path(data_store.TABLES['product_category'][1]))
+
+    # Kolom string dibaca sebagai teks agar chunk yang kebetulan berisi angka saja tidak berubah tipe
+    columns = pd.read_csv(source, nrows=0).columns
+    dtype = {column: str for column in columns if arrow_type(name, column) == pa.string()}
+
+    start = time.perf_counter()
+    rows_in = rows_out = 0
+    writer = None
+    try:
+        for chunk in pd.read_csv(source, dtype=dtype, chunksize=chunk_rows):
+            rows_in += len(chunk)
+            chunk = clean_chunk(name, chunk, context)
+            rows_out += len(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, table_schema(name, chunk.columns))
+            writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return {
+        'table': name,
+        'path': out_path,
+        'chunk_rows': chunk_rows,
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+# Fungsi untuk meng-ingest beberapa tabel (default semua yang file mentahnya tersedia)
+def ingest_all(out_dir=PROCESSED_DIR, memory_mb=MEMORY_MB, tables=None):
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+    for name in tables or INGEST_TABLES:
+        if os.path.exists(data_store.get_file_path(INGEST_TABLES[name][0])):
+            results.append(ingest_table(name, out_dir, memory_mb))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ingest CSV mentah Olist per chunk menjadi Parquet bersih')
+    parser.add_argument('--out', default=PROCESSED_DIR, help='Direktori output Parquet')
+    parser.add_argument('--memory-mb', type=float, default=MEMORY_MB, help='Batas memori per chunk (MB)')
+    parser.add_argument('--tables', nargs='+', default=list(INGEST_TABLES), choices=list(INGEST_TABLES))
+    args = parser.parse_args()
+
+    print(f"{'tabel':<16} {'chunk':>9} {'baris masuk':>12} {'baris keluar':>12} {'detik':>7} {'baris/detik':>12}")
+    total_rows = total_seconds = 0
+    for result in ingest_all(args.out, args.memory_mb, args.tables):
+        total_rows += result['rows_in']
+        total_seconds += result['seconds']
+        print(f"{result['table']:<16} {result['chunk_rows']:>9,} {result['rows_in']:>12,} {result['rows_out']:>12,} "
+              f"{result['seconds']:>7.2f} {result['rows_in'] / max(result['seconds'], 1e-9):>12,.0f}")
+
+    print(f"Total {total_rows:,} baris dalam {total_seconds:.1f} detik "
+          f"({total_rows / max(total_seconds, 1e-9):,.0f} baris/detik)")
+
+    # Puncak RSS proses (ru_maxrss dalam KB di Linux; modul resource tidak tersedia di Windows)
+    try:
+        import resource
+        print(f"Puncak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MB")
+    except ImportError:
+        pass
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+from cube import split_cells
+from facts import DELIVERY_CODE_COLUMN, NO_DELIVERY_STATUS
+
+# Sketsa distribusi waktu pengiriman (tab 4) yang bisa digabung antar hari dan negara bagian
+#
+# Waktu pengiriman aktual adalah bilangan bulat hari yang kecil (kolom int16 di tabel orders),
+# sehingga sketsa kuantil yang bisa digabung cukup berupa histogram hari per sel:
+# lead_time_cells berisi jumlah pesanan terkirim per tanggal x negara bagian x waktu pengiriman.
+# Menggabungkan sel (antar hari maupun negara bagian) cukup menjumlahkan order_count, dan
+# kuantil dari histogram gabungan sama persis dengan np.quantile pada baris aslinya (tanpa
+# galat aproksimasi seperti t-digest/KLL). Ukuran tabel mengikuti jumlah hari x negara bagian x
+# nilai hari yang muncul, bukan jumlah pesanan.
+#
+# Ke browser hanya dikirim hasil agregat: histogram ~HISTOGRAM_BINS bin, kuantil per negara
+# bagian dan grid kepadatan estimasi x aktual berukuran tetap (GRID_BINS x GRID_BINS).
+#
+# Seperti cube.py, hari yang tercakup penuh oleh filter dijawab dari lead_time_cells dan sisa jam
+# di hari tepi dihitung dari potongan kecil tabel orders, sehingga hasilnya tetap sama persis.
+
+LEAD_TIME_TABLES = ['lead_time_cells']
+
+DAYS_COLUMN = 'actual_delivery_days'
+ESTIMATED_COLUMN = 'estimated_delivery_days'
+
+HISTOGRAM_BINS = 30
+GRID_BINS = 30
+QUANTILES = {'p50': 0.5, 'p90': 0.9}
+
+
+# Fungsi untuk mengambil negara bagian pelanggan dari surrogate key customer_id
+# Key customer_id berasal dari urutan baris tabel customers (schema.py), sehingga cukup diambil per posisi;
+# jika urutan itu tidak berlaku (mis. tabel sudah diubah), dicari lewat index
+def customer_states(customers, customer_ids):
+    keys = np.asarray(customer_ids)
+    ids = customers['customer_id'].to_numpy()
+    if len(keys) and keys.min() >= 0 and keys.max() < len(ids) and (ids[keys] == keys).all():
+        return customers['customer_state'].values.take(keys)
+    return customers.set_index('customer_id')['customer_state'].reindex(keys).values
+
+
+# Fungsi untuk menyiapkan tanggal, negara bagian pelanggan dan waktu pengiriman pesanan terkirim
+def delivered_rows(orders, customers):
+    orders = orders[orders[DELIVERY_CODE_COLUMN].to_numpy() != NO_DELIVERY_STATUS]
+    return pd.DataFrame({
+        'date': orders['order_purchase_timestamp'].to_numpy().astype('datetime64[D]').astype('datetime64[ns]'),
+        'customer_state': customer_states(customers, orders['customer_id']),
+        DAYS_COLUMN: orders[DAYS_COLUMN].to_numpy(),
+    })
+
+
+# Fungsi untuk meringkas pesanan terkirim menjadi sel histogram per hari x negara bagian x waktu pengiriman
+def rollup_lead_times(orders, customers):
+    rows = delivered_rows(orders, customers)
+    cells = rows.groupby(['date', 'customer_state', DAYS_COLUMN], observed=True, dropna=False).size()
+    return cells.rename('order_count').reset_index().astype({'order_count': 'int32'})
+
+
+# Fungsi untuk menambahkan tabel lead_time_cells jika belum ada
+def add_lead_time_tables(tables):
+    if 'lead_time_cells' not in tables:
+        tables['lead_time_cells'] = rollup_lead_times(tables['orders'], tables['customers'])
+    return tables
+
+
+# Fungsi untuk mengambil sel histogram dalam rentang tanggal start..end (inklusif)
+def query_lead_times(tables, start, end):
+    lo, hi, edge_rows = split_cells(tables['lead_time_cells'], tables['orders'], start, end)
+    parts = [tables['lead_time_cells'].iloc[lo:hi]]
+    parts += [rollup_lead_times(rows, tables['customers']) for rows in edge_rows]
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+
+# Fungsi untuk menggabungkan sel per grup menjadi histogram padat (baris = grup, kolom = hari lo, lo+1, ...)
+# groups: kode grup 0..n_groups-1 per sel (None = satu histogram untuk semua sel)
+def merge_histograms(cells, groups=None, n_groups=1):
+    days = cells[DAYS_COLUMN].to_numpy().astype('int64')
+    lo = int(days.min())
+    width = int(days.max()) - lo + 1
+    keys = days - lo if groups is None else groups * width + (days - lo)
+    counts = np.bincount(keys, weights=cells['order_count'].to_numpy(), minlength=n_groups * width)
+    return lo + np.arange(width), counts.astype('int64').reshape(n_groups, width)
+
+
+# Fungsi untuk menghitung kuantil dari histogram padat per baris (interpolasi linear seperti np.quantile)
+def histogram_quantiles(values, counts, quantiles):
+    cumulative = np.cumsum(counts, axis=1)
+    position = np.asarray(quantiles, dtype='float64')[None, :] * (cumulative[:, -1:] - 1)
+    # Nilai pada peringkat k (0-based) adalah nilai pertama dengan jumlah kumulatif > k
+    lower = values[(cumulative[:, None, :] <= np.floor(position)[:, :, None]).sum(axis=2)]
+    upper = values[(cumulative[:, None, :] <= np.ceil(position)[:, :, None]).sum(axis=2)]
+    return lower + (upper - lower) * (position - np.floor(position))
+
+
+# Fungsi untuk mengelompokkan histogram ke bin selebar ceil(rentang / bins) hari
+def binned_histogram(values, counts, bins=HISTOGRAM_BINS):
+    lo = int(values[0])
+    width = max(1, -(-len(values) // bins))
+    binned = np.bincount((values - lo) // width, weights=counts)
+    starts = lo + width * np.arange(len(binned))
+    return pd.DataFrame({
+        'bin_start': starts,
+        'bin_end': starts + width,
+        'count': binned.astype('int64'),
+    })
+
+
+# Fungsi untuk menghitung jumlah pesanan dan kuantil waktu pengiriman per grup (mis. 'customer_state')
+def group_quantiles(cells, by):
+    codes, keys = pd.factorize(cells[by], sort=True)
+    values, counts = merge_histograms(cells, codes, len(keys))
+    quantiles = histogram_quantiles(values, counts, list(QUANTILES.values()))
+    result = pd.DataFrame({by: np.asarray(keys), 'order_count': counts.sum(axis=1)})
+    for i, name in enumerate(QUANTILES):
+        result[name] = quantiles[:, i]
+    return result
+
+
+# Fungsi untuk membangun grid kepadatan estimasi x aktual (jumlah pesanan per sel) dari potongan orders
+# Bin selebar ceil(rentang / bins) hari per sumbu; hasilnya deterministik (tanpa sampel acak)
+def density_grid(orders, bins=GRID_BINS):
+    delivered = orders[DELIVERY_CODE_COLUMN].to_numpy() != NO_DELIVERY_STATUS
+    axes = {}
+    for column in [ESTIMATED_COLUMN, DAYS_COLUMN]:
+        values = orders[column].to_numpy()[delivered].astype('int64')
+        lo = int(values.min())
+        width = max(1, -(-(int(values.max()) - lo + 1) // bins))
+        positions = (values - lo) // width
+        axes[column] = (positions, lo + width * (np.arange(positions.max() + 1) + 0.5) - 0.5)
+
+    (x, x_centers), (y, y_centers) = axes[ESTIMATED_COLUMN], axes[DAYS_COLUMN]
+    counts = np.bincount(y * len(x_centers) + x, minlength=len(x_centers) * len(y_centers))
+    return {
+        'estimated_days': x_centers,
+        'actual_days': y_centers,
+        'counts': counts.reshape(len(y_centers), len(x_centers)),
+    }
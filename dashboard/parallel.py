@@ -0,0 +1,160 @@
+import os
+import sys
+import types
+import atexit
+import threading
+import contextlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from rfm import score_aggregates
+from parallel_worker import attach, rfm_partition
+
+# Backend eksekusi paralel (process pool + shared memory) untuk RFM (tab 2)
+#
+# Kolom yang dibutuhkan disalin sekali per versi data ke blok shared memory. Worker di
+# process pool (parallel_worker.py) membuka blok yang sama per nama (tanpa pickle / salinan per
+# tugas), menghitung agregat parsial untuk satu partisi, lalu proses utama menggabungkan hasilnya:
+# - RFM (tab 2): baris pembayaran pesanan terkirim dipartisi berdasarkan hash pelanggan
+#   (customer_id % jumlah worker), setiap partisi terurut waktu. Agregat per pelanggan dari
+#   partisi yang berbeda tidak beririsan, sehingga cukup digabung lalu diberi skor sekali.
+# Selisih hari dan status pengiriman (tab 4) sudah dihitung sekali saat load sebagai kolom tabel
+# orders (facts.py) dan peta panas bulan x hari (tab 5) dijawab dari cube harian (cube.py), sehingga
+# keduanya tidak diparalelkan.
+#
+# Eksperimental: belum dipakai dashboard (analytics.customer_segments selalu serial). Speedup per
+# core belum pernah terukur karena benchmark sejauh ini hanya berjalan di mesin 1 CPU, tempat
+# process pool justru lebih lambat. Backend ini baru dihubungkan ke analytics.py setelah
+# benchmarks/bench_parallel.py di mesin multi-core menunjukkan speedup; sampai saat itu
+# enabled() (OLIST_PARALLEL_WORKERS, OLIST_PARALLEL_MIN_ROWS) hanya menjadi calon saklarnya.
+# Hasilnya identik dengan jalur serial (lihat benchmarks/bench_parallel.py).
+
+WORKERS = int(os.getenv('OLIST_PARALLEL_WORKERS', '0'))
+MIN_ROWS = int(os.getenv('OLIST_PARALLEL_MIN_ROWS', '200000'))
+
+TIME_COLUMN = 'order_purchase_timestamp'
+
+_backend = None
+_lock = threading.Lock()
+
+
+# Fungsi untuk menyalin array ke blok shared memory baru
+def share_array(values):
+    values = np.ascontiguousarray(values)
+    segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[:] = values
+    return segment
+
+
+# Fungsi untuk menyiapkan kolom partisi RFM dari tabel data
+def build_layout(data, workers):
+    lines = data['payment_lines']
+    lines = lines[(lines['order_status'] == 'delivered').to_numpy()]
+    customers = lines['customer_id'].to_numpy(dtype=np.int32)
+
+    # Partisi hash pelanggan, urutan waktu di dalam partisi tetap (sort stabil)
+    partition = customers.astype(np.int64) % workers
+    order = np.argsort(partition, kind='stable')
+    offsets = partition[order].searchsorted(np.arange(workers + 1), side='left')
+
+    columns = {
+        'rfm_customer': customers[order],
+        'rfm_order': lines['order_id'].to_numpy(dtype=np.int32)[order],
+        'rfm_time': lines[TIME_COLUMN].to_numpy().astype('datetime64[ns]').view(np.int64)[order],
+        'rfm_payment': lines['payment_value'].to_numpy(dtype=np.float64)[order],
+    }
+    return columns, offsets
+
+
+# Fungsi untuk menyiapkan konteks multiprocessing worker
+# forkserver: fork langsung dari server Streamlit yang multi-thread bisa deadlock (lock milik thread
+# lain ikut tersalin dalam keadaan terkunci). Worker di-fork dari proses forkserver yang bersih dan
+# hanya memuat numpy / pandas; parallel_worker di-import dari sys.path proses utama.
+def pool_context():
+    context = mp.get_context('forkserver')
+    context.set_forkserver_preload(['numpy', 'pandas'])
+    return context
+
+
+# Context manager untuk menjalankan worker tanpa menjalankan ulang script __main__
+# Streamlit memasang dashboard.py sebagai modul __main__ (dengan __file__), dan worker spawn /
+# forkserver akan menjalankannya ulang sebagai __mp_main__ saat mulai. Selama worker dibuat,
+# __main__ diganti modul kosong sehingga worker hanya meng-import parallel_worker.
+@contextlib.contextmanager
+def bare_main():
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+# Fungsi untuk menutup pool dan menghapus blok shared memory backend yang aktif
+def shutdown():
+    global _backend
+    if _backend is None:
+        return
+    _backend['pool'].close()
+    _backend['pool'].join()
+    for segment in _backend['segments']:
+        segment.close()
+        segment.unlink()
+    _backend = None
+
+
+atexit.register(shutdown)
+
+
+# Fungsi untuk mengambil backend untuk data ini (dibangun ulang jika data atau jumlah worker berubah)
+def get_backend(data, workers=None):
+    global _backend
+    workers = workers or WORKERS
+    key = (id(data['payment_lines']), len(data['payment_lines']), workers)
+    with _lock:
+        if _backend is not None and _backend['key'] == key:
+            return _backend
+        shutdown()
+
+        columns, offsets = build_layout(data, workers)
+        segments = {column: share_array(values) for column, values in columns.items()}
+        spec = {column: (segments[column].name, values.dtype.str, len(values)) for column, values in columns.items()}
+        # multiprocessing.Pool memulai semua worker di sini (ProcessPoolExecutor memulai worker
+        # forkserver secara bertahap saat submit, di luar bare_main())
+        with bare_main():
+            pool = pool_context().Pool(processes=workers, initializer=attach, initargs=(spec,))
+        _backend = {
+            'key': key,
+            'pool': pool,
+            'segments': list(segments.values()),
+            'workers': workers,
+            'rfm_offsets': offsets,
+        }
+        return _backend
+
+
+# Fungsi untuk memeriksa apakah potongan data sebesar `rows` dihitung dengan process pool
+# (forkserver hanya tersedia di POSIX; di Windows query selalu dihitung serial)
+def enabled(rows, workers=None):
+    return (workers or WORKERS) > 1 and rows >= MIN_ROWS and 'forkserver' in mp.get_all_start_methods()
+
+
+# Fungsi untuk mengubah tanggal filter menjadi nanodetik int64
+def to_ns(timestamp):
+    return pd.Timestamp(timestamp).to_datetime64().astype('datetime64[ns]').view(np.int64)
+
+
+# Fungsi utama RFM paralel: agregat per partisi pelanggan digabung lalu diberi skor
+# (hasil sama dengan rfm.compute_rfm pada baris pesanan terkirim dalam rentang tanggal)
+def compute_rfm(data, start_date, end_date, workers=None):
+    backend = get_backend(data, workers)
+    offsets = backend['rfm_offsets']
+    start_ns, end_ns = to_ns(start_date), to_ns(end_date)
+    parts = backend['pool'].starmap(rfm_partition, [(int(offsets[p]), int(offsets[p + 1]), start_ns, end_ns)
+                                                    for p in range(backend['workers'])])
+
+    customers = np.concatenate([part[0] for part in parts])
+    order = np.argsort(customers, kind='stable')
+    last_purchase, frequency, monetary = (np.concatenate([part[i] for part in parts])[order] for i in (1, 2, 3))
+    return score_aggregates(customers[order], last_purchase, frequency, monetary, end_date)
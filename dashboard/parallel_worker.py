@@ -0,0 +1,39 @@
+import numpy as np
+from multiprocessing import shared_memory
+from rfm import NAT
+
+# Sisi worker backend paralel (parallel.py)
+#
+# Modul ini di-import oleh worker process pool (start method forkserver), sehingga hanya berisi
+# fungsi worker dan tidak menjalankan apa pun saat di-import: tidak ada pemuatan data, thread,
+# atexit ataupun import Streamlit. Kolom dibaca dari blok shared memory yang dibuka per nama.
+
+# Nama kolom -> array di atas shared memory (diisi oleh attach() saat worker mulai)
+_columns = {}
+_segments = []
+
+
+# Fungsi initializer worker: membuka blok shared memory dari spesifikasi (nama, dtype, panjang)
+def attach(spec):
+    for column, (name, dtype, length) in spec.items():
+        # Worker berbagi resource tracker dengan proses utama, yang menghapus blok saat shutdown()
+        segment = shared_memory.SharedMemory(name=name)
+        _segments.append(segment)
+        _columns[column] = np.ndarray((length,), dtype=dtype, buffer=segment.buf)
+
+
+# Fungsi worker: agregat RFM untuk satu partisi pelanggan [block_lo, block_hi) dalam rentang waktu
+def rfm_partition(block_lo, block_hi, start_ns, end_ns):
+    timestamps = _columns['rfm_time'][block_lo:block_hi]
+    lo = block_lo + timestamps.searchsorted(start_ns, side='left')
+    hi = block_lo + timestamps.searchsorted(end_ns, side='right')
+
+    customers, codes = np.unique(_columns['rfm_customer'][lo:hi], return_inverse=True)
+    last_purchase = np.full(len(customers), NAT, dtype=np.int64)
+    np.maximum.at(last_purchase, codes, _columns['rfm_time'][lo:hi])
+
+    # Satu pesanan hanya milik satu pelanggan: baris pertama setiap pesanan menambah frequency
+    _, first = np.unique(_columns['rfm_order'][lo:hi], return_index=True)
+    frequency = np.bincount(codes[first], minlength=len(customers))
+    monetary = np.bincount(codes, weights=_columns['rfm_payment'][lo:hi], minlength=len(customers))
+    return customers, last_purchase, frequency, monetary
@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from cachetools import LRUCache
+import analytics
+
+# Cache hasil query analytics.py yang dipakai bersama oleh semua sesi dalam satu proses
+#
+# Setiap perubahan sidebar menjalankan ulang seluruh skrip Streamlit. Hasil query disimpan
+# dengan key (nama query, field Filters yang dipakai query tersebut, versi data), sehingga
+# tampilan populer seperti "Semua Data / All Categories / All States" cukup diambil dari
+# dict. Cache dibatasi memori (ukuran DataFrame hasil) dengan eviksi LRU.
+#
+# Hasil yang dikembalikan dipakai bersama oleh semua sesi: jangan diubah di tempat.
+# prefetch() mengisi cache untuk query tab yang belum dibuka dengan satu thread latar belakang.
+# Prefetch yang belum mulai dibatalkan bila query-nya diminta langsung (dihitung di thread sesi)
+# atau bila prefetch berikutnya datang dengan filter lain, sehingga antrean tidak berisi query basi.
+
+# Batas memori cache dalam MB
+CACHE_MB = float(os.getenv('OLIST_CACHE_MB', '256'))
+
+
+# Fungsi untuk menghitung ukuran (byte) sebuah hasil query
+def result_size(result):
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    if isinstance(result, pd.Series):
+        return int(result.memory_usage(deep=True))
+    if isinstance(result, dict):
+        return sys.getsizeof(result) + sum(result_size(value) for value in result.values())
+    return sys.getsizeof(result)
+
+
+# LRUCache berbatas ukuran yang juga mencatat jumlah eviksi
+class ResultCache(LRUCache):
+    def __init__(self, maxsize):
+        super().__init__(maxsize, getsizeof=result_size)
+        self.evictions = 0
+
+    def popitem(self):
+        self.evictions += 1
+        return super().popitem()
+
+
+_cache = ResultCache(int(CACHE_MB * 1024 ** 2))
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'prefetched': 0, 'prefetch_waits': 0, 'cancelled': 0, 'compute_seconds': 0.0}
+
+# Satu worker cukup: prefetch tidak boleh berebut CPU dengan rerun sesi yang sedang aktif
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='query-prefetch')
+# Key query yang sedang di-prefetch -> Future hasilnya
+_pending = {}
+
+
+# Fungsi untuk membuat versi data: berubah bila tabel dimuat ulang dengan isi berbeda
+# (tabel ber-waktu terurut, jadi waktu pesanan terakhir cukup dibaca dari baris terakhir)
+def data_version(data):
+    orders = data['orders']
+    last_purchase = orders['order_purchase_timestamp'].iat[-1] if len(orders) else None
+    return len(orders), len(data['order_lines']), len(data['payment_lines']), last_purchase
+
+
+# Fungsi untuk membuat key cache dari nama query dan field filter yang dipakai query tersebut
+def cache_key(name, filters, version):
+    fields = analytics.QUERIES[name][1]
+    return name, tuple(getattr(filters, field) for field in fields), version
+
+
+# Fungsi utama: hasil query dari cache, atau dihitung lalu disimpan jika belum ada
+def run_query(data, name, filters):
+    key = cache_key(name, filters, data_version(data))
+    with _lock:
+        if key in _cache:
+            _stats['hits'] += 1
+            return _cache[key]
+        _stats['misses'] += 1
+        future = _pending.get(key)
+        # Prefetch yang masih mengantre dibatalkan dan dihitung langsung, tidak menunggu antrean
+        if future is not None and future.cancel():
+            _pending.pop(key, None)
+            _stats['cancelled'] += 1
+            future = None
+        elif future is not None:
+            _stats['prefetch_waits'] += 1
+
+    # Query yang sedang dihitung oleh thread prefetch cukup ditunggu, tidak dihitung dua kali
+    if future is not None:
+        return future.result()
+    return compute(data, name, filters, key)
+
+
+# Fungsi untuk menghitung query lalu menyimpannya di cache
+# Dihitung di luar lock agar sesi lain tetap bisa membaca cache
+def compute(data, name, filters, key):
+    start = time.perf_counter()
+    result = analytics.QUERIES[name][0](data, filters)
+    elapsed = time.perf_counter() - start
+
+    with _lock:
+        _stats['compute_seconds'] += elapsed
+        if result_size(result) <= _cache.maxsize:
+            _cache[key] = result
+    return result
+
+
+# Fungsi untuk menghitung satu query prefetch di thread latar belakang
+def prefetch_query(data, name, filters, key):
+    try:
+        result = compute(data, name, filters, key)
+        with _lock:
+            _stats['prefetched'] += 1
+        return result
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+
+
+# Fungsi untuk menjadwalkan query yang belum ada di cache agar dihitung di latar belakang
+# Prefetch lama yang belum mulai (filter sebelumnya) dibatalkan lebih dulu
+def prefetch(data, names, filters):
+    version = data_version(data)
+    keys = {cache_key(name, filters, version): name for name in names}
+    with _lock:
+        for key, future in list(_pending.items()):
+            if key not in keys and future.cancel():
+                _pending.pop(key)
+                _stats['cancelled'] += 1
+        for key, name in keys.items():
+            if key in _cache or key in _pending:
+                continue
+            _pending[key] = _executor.submit(prefetch_query, data, name, filters, key)
+
+
+# Fungsi untuk membaca metrik cache (hit, miss, eviksi, isi dan ukuran)
+def cache_stats():
+    with _lock:
+        lookups = _stats['hits'] + _stats['misses']
+        return {
+            'hits': _stats['hits'],
+            'misses': _stats['misses'],
+            'prefetched': _stats['prefetched'],
+            'prefetch_waits': _stats['prefetch_waits'],
+            'cancelled': _stats['cancelled'],
+            'hit_rate': _stats['hits'] / lookups if lookups else 0.0,
+            'evictions': _cache.evictions,
+            'entries': len(_cache),
+            'size_mb': _cache.currsize / 1024 ** 2,
+            'max_mb': _cache.maxsize / 1024 ** 2,
+            'compute_seconds': _stats['compute_seconds'],
+        }
+
+
+# Fungsi untuk mengosongkan cache dan metriknya
+def clear_cache():
+    with _lock:
+        _cache.clear()
+        _cache.evictions = 0
+        _stats.update(dict.fromkeys(_stats, 0), compute_seconds=0.0)
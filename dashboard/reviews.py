@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
+from schema import encode_ids, decode_ids
+
+# Pemuatan ulasan pesanan secara streaming tanpa teks komentar
+#
+# order_reviews_dataset.csv adalah tabel teks terbesar karena review_comment_message.
+# Dashboard hanya membutuhkan skor, tanggal dan key pesanan, sehingga file dibaca per
+# blok tanpa kolom teks: teks komentar tidak pernah menjadi objek str di memori.
+# Teks komentar disimpan terpisah di snapshot (review_text.parquet, ditulis per chunk) dan
+# hanya dibaca untuk review_id yang diminta, misalnya contoh komentar di tab ulasan.
+
+TEXT_COLUMNS = ['review_comment_title', 'review_comment_message']
+
+# Pengisi teks kosong di order_reviews_processed.csv hasil notebook (dianggap tanpa komentar)
+MISSING_TEXT = 'Not Available'
+
+REVIEW_TEXT_FILE = 'review_text.parquet'
+
+CHUNK_ROWS = 100000
+
+# Tipe kolom non-teks (tipe tetap agar semua blok CSV konsisten) dan ukuran blok pembaca CSV streaming
+SCORE_TYPES = {
+    'review_id': pa.string(),
+    'order_id': pa.string(),
+    'review_score': pa.int64(),
+    'review_creation_date': pa.timestamp('ns'),
+    'review_answer_timestamp': pa.timestamp('ns'),
+}
+CSV_BLOCK_BYTES = 16 * 1024 ** 2
+
+
+# Fungsi untuk membaca ulasan tanpa kolom teks: CSV dengan pembaca streaming pyarrow (per blok,
+# melepas GIL, teks tidak pernah menjadi objek str Python), Parquet hanya kolom non-teks
+def read_review_scores(path, block_bytes=CSV_BLOCK_BYTES):
+    if path.endswith('.parquet'):
+        columns = [column for column in pq.read_schema(path).names if column not in TEXT_COLUMNS]
+        return pd.read_parquet(path, columns=columns)
+
+    columns = [column for column in pd.read_csv(path, nrows=0).columns if column not in TEXT_COLUMNS]
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_bytes),
+        # Komentar ulasan Olist bisa berisi baris baru di dalam tanda kutip
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: dtype for column, dtype in SCORE_TYPES.items() if column in columns},
+        ),
+    )
+    return reader.read_all().to_pandas()
+
+
+# Fungsi untuk membaca review_id + kolom teks per chunk dari CSV atau Parquet (teks pengisi menjadi NaN)
+def iter_text_chunks(path, chunk_rows=CHUNK_ROWS):
+    columns = ['review_id'] + TEXT_COLUMNS
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas().replace({col: {MISSING_TEXT: None} for col in TEXT_COLUMNS})
+    else:
+        yield from pd.read_csv(path, usecols=columns, dtype=str, na_values=[MISSING_TEXT], chunksize=chunk_rows)
+
+
+# Fungsi untuk menulis teks komentar (hanya ulasan yang berisi teks) ke snapshot per chunk
+# review_id disimpan sebagai surrogate key int32 yang sama dengan tabel order_reviews
+def write_review_text(path, out_dir, review_index, chunk_rows=CHUNK_ROWS):
+    out_path = os.path.join(out_dir, REVIEW_TEXT_FILE)
+    schema = pa.schema([('review_id', pa.int32())] + [(col, pa.string()) for col in TEXT_COLUMNS])
+    with pq.ParquetWriter(out_path, schema) as writer:
+        for chunk in iter_text_chunks(path, chunk_rows):
+            chunk = chunk.dropna(subset=TEXT_COLUMNS, how='all')
+            chunk['review_id'] = encode_ids(chunk['review_id'], review_index)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    return [out_path]
+
+
+# Fungsi untuk membaca teks komentar beberapa ulasan (review_id berupa surrogate key)
+# Dari snapshot jika ada (filter di pembaca Parquet), jika tidak dengan memindai file sumber per chunk
+def load_review_text(review_ids, review_index, snapshot_dir, source_path=None, chunk_rows=CHUNK_ROWS):
+    review_ids = [int(key) for key in review_ids]
+    text_path = os.path.join(snapshot_dir, REVIEW_TEXT_FILE)
+    if os.path.exists(text_path):
+        return pq.read_table(text_path, filters=[('review_id', 'in', review_ids)]).to_pandas()
+
+    if source_path is None or not os.path.exists(source_path):
+        return pd.DataFrame(columns=['review_id'] + TEXT_COLUMNS)
+    wanted = pd.Index(decode_ids(np.array(review_ids), review_index))
+    parts = []
+    for chunk in iter_text_chunks(source_path, chunk_rows):
+        chunk = chunk[chunk['review_id'].isin(wanted)]
+        parts.append(chunk.dropna(subset=TEXT_COLUMNS, how='all'))
+    text = pd.concat(parts, ignore_index=True)
+    text['review_id'] = encode_ids(text['review_id'], review_index)
+    return text
@@ -0,0 +1,279 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+# Penyimpanan state RFM (Recency, Frequency, Monetary) inkremental per pelanggan
+#
+# State berupa array padat yang diindeks langsung dengan surrogate key customer_id:
+# - last_purchase: waktu pembelian terakhir (int64 nanodetik, running max)
+# - frequency    : jumlah pesanan unik (running count, pesanan yang sudah terlihat dicatat di seen_orders)
+# - monetary     : total nilai pembayaran (running sum)
+# Menambahkan batch pesanan terkirim baru hanya menyentuh baris pelanggan di batch tersebut.
+#
+# Skor 1-5 frequency/monetary memakai rank(method='first'), sehingga urutan pelanggan
+# berdasarkan (nilai, customer_id) disimpan dan diperbarui dengan menyisipkan pelanggan
+# yang berubah saja. Batas kuantil dibaca langsung dari urutan ini tanpa groupby, merge
+# atau sort ulang seluruh riwayat.
+
+TIME_COLUMN = 'order_purchase_timestamp'
+
+NAT = np.iinfo(np.int64).min
+
+DAY_NS = 24 * 60 * 60 * 10 ** 9
+
+RANKED_METRICS = ['frequency', 'monetary']
+
+SEGMENT_BINS = [0, 4, 8, 12, 15]
+SEGMENT_LABELS = ['Bronze', 'Silver', 'Gold', 'Platinum']
+
+# Batch lebih besar dari 1/REBUILD_RATIO pelanggan aktif: urutan dibangun ulang penuh
+REBUILD_RATIO = 8
+
+
+# Fungsi untuk membuat state RFM kosong
+def new_state(n_customers=0, n_orders=0):
+    return {
+        'last_purchase': np.full(n_customers, NAT, dtype=np.int64),
+        'frequency': np.zeros(n_customers, dtype=np.int32),
+        'monetary': np.zeros(n_customers, dtype=np.float64),
+        'seen_orders': np.zeros(n_orders, dtype=bool),
+        'ranking': {metric: np.zeros(0, dtype=np.int32) for metric in RANKED_METRICS},
+    }
+
+
+# Fungsi untuk memperbesar array state bila muncul key pelanggan / pesanan baru
+def grow_state(state, n_customers, n_orders):
+    fills = {'last_purchase': NAT, 'frequency': 0, 'monetary': 0.0}
+    for column, fill in fills.items():
+        values = state[column]
+        if len(values) < n_customers:
+            extra = np.full(n_customers - len(values), fill, dtype=values.dtype)
+            state[column] = np.concatenate([values, extra])
+    if len(state['seen_orders']) < n_orders:
+        extra = np.zeros(n_orders - len(state['seen_orders']), dtype=bool)
+        state['seen_orders'] = np.concatenate([state['seen_orders'], extra])
+    return state
+
+
+# Fungsi untuk memperbarui urutan (nilai, customer_id) hanya untuk pelanggan yang berubah
+def update_ranking(ranking, values, affected, active):
+    if len(affected) * REBUILD_RATIO > len(ranking):
+        return active[np.lexsort((active, values[active]))].astype(np.int32)
+
+    changed = np.zeros(len(values), dtype=bool)
+    changed[affected] = True
+    rest = ranking[~changed[ranking]]
+    # dtype disamakan dengan ranking agar searchsorted tidak menyalin seluruh array
+    batch = affected[np.lexsort((affected, values[affected]))].astype(ranking.dtype)
+
+    # Posisi sisip: cari nilai yang sama, lalu customer_id di dalam deretan nilai yang sama
+    rest_values = values[rest]
+    lo = rest_values.searchsorted(values[batch], side='left')
+    hi = rest_values.searchsorted(values[batch], side='right')
+    positions = lo.copy()
+    for i in np.flatnonzero(hi > lo):
+        positions[i] = lo[i] + rest[lo[i]:hi[i]].searchsorted(batch[i])
+    return np.insert(rest, positions, batch).astype(np.int32)
+
+
+# Fungsi untuk menambahkan batch baris pembayaran pesanan terkirim ke state
+# lines: kolom customer_id, order_id, order_purchase_timestamp, payment_value
+# Mengembalikan key pelanggan yang terpengaruh
+def append_orders(state, lines):
+    # Baris dengan key -1 (customer_id/order_id yang tidak dikenal di schema.py) dibuang; jika tidak,
+    # indeks -1 pada np.add.at / np.maximum.at akan mengubah pelanggan terakhir di state
+    known = (lines['customer_id'].values >= 0) & (lines['order_id'].values >= 0)
+    if not known.all():
+        lines = lines[known]
+    if len(lines) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    customers = lines['customer_id'].values.astype(np.int64)
+    orders = lines['order_id'].values.astype(np.int64)
+    timestamps = lines[TIME_COLUMN].values.astype('datetime64[ns]').view(np.int64)
+    grow_state(state, int(customers.max()) + 1, int(orders.max()) + 1)
+
+    np.maximum.at(state['last_purchase'], customers, timestamps)
+    np.add.at(state['monetary'], customers, lines['payment_value'].values.astype(np.float64))
+
+    # Frequency hanya bertambah untuk pesanan yang belum pernah terlihat
+    batch_orders, first_rows = np.unique(orders, return_index=True)
+    is_new = ~state['seen_orders'][batch_orders]
+    np.add.at(state['frequency'], customers[first_rows[is_new]], 1)
+    state['seen_orders'][batch_orders] = True
+
+    affected = np.unique(customers)
+    active = active_customers(state)
+    for metric in RANKED_METRICS:
+        state['ranking'][metric] = update_ranking(state['ranking'][metric], state[metric], affected, active)
+    return affected
+
+
+# Fungsi untuk membangun state dari nol dari satu tabel baris pembayaran
+def build_state(lines):
+    state = new_state()
+    append_orders(state, lines)
+    return state
+
+
+# Fungsi untuk mengambil key pelanggan yang sudah memiliki minimal satu pesanan
+def active_customers(state):
+    return np.flatnonzero(state['frequency'] > 0).astype(np.int32)
+
+
+# Fungsi untuk menghitung posisi (rank 1..n, method='first') setiap pelanggan aktif
+def ranks_from_ranking(ranking, customers):
+    position = np.zeros(int(customers.max()) + 1 if len(customers) else 0, dtype=np.int64)
+    position[ranking] = np.arange(1, len(ranking) + 1)
+    return position[customers]
+
+
+# Fungsi untuk memasukkan nilai ke 5 bin (batas kanan inklusif, seperti pd.cut) dan memberi label skor
+def bin_scores(values, edges, labels):
+    codes = np.asarray(edges[1:-1]).searchsorted(values, side='left')
+    return np.asarray(labels, dtype=np.float64)[codes]
+
+
+# Fungsi untuk mengubah nilai metrik menjadi skor 1-5 (sama dengan pd.qcut di dashboard)
+# Jika variasi nilai kurang dari 5, semua pelanggan diberi skor tengah (3)
+# ranks: rank(method='first') 1..n bila skor berbasis rank; n_unique bisa diberikan dari urutan tersimpan
+def score_metric(values, labels, ranks=None, n_unique=None):
+    if n_unique is None:
+        n_unique = len(pd.unique(values))
+    if n_unique < 5:
+        return np.full(len(values), 3.0)
+
+    percentiles = np.linspace(0, 100, 6)
+    if ranks is not None:
+        # Rank unik 1..n: batas kuantil hanya bergantung pada jumlah pelanggan
+        edges = np.percentile(np.arange(1, len(ranks) + 1, dtype=np.float64), percentiles)
+        return bin_scores(ranks, edges, labels)
+
+    edges = np.percentile(values, percentiles)
+    if len(np.unique(edges)) == len(edges):
+        return bin_scores(values, edges, labels)
+    # Batas kuantil kembar (pd.qcut gagal): interval sama lebar seperti fallback di dashboard
+    codes = pd.cut(values, bins=5, labels=False, duplicates='drop')
+    return np.asarray(labels, dtype=np.float64)[codes]
+
+
+# Fungsi untuk memberi skor R, F, M dan segmen pada tabel RFM
+def score_rfm(rfm, ranks=None, n_unique=None):
+    ranks, n_unique = ranks or {}, n_unique or {}
+    rfm['r_score'] = score_metric(rfm['recency'].values, [5, 4, 3, 2, 1])
+    for metric, column in [('frequency', 'f_score'), ('monetary', 'm_score')]:
+        rfm[column] = score_metric(rfm[metric].values, [1, 2, 3, 4, 5], ranks.get(metric), n_unique.get(metric))
+
+    rfm['rfm_score'] = rfm['r_score'] + rfm['f_score'] + rfm['m_score']
+    rfm['segment'] = pd.cut(rfm['rfm_score'], bins=SEGMENT_BINS, labels=SEGMENT_LABELS, include_lowest=True)
+    return rfm
+
+
+# Fungsi utama: tabel RFM terskor dari state, dengan recency dihitung terhadap end_date
+def rfm_table(state, end_date):
+    customers = active_customers(state)
+    end = pd.Timestamp(end_date).to_datetime64().astype('datetime64[ns]').view(np.int64)
+    rfm = pd.DataFrame({
+        'customer_id': customers,
+        'recency': (end - state['last_purchase'][customers]) // DAY_NS,
+        'frequency': state['frequency'][customers].astype(np.int64),
+        'monetary': state['monetary'][customers],
+    })
+
+    # Rank dan jumlah nilai unik dibaca dari urutan (nilai, customer_id) yang tersimpan
+    ranks, n_unique = {}, {}
+    for metric in RANKED_METRICS:
+        ranking = state['ranking'][metric]
+        ranks[metric] = ranks_from_ranking(ranking, customers)
+        n_unique[metric] = int(np.count_nonzero(np.diff(state[metric][ranking]))) + min(len(ranking), 1)
+    return score_rfm(rfm, ranks, n_unique)
+
+
+# Fungsi untuk menghitung rank(method='first') dan jumlah nilai unik dengan satu argsort stabil
+# Rank tidak dihitung (None) bila nilai unik kurang dari 5 karena skornya konstan
+def sorted_ranks(values):
+    if values.dtype.kind in 'iu' and len(values) and 0 <= values.min() and values.max() < 2 ** 16:
+        # Bilangan bulat kecil (mis. frequency): nilai unik dari bincount, argsort stabil memakai radix sort
+        n_unique = int(np.count_nonzero(np.bincount(values)))
+        if n_unique < 5:
+            return None, n_unique
+        values = values.astype(np.uint16)
+    order = np.argsort(values, kind='stable')
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    n_unique = int(np.count_nonzero(np.diff(values[order]))) + min(len(values), 1)
+    return ranks, n_unique
+
+
+# Fungsi utama sekali jalan: RFM + skor + segmen langsung dari baris pembayaran
+# Agregasi dilakukan dalam satu lintasan di atas kode pelanggan bilangan bulat
+# (np.maximum.at untuk recency, np.bincount untuk frequency dan monetary).
+# customer_id boleh berupa surrogate key maupun id hex asli.
+def compute_rfm(lines, end_date):
+    codes, customers = pd.factorize(lines['customer_id'], sort=True)
+    n_customers = len(customers)
+
+    timestamps = lines[TIME_COLUMN].values.astype('datetime64[ns]').view(np.int64)
+    last_purchase = np.full(n_customers, NAT, dtype=np.int64)
+    np.maximum.at(last_purchase, codes, timestamps)
+
+    # Pesanan unik per pelanggan: hanya baris pertama setiap pasangan (pelanggan, pesanan) yang dihitung
+    order_codes, order_uniques = pd.factorize(lines['order_id'])
+    first = ~pd.Series(codes.astype(np.int64) * max(len(order_uniques), 1) + order_codes).duplicated().values
+    frequency = np.bincount(codes[first], minlength=n_customers)
+    monetary = np.bincount(codes, weights=lines['payment_value'].values.astype(np.float64), minlength=n_customers)
+    return score_aggregates(customers, last_purchase, frequency, monetary, end_date)
+
+
+# Fungsi untuk membuat tabel RFM terskor dari agregat per pelanggan (terurut berdasarkan customer_id)
+# Dipakai compute_rfm dan backend paralel eksperimental (parallel.py) yang menggabungkan agregat per partisi
+def score_aggregates(customers, last_purchase, frequency, monetary, end_date):
+    end = pd.Timestamp(end_date).to_datetime64().astype('datetime64[ns]').view(np.int64)
+    rfm = pd.DataFrame({
+        'customer_id': customers,
+        'recency': (end - last_purchase) // DAY_NS,
+        'frequency': frequency.astype(np.int64),
+        'monetary': monetary,
+    })
+
+    ranks, n_unique = {}, {}
+    for metric in RANKED_METRICS:
+        ranks[metric], n_unique[metric] = sorted_ranks(rfm[metric].values)
+    return score_rfm(rfm, ranks, n_unique)
+
+
+if __name__ == '__main__':
+    import data_store
+
+    parser = argparse.ArgumentParser(description='Simulasi refresh harian RFM: batch inkremental vs hitung ulang penuh')
+    parser.add_argument('--days', type=int, default=7, help='Jumlah hari terakhir yang ditambahkan per batch harian')
+    args = parser.parse_args()
+
+    tables = data_store.load_tables()
+    lines = tables['payment_lines']
+    lines = lines[lines['order_status'] == 'delivered']
+    end_date = lines[TIME_COLUMN].max()
+    days = pd.date_range(end=end_date.normalize(), periods=args.days, freq='D')
+
+    # State riwayat sampai sebelum batch pertama
+    history = lines[lines[TIME_COLUMN] < days[0]]
+    state = build_state(history)
+
+    incremental, rebuild = 0.0, 0.0
+    for day in days:
+        batch = lines[(lines[TIME_COLUMN] >= day) & (lines[TIME_COLUMN] < day + pd.Timedelta(days=1))]
+        t0 = time.perf_counter()
+        append_orders(state, batch)
+        result = rfm_table(state, end_date)
+        incremental += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        expected = rfm_table(build_state(lines[lines[TIME_COLUMN] < day + pd.Timedelta(days=1)]), end_date)
+        rebuild += time.perf_counter() - t0
+
+    same = result[['customer_id', 'segment']].equals(expected[['customer_id', 'segment']])
+    print(f"Pelanggan aktif      : {len(result):,}")
+    print(f"Refresh inkremental  : {incremental / args.days * 1000:8.1f} ms per hari")
+    print(f"Hitung ulang penuh   : {rebuild / args.days * 1000:8.1f} ms per hari")
+    print(f"Segmen identik       : {same}")
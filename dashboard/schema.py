@@ -0,0 +1,147 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+# Skema tipe data ringkas untuk tabel Olist
+#
+# - Id hex 32 karakter (order_id, customer_id, ...) diganti dengan surrogate key int32.
+#   Kolom tetap bernama *_id sehingga merge di dashboard tidak berubah, hanya saja
+#   sekarang menggabungkan bilangan bulat. Teks hex asli disimpan sekali di
+#   tables['keys'][<nama kolom>] dan bisa dikembalikan dengan decode_ids().
+# - Kolom berkardinalitas rendah disimpan sebagai categorical.
+# - Kolom numerik di-downcast ke tipe terkecil yang aman.
+
+# Kolom id -> tabel utama yang menentukan urutan key (nilai dari tabel lain ditambahkan di belakang)
+ID_SPACES = {
+    'order_id': 'orders',
+    'customer_id': 'customers',
+    'customer_unique_id': 'customers',
+    'product_id': 'products',
+    'seller_id': 'sellers',
+    'review_id': 'order_reviews',
+}
+
+CATEGORY_COLUMNS = {
+    'customers': ['customer_city', 'customer_state'],
+    'orders': ['order_status'],
+    'order_payments': ['payment_type'],
+    'products': ['product_category_name', 'product_category_name_english'],
+    'sellers': ['seller_city', 'seller_state'],
+}
+
+# Nilai uang tetap float64 secara default: total penjualan ~1e7 yang dijumlahkan dalam
+# float32 sudah kehilangan presisi sen. Gunakan money_dtype='float32' bila memori lebih penting.
+MONEY_COLUMNS = {
+    'order_items': ['price', 'freight_value'],
+    'order_payments': ['payment_value'],
+}
+
+NUMERIC_DTYPES = {
+    'customers': {'customer_zip_code_prefix': 'int32'},
+    'order_items': {'order_item_id': 'int16'},
+    'order_payments': {'payment_sequential': 'int16', 'payment_installments': 'int8'},
+    'order_reviews': {'review_score': 'int8'},
+    'products': {
+        'product_name_lenght': 'float32',
+        'product_description_lenght': 'float32',
+        'product_photos_qty': 'float32',
+        'product_weight_g': 'float32',
+        'product_length_cm': 'float32',
+        'product_height_cm': 'float32',
+        'product_width_cm': 'float32',
+    },
+    'sellers': {'seller_zip_code_prefix': 'int32'},
+}
+
+KEY_DTYPE = 'int32'
+
+
+# Fungsi untuk membangun kamus id (hex -> key) untuk satu kolom id di semua tabel
+def build_id_index(tables, column):
+    primary = ID_SPACES[column]
+    values = [tables[primary][column]] if column in tables.get(primary, {}) else []
+    values += [df[column] for name, df in tables.items()
+               if name != primary and isinstance(df, pd.DataFrame) and column in df.columns]
+    uniques = pd.unique(pd.concat(values, ignore_index=True).astype(str)) if values else []
+    # Disimpan sebagai string Arrow: jauh lebih hemat daripada objek str Python
+    return pd.Index(uniques, name=column, dtype='string[pyarrow]')
+
+
+# Fungsi untuk mengubah kolom id menjadi surrogate key int32 (-1 jika tidak dikenal)
+def encode_ids(series, index):
+    return pd.Series(index.get_indexer(series.astype(str)), index=series.index, name=series.name).astype(KEY_DTYPE)
+
+
+# Fungsi untuk mengembalikan surrogate key ke id hex aslinya
+def decode_ids(keys, index):
+    keys = np.asarray(keys)
+    decoded = np.asarray(index.values.take(np.where(keys >= 0, keys, 0)), dtype=object)
+    return np.where(keys >= 0, decoded, None)
+
+
+# Fungsi untuk melakukan cast numerik yang aman (kolom berisi NaN tidak dipaksa menjadi integer)
+def downcast_column(series, dtype):
+    if np.dtype(dtype).kind in 'iu' and series.isna().any():
+        return series.astype('float32')
+    return series.astype(dtype)
+
+
+# Fungsi utama: menerapkan skema ringkas ke dict tabel hasil data_store
+def apply_schema(tables, money_dtype='float64'):
+    tables = {name: df.copy() for name, df in tables.items() if isinstance(df, pd.DataFrame)}
+
+    keys = {}
+    for column in ID_SPACES:
+        if not any(column in df.columns for df in tables.values()):
+            continue
+        keys[column] = build_id_index(tables, column)
+        for df in tables.values():
+            if column in df.columns:
+                df[column] = encode_ids(df[column], keys[column])
+
+    for name, df in tables.items():
+        for column in CATEGORY_COLUMNS.get(name, []):
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        for column, dtype in NUMERIC_DTYPES.get(name, {}).items():
+            if column in df.columns:
+                df[column] = downcast_column(df[column], dtype)
+        for column in MONEY_COLUMNS.get(name, []):
+            if column in df.columns:
+                df[column] = df[column].astype(money_dtype)
+
+    tables['keys'] = keys
+    return tables
+
+
+# Fungsi untuk menghitung pemakaian memori (MB) setiap tabel
+def memory_usage_mb(tables):
+    usage = {}
+    for name, df in tables.items():
+        if isinstance(df, pd.DataFrame):
+            usage[name] = df.memory_usage(deep=True).sum() / 1024 ** 2
+    if isinstance(tables.get('keys'), dict):
+        usage['keys'] = sum(index.memory_usage(deep=True) for index in tables['keys'].values()) / 1024 ** 2
+    return usage
+
+
+# Fungsi untuk membuat laporan memori sebelum dan sesudah skema diterapkan
+def memory_report(before, after):
+    report = pd.DataFrame({
+        'before_mb': pd.Series(memory_usage_mb(before)),
+        'after_mb': pd.Series(memory_usage_mb(after)),
+    }).fillna(0)
+    report.loc['total'] = report.sum()
+    report['ratio'] = report['before_mb'] / report['after_mb'].replace(0, np.nan)
+    return report.round(2)
+
+
+if __name__ == '__main__':
+    import data_store
+
+    parser = argparse.ArgumentParser(description='Laporan memori sebelum/sesudah skema ringkas diterapkan')
+    parser.add_argument('--money-dtype', default='float64', choices=['float64', 'float32'])
+    args = parser.parse_args()
+
+    raw = data_store.load_csv_tables()
+    print(memory_report(raw, apply_schema(raw, money_dtype=args.money_dtype)).to_string())
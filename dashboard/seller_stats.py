@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from geolocation import centroid_positions
+
+# Agregat performa penjual per bulan dan peringkat top-k
+#
+# seller_months dibangun sekali dari order_lines, orders, order_reviews dan (jika ada)
+# zip_centroids: satu baris per penjual x bulan pembelian berisi ukuran aditif (pendapatan,
+# jumlah pesanan, jumlah & total skor ulasan, pesanan terkirim & tepat waktu, jumlah & total
+# jarak penjual-pelanggan). Ringkasan per penjual untuk rentang tanggal cukup menjumlahkan
+# potongan bulan dengan np.bincount pada surrogate key penjual, lalu peringkat diambil dengan
+# np.argpartition (O(n)) tanpa mengurutkan semua penjual.
+#
+# Filter tanggal dibulatkan ke bulan: bulan yang beririsan dengan rentang ikut dihitung penuh.
+
+SELLER_TABLES = ['seller_months']
+
+# Ukuran aditif di seller_months
+MEASURES = ['revenue', 'order_count', 'review_sum', 'review_count', 'delivered_count',
+            'on_time_count', 'distance_sum', 'distance_count']
+
+# Metrik peringkat -> (label, urutan menaik: nilai kecil lebih baik)
+METRICS = {
+    'revenue': ('Pendapatan (R$)', False),
+    'order_count': ('Jumlah Pesanan', False),
+    'avg_review': ('Rata-rata Skor Ulasan', False),
+    'on_time_rate': ('Tingkat Tepat Waktu (%)', False),
+    'avg_distance_km': ('Rata-rata Jarak ke Pelanggan (km)', True),
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+# Fungsi untuk menghitung jarak haversine (km) antar pasangan koordinat (derajat)
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype='float64')) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+# Fungsi untuk menghitung jarak penjual-pelanggan (km) per baris lewat centroid zip prefix (NaN jika tidak dikenal)
+def seller_customer_distance(seller_orders, tables):
+    centroids = tables['zip_centroids']
+    customer_zip = tables['customers'].set_index('customer_id')['customer_zip_code_prefix']
+    seller_zip = tables['sellers'].set_index('seller_id')['seller_zip_code_prefix']
+
+    customer = centroid_positions(customer_zip.reindex(seller_orders['customer_id']).fillna(-1).to_numpy('int64'), centroids)
+    seller = centroid_positions(seller_zip.reindex(seller_orders['seller_id']).fillna(-1).to_numpy('int64'), centroids)
+    known = (customer >= 0) & (seller >= 0)
+
+    lat, lng = centroids['lat'].to_numpy(), centroids['lng'].to_numpy()
+    distance = haversine_km(lat[seller], lng[seller], lat[customer], lng[customer])
+    return np.where(known, distance, np.nan)
+
+
+# Fungsi untuk membangun tabel seller_months dari tabel fakta dan tabel pendukung
+def build_seller_months(tables):
+    lines = tables['order_lines']
+
+    # Satu baris per penjual x pesanan (pesanan bisa berisi beberapa penjual)
+    seller_orders = lines.groupby(['seller_id', 'order_id'], sort=False).agg(
+        revenue=('price', 'sum'),
+        customer_id=('customer_id', 'first'),
+        purchase=('order_purchase_timestamp', 'first'),
+    ).reset_index()
+
+    # Status pengiriman: tepat waktu jika selisih hari aktual - estimasi <= 0 (sama dengan tab 4)
+    orders = tables['orders'].set_index('order_id')
+    orders = orders.reindex(seller_orders['order_id'])
+    delivered = (orders['order_status'] == 'delivered').to_numpy() & orders['order_delivered_customer_date'].notna().to_numpy()
+    lateness = (orders['order_delivered_customer_date'] - orders['order_estimated_delivery_date']).dt.days.to_numpy()
+    on_time = delivered & (lateness <= 0)
+
+    # Skor ulasan rata-rata per pesanan
+    reviews = tables['order_reviews'].groupby('order_id')['review_score'].mean()
+    review = reviews.reindex(seller_orders['order_id']).to_numpy(dtype='float64')
+
+    if 'zip_centroids' in tables:
+        distance = seller_customer_distance(seller_orders, tables)
+    else:
+        distance = np.full(len(seller_orders), np.nan)
+
+    rows = pd.DataFrame({
+        'seller_id': seller_orders['seller_id'].to_numpy(),
+        'month': seller_orders['purchase'].to_numpy().astype('datetime64[M]').astype('datetime64[ns]'),
+        'revenue': seller_orders['revenue'].to_numpy(dtype='float64'),
+        'order_count': 1,
+        'review_sum': np.nan_to_num(review),
+        'review_count': ~np.isnan(review),
+        'delivered_count': delivered,
+        'on_time_count': on_time,
+        'distance_sum': np.nan_to_num(distance),
+        'distance_count': ~np.isnan(distance),
+    })
+    months = rows.groupby(['month', 'seller_id'], sort=True).sum().reset_index()
+    return months.astype({
+        'seller_id': 'int32', 'order_count': 'int32', 'review_count': 'int32',
+        'delivered_count': 'int32', 'on_time_count': 'int32', 'distance_count': 'int32',
+    })
+
+
+# Fungsi untuk menambahkan tabel seller_months jika belum ada
+def add_seller_tables(tables):
+    if 'seller_months' not in tables:
+        tables['seller_months'] = build_seller_months(tables)
+    return tables
+
+
+# Fungsi untuk meringkas metrik per penjual dalam rentang tanggal (dibulatkan ke bulan)
+# Hanya penjual dengan minimal satu pesanan di rentang tersebut yang dikembalikan
+def seller_summary(seller_months, start_date, end_date):
+    months = seller_months['month'].values
+    lo = months.searchsorted(pd.Timestamp(start_date).to_period('M').to_timestamp().to_datetime64(), side='left')
+    hi = months.searchsorted(pd.Timestamp(end_date).to_datetime64(), side='right')
+    rows = seller_months.iloc[lo:max(lo, hi)]
+
+    keys = rows['seller_id'].to_numpy()
+    size = int(keys.max()) + 1 if len(keys) else 0
+    totals = {measure: np.bincount(keys, weights=rows[measure].to_numpy(dtype='float64'), minlength=size)
+              for measure in MEASURES}
+    active = np.flatnonzero(totals['order_count'] > 0)
+    totals = {measure: values[active] for measure, values in totals.items()}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'seller_id': active.astype('int32'),
+            'revenue': totals['revenue'],
+            'order_count': totals['order_count'].astype('int32'),
+            'avg_review': np.where(totals['review_count'] > 0, totals['review_sum'] / totals['review_count'], np.nan),
+            'on_time_rate': np.where(totals['delivered_count'] > 0,
+                                     totals['on_time_count'] / totals['delivered_count'] * 100, np.nan),
+            'avg_distance_km': np.where(totals['distance_count'] > 0,
+                                        totals['distance_sum'] / totals['distance_count'], np.nan),
+        })
+
+
+# Fungsi untuk mengambil k penjual teratas berdasarkan satu metrik dengan np.argpartition
+# (tanpa mengurutkan semua penjual); penjual dengan order_count < min_orders diabaikan
+def top_sellers(summary, metric, k=10, min_orders=1):
+    eligible = summary[summary['order_count'] >= min_orders]
+    k = min(k, len(eligible))
+    if k == 0:
+        return eligible.iloc[:0]
+
+    # Nilai kosong (NaN) selalu berada di urutan terakhir
+    ascending = METRICS[metric][1]
+    values = eligible[metric].to_numpy(dtype='float64')
+    score = np.where(np.isnan(values), np.inf, values if ascending else -values)
+    top = np.argpartition(score, k - 1)[:k]
+    return eligible.iloc[top[np.argsort(score[top], kind='stable')]]
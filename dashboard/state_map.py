@@ -0,0 +1,70 @@
+import functools
+import plotly.graph_objects as go
+import geo
+
+# Peta choropleth negara bagian Brasil untuk tab 5 dengan Plotly
+#
+# folium_static membangun ulang satu dokumen HTML Leaflet lengkap (termasuk GeoJSON) setiap
+# rerun. Di sini geometri, layout dan skala warna dibangun sekali per proses sebagai kerangka
+# figure, lalu setiap rerun hanya mengisi vektor jumlah pelanggan per negara bagian (27 angka).
+#
+# Jika Streamlit menyajikan folder static/ (server.enableStaticServing, lihat
+# .streamlit/config.toml di root repo), trace hanya berisi URL GeoJSON: browser mengunduh
+# geometri sekali lalu meng-cache-nya, dan yang dikirim per rerun hanya vektor jumlah.
+# Tanpa static serving GeoJSON lokal disisipkan ke figure.
+
+# Batas peta (lon, lat) Brasil, tetap agar peta tidak bergeser ketika satu negara bagian dipilih
+LON_RANGE = [-74.5, -34.0]
+LAT_RANGE = [-34.5, 6.0]
+
+# Warna negara bagian tanpa data (di bawah trace choropleth)
+BASE_COLOR = '#eeeeee'
+
+
+# Fungsi untuk membangun kerangka peta sekali per proses: (layout, trace dasar, trace data, daftar negara bagian)
+@functools.lru_cache(maxsize=None)
+def map_skeleton(level=geo.DEFAULT_LEVEL, static_serving=False):
+    geojson = geo.load_states(level)
+    geo_data = geo.geojson_static_url(level) if static_serving else geojson
+    states = tuple(feature['properties'][geo.STATE_KEY] for feature in geojson['features'])
+
+    common = {
+        'type': 'choropleth',
+        'geojson': geo_data,
+        'featureidkey': f'properties.{geo.STATE_KEY}',
+        'marker': {'line': {'width': 0.5, 'color': 'white'}},
+    }
+    # Semua negara bagian digambar abu-abu sebagai latar, sehingga negara bagian yang
+    # tidak ada di data (mis. saat satu negara bagian dipilih) tetap terlihat. Hanya jika
+    # geometri berupa URL static: GeoJSON yang disisipkan akan terkirim dua kali
+    base_trace = None
+    if static_serving:
+        base_trace = dict(common, locations=states, z=[0] * len(states), showscale=False, hoverinfo='skip',
+                          colorscale=[[0, BASE_COLOR], [1, BASE_COLOR]])
+    data_trace = dict(common, colorscale='YlOrRd', marker_opacity=0.7,
+                      colorbar={'title': {'text': 'Customer Count'}},
+                      hovertemplate='%{location}: %{z:,}<extra></extra>')
+    layout = {
+        'geo': {
+            'visible': False,
+            'projection': {'type': 'mercator'},
+            'lonaxis': {'range': LON_RANGE},
+            'lataxis': {'range': LAT_RANGE},
+        },
+        'height': 500,
+        'margin': {'l': 0, 'r': 0, 't': 0, 'b': 0},
+    }
+    return layout, base_trace, data_trace, states
+
+
+# Fungsi untuk membuat figure choropleth dari jumlah pelanggan per negara bagian
+# (DataFrame kolom state, customer_count), memakai kerangka yang sudah di-cache
+def state_choropleth(customer_states, level=geo.DEFAULT_LEVEL, static_serving=False):
+    layout, base_trace, data_trace, states = map_skeleton(level, static_serving)
+    counts = customer_states.set_index('state')['customer_count']
+    locations = list(states)
+    z = counts.reindex(locations).to_numpy(dtype=float)
+
+    traces = [base_trace] if base_trace is not None else []
+    traces.append(dict(data_trace, locations=locations, z=z))
+    return go.Figure({'data': traces, 'layout': layout})
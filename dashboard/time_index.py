@@ -0,0 +1,39 @@
+import pandas as pd
+
+# Indeks waktu terurut untuk filter rentang tanggal di sidebar
+#
+# Tabel orders, order_lines dan payment_lines disimpan terurut berdasarkan
+# order_purchase_timestamp. Filter rentang tanggal cukup mencari batas bawah dan atas
+# dengan binary search (searchsorted, O(log n)) lalu mengambil potongan baris
+# dengan iloc, sebagai pengganti boolean mask yang memindai seluruh kolom.
+
+TIME_COLUMN = 'order_purchase_timestamp'
+
+SORTED_TABLES = ['orders', 'order_lines', 'payment_lines']
+
+
+# Fungsi untuk mengurutkan tabel berdasarkan waktu pembelian
+def sort_by_time(df, column=TIME_COLUMN):
+    return df.sort_values(column, kind='stable').reset_index(drop=True)
+
+
+# Fungsi untuk memastikan semua tabel ber-waktu sudah terurut (tidak menyalin jika sudah)
+def ensure_sorted(tables):
+    for name in SORTED_TABLES:
+        if name in tables and not tables[name][TIME_COLUMN].is_monotonic_increasing:
+            tables[name] = sort_by_time(tables[name])
+    return tables
+
+
+# Fungsi untuk mencari posisi baris [lo, hi) dari rentang waktu start..end (inklusif)
+def time_bounds(df, start, end, column=TIME_COLUMN):
+    values = df[column].values
+    lo = values.searchsorted(pd.Timestamp(start).to_datetime64(), side='left')
+    hi = values.searchsorted(pd.Timestamp(end).to_datetime64(), side='right')
+    return lo, max(lo, hi)
+
+
+# Fungsi untuk mengambil potongan tabel terurut dalam rentang waktu start..end (inklusif)
+def slice_by_time(df, start, end, column=TIME_COLUMN):
+    lo, hi = time_bounds(df, start, end, column)
+    return df.iloc[lo:hi]